@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Check that links in skills and crawled docs point at files that exist.
+
+The tree is listed once (`compress_docs.list_docs_tree`) into a set of file
+and directory paths. Every markdown file is then streamed line by line, and
+each link target is resolved to a relative path and looked up in that set.
+Fenced code and inline code spans are skipped. Only links not in the set are
+checked on disk, so hidden files still count.
+
+Resolved targets:
+    [text](references/api.md#usage)    relative to the linking file
+    [text](/docs/guides/routing)       crawled docs: a site path, mapped with crawl_docs.sanitize_filename
+    [text](https://site/docs/guides)   crawled docs: a URL on the crawled site, mapped the same way
+
+External URLs, anchors within the same page and site paths in
+non-crawled trees are not checked. A tree is treated as a crawled mirror
+when its pages carry the ``source:`` frontmatter that crawl_docs.py writes.
+
+Usage:
+    python check_links.py ./skills/my-skill
+    python check_links.py ./.agents/skills ./.next-docs --json
+
+    # Also check `references/...`, `scripts/...` and `assets/...` paths in code spans
+    python check_links.py ./skills/my-skill --code-paths
+"""
+
+import os
+import posixpath
+import re
+import sys
+from urllib.parse import unquote, urlparse
+
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+CODE_SPAN_RE = re.compile(r"`[^`]*`")
+INLINE_LINK_RE = re.compile(r"!?\[(?:[^\[\]]|\[[^\[\]]*\])*\]\(\s*<?([^)\s>]+)>?(?:\s+[\"'(][^)]*)?\)")
+REFERENCE_DEF_RE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*<?([^\s>]+)>?")
+CODE_PATH_RE = re.compile(r"`((?:references|scripts|assets|templates)/[^`\s#]+)(?:#[^`]*)?`")
+EXTERNAL_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+class LinkIndex:
+    """Files and directories of one tree, plus the crawled site it mirrors (if any)."""
+
+    def __init__(self, root: str, follow_links: bool = False):
+        from compress_docs import list_docs_tree
+
+        self.root = root
+        tree = list_docs_tree(root, follow_links)
+        self.files: set[str] = set()
+        self.markdown: list[str] = []
+        for dir_id in tree.dirs():
+            rel_root = tree.dir_path(dir_id)
+            for file_id in tree.files(dir_id):
+                name = tree.file_name(file_id)
+                path = f"{rel_root}/{name}" if rel_root else name
+                self.files.add(path)
+                if name.endswith((".md", ".mdx")):
+                    self.markdown.append(path)
+        self.dirs = {tree.dir_path(d) for d in tree.all_dirs()}
+        self.skill_roots = {posixpath.dirname(p) for p in self.markdown if posixpath.basename(p) == "SKILL.md"}
+        self.host, self.base_path = self._crawl_base()
+
+    def _crawl_base(self) -> tuple[str | None, str]:
+        """(host, base URL path) of the crawled site, from the first page with a ``source:`` URL."""
+        from discover_sources import docs_root_for, read_source_url
+
+        for path in self.markdown[:20]:
+            url = read_source_url(os.path.join(self.root, path))
+            if not url:
+                continue
+            docs_root, label = docs_root_for(os.path.join(self.root, path), url)
+            if os.path.abspath(docs_root) != os.path.abspath(self.root):
+                continue
+            host, _, base = label.partition("/")
+            return host, "/" + base if base else ""
+        return None, ""
+
+    def exists(self, rel_path: str, site: bool = False) -> bool:
+        """True if `rel_path` is a file or directory; for a `site` page, its directory also counts."""
+        if rel_path.startswith("../"):
+            return os.path.exists(os.path.normpath(os.path.join(self.root, rel_path)))
+        rel_path = rel_path.rstrip("/")
+        if rel_path in self.files or rel_path in self.dirs or rel_path == "":
+            return True
+        if site and rel_path.endswith(".md") and rel_path[:-3] in self.dirs:
+            # A section URL whose own page wasn't crawled, but whose subpages were
+            return True
+        # Hidden or skipped entries are not in the listing
+        return os.path.exists(os.path.join(self.root, rel_path))
+
+    def skill_root(self, rel_file: str) -> str:
+        """Nearest directory at or above `rel_file` holding a SKILL.md ("" if none)."""
+        directory = posixpath.dirname(rel_file)
+        while directory and directory not in self.skill_roots:
+            directory = posixpath.dirname(directory)
+        return directory
+
+    def site_path(self, url_path: str) -> str | None:
+        """Local path of a page on the crawled site, as organize_crawl_results lays it out."""
+        from crawl_docs import sanitize_filename
+
+        if self.host is None:
+            return None
+        if self.base_path:
+            if url_path.rstrip("/") == self.base_path:
+                url_path = ""
+            elif url_path.startswith(self.base_path + "/"):
+                url_path = url_path[len(self.base_path):]
+            else:
+                # Outside the crawled section of the site
+                return None
+        path = sanitize_filename(url_path)
+        return "index.md" if path == ".md" else path
+
+
+def extract_links(filepath: str, code_paths: bool = False):
+    """Yield (line number, target, is code path) for every link in a markdown file, outside code."""
+    fence = None
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            match = FENCE_RE.match(line)
+            if fence:
+                if match and match.group(1) == fence:
+                    fence = None
+                continue
+            if match:
+                fence = match.group(1)
+                continue
+            if code_paths:
+                for m in CODE_PATH_RE.finditer(line):
+                    yield lineno, m.group(1), True
+            if "](" not in line and "]:" not in line:
+                continue
+            prose = CODE_SPAN_RE.sub("", line)
+            for m in INLINE_LINK_RE.finditer(prose):
+                yield lineno, m.group(1), False
+            m = REFERENCE_DEF_RE.match(prose)
+            if m:
+                yield lineno, m.group(1), False
+
+
+def resolve_link(index: LinkIndex, rel_file: str, target: str, code_path: bool = False) -> tuple[str | None, bool]:
+    """(relative path `target` should exist at, whether it is a crawled site page).
+
+    The path is None for links that are not checked. Code paths such as
+    `scripts/x.py` are relative to the skill root rather than the file.
+    """
+    if target.startswith("#"):
+        return None, False
+    if EXTERNAL_RE.match(target):
+        parsed = urlparse(target)
+        if parsed.scheme not in ("http", "https") or index.host is None or parsed.hostname != index.host:
+            return None, False
+        return index.site_path(parsed.path), True
+
+    parsed = urlparse(target)
+    path = unquote(parsed.path)
+    if not path:
+        return None, False
+    if path.startswith("/"):
+        return index.site_path(path), True
+    base = index.skill_root(rel_file) if code_path else posixpath.dirname(rel_file)
+    resolved = posixpath.normpath(posixpath.join(base, path))
+    # Paths leaving the tree start with "../" and are checked on disk
+    return ("" if resolved == "." else resolved), False
+
+
+def check_links(root: str, follow_links: bool = False, code_paths: bool = False) -> tuple[dict, dict]:
+    """Broken links per markdown file under `root`.
+
+    Returns:
+        tuple: ({relative file: [(line, target, resolved path), ...]} for files with
+        broken links, {"files": markdown files scanned, "links": links checked})
+    """
+    index = LinkIndex(root, follow_links)
+    broken: dict[str, list[tuple[int, str, str]]] = {}
+    links = 0
+    for rel_file in sorted(index.markdown):
+        try:
+            found = list(extract_links(os.path.join(root, rel_file), code_paths))
+        except OSError:
+            continue
+        for lineno, target, code_path in found:
+            resolved, site = resolve_link(index, rel_file, target, code_path)
+            if resolved is None:
+                continue
+            links += 1
+            if not index.exists(resolved, site):
+                broken.setdefault(rel_file, []).append((lineno, target, resolved))
+    return broken, {"files": len(index.markdown), "links": links}
+
+
+def format_broken(broken: dict) -> list[str]:
+    """``file:line: target`` lines for each broken link."""
+    lines = []
+    for rel_file, items in broken.items():
+        for lineno, target, resolved in items:
+            note = f" (→ {resolved})" if resolved and resolved != target.split("#")[0] else ""
+            lines.append(f"{rel_file}:{lineno}: {target}{note}")
+    return lines
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Check links in skills and crawled docs")
+    parser.add_argument("paths", nargs="+", help="Skill, skills directory or docs directory to check")
+    parser.add_argument(
+        "--code-paths", action="store_true",
+        help="Also check references/, scripts/, assets/ and templates/ paths in code spans"
+    )
+    parser.add_argument("--follow-links", action="store_true", help="Walk symlinked directories")
+    parser.add_argument("--json", action="store_true", help="Print broken links as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    total_broken = 0
+    for path in args.paths:
+        if not os.path.isdir(path):
+            parser.error(f"Not a directory: {path}")
+        broken, checked = check_links(path, args.follow_links, args.code_paths)
+        total_broken += sum(len(items) for items in broken.values())
+        results[path] = broken
+        if not args.json:
+            count = sum(len(items) for items in broken.values())
+            print(f"{'❌' if broken else '✅'} {path}: {checked['links']} links in {checked['files']} files, {count} broken")
+            for line in format_broken(broken):
+                print(f"   {line}")
+
+    if args.json:
+        print(json.dumps(
+            {path: {f: [{"line": l, "target": t, "resolved": r} for l, t, r in items] for f, items in broken.items()}
+             for path, broken in results.items()},
+            indent=2,
+        ))
+    sys.exit(1 if total_broken else 0)
+
+
+if __name__ == "__main__":
+    main()
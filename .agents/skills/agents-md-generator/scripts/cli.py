@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the agents-md-generator and skill-creator scripts.
+
+Dispatches on the first argument and imports only the module that subcommand
+needs, so `validate` in a pre-commit hook does not pay for the crawler, the
+compressor or argparse. Each subcommand takes the same arguments as the script
+it wraps.
+
+Usage:
+    python cli.py compress ./.ai-sdk-docs "Vercel AI SDK" --extract-titles
+    python cli.py crawl https://sdk.vercel.ai/docs --output ./.ai-sdk-docs
+    python cli.py generate --skills-dir ./skills --output AGENTS.md
+    python cli.py validate ./skills/my-skill
+    python cli.py package ./skills/my-skill ./dist
+    python cli.py install ./.agents/skills ./dist
+    python cli.py init my-skill --path ./skills
+    python cli.py cache stats
+
+    # Fail if any subcommand's module takes longer than the budget to import
+    python cli.py check-startup --budget-ms 150
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILL_CREATOR_DIR = os.path.join(os.path.dirname(os.path.dirname(SCRIPTS_DIR)), "skill-creator", "scripts")
+
+# subcommand -> (scripts directory, module name, description)
+COMMANDS = {
+    "compress": (SCRIPTS_DIR, "compress_docs", "Compress a docs directory into an index"),
+    "crawl": (SCRIPTS_DIR, "crawl_docs", "Crawl a docs site with Firecrawl"),
+    "generate": (SCRIPTS_DIR, "generate_agents_md", "Generate AGENTS.md from skills and docs"),
+    "discover": (SCRIPTS_DIR, "discover_sources", "Find skills and crawled docs in a monorepo"),
+    "pack": (SCRIPTS_DIR, "docs_pack", "Create, list and read docs packs"),
+    "section": (SCRIPTS_DIR, "read_section", "Read one section of a markdown file"),
+    "serve": (SCRIPTS_DIR, "index_server", "Serve skills and docs indexes from memory"),
+    "triggers": (SCRIPTS_DIR, "trigger_matcher", "Compile skill triggers and match prompts"),
+    "stub": (SCRIPTS_DIR, "firecrawl_stub", "Serve a local Firecrawl-compatible crawl API"),
+    "load-test": (SCRIPTS_DIR, "load_test", "Load-test crawl, organize and compress against the stub"),
+    "cache": (SCRIPTS_DIR, "disk_cache", "Show stats for or prune the shared disk cache"),
+    "links": (SCRIPTS_DIR, "check_links", "Check links in skills and crawled docs"),
+    "urls": (SCRIPTS_DIR, "url_frontier", "Canonicalize crawl URLs and find local path collisions"),
+    "sitemap": (SCRIPTS_DIR, "sitemap_sync", "Show what a sitemap-driven recrawl would fetch and delete"),
+    "validate": (SKILL_CREATOR_DIR, "quick_validate", "Validate a skill directory"),
+    "package": (SKILL_CREATOR_DIR, "package_skill", "Package a skill into a .skill file"),
+    "apply-delta": (SKILL_CREATOR_DIR, "apply_skill_delta", "Rebuild a .skill from a release and a delta"),
+    "install": (SKILL_CREATOR_DIR, "install_skill", "Install .skill files into a skills directory"),
+    "init": (SKILL_CREATOR_DIR, "init_skill", "Create a new skill from the template"),
+}
+
+DEFAULT_BUDGET_MS = 150
+
+
+def usage() -> str:
+    lines = ["Usage: python cli.py <command> [args...]", "", "Commands:"]
+    for name, (_, _, description) in COMMANDS.items():
+        lines.append(f"  {name:<14}{description}")
+    lines.append(f"  {'check-startup':<14}Check each command's import time against a budget")
+    return "\n".join(lines)
+
+
+def import_time_us(scripts_dir: str, module: str) -> int:
+    """Cumulative import time of `module` in a fresh interpreter, in microseconds."""
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=scripts_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in reversed(result.stderr.splitlines()):
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise RuntimeError("no -X importtime entry")
+
+
+def check_startup(args: list[str]) -> int:
+    budget_ms = DEFAULT_BUDGET_MS
+    try:
+        if args[:1] == ["--budget-ms"] and len(args) == 2:
+            budget_ms = float(args[1])
+            if not budget_ms > 0:
+                raise ValueError
+        elif args:
+            raise ValueError
+    except ValueError:
+        print("Usage: python cli.py check-startup [--budget-ms N]  (N: milliseconds, > 0)", file=sys.stderr)
+        return 2
+
+    # Take the best of a few runs so a cold disk cache doesn't fail the check
+    failures = 0
+    for name, (scripts_dir, module, _) in COMMANDS.items():
+        try:
+            best = min(import_time_us(scripts_dir, module) for _ in range(3)) / 1000
+        except RuntimeError as e:
+            print(f"  ⚠ {name:<10} {module}: {e}")
+            continue
+        ok = best <= budget_ms
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {name:<10} {best:7.1f}ms  {module}")
+
+    if failures:
+        print(f"❌ {failures} command(s) over the {budget_ms:g}ms import budget")
+        return 1
+    print(f"✅ All commands import within {budget_ms:g}ms")
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print(usage())
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+
+    command = sys.argv[1]
+    if command == "check-startup":
+        sys.exit(check_startup(sys.argv[2:]))
+
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        sys.exit(2)
+
+    scripts_dir, module, _ = COMMANDS[command]
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    # The wrapped scripts parse sys.argv themselves
+    sys.argv = [os.path.join(scripts_dir, f"{module}.py")] + sys.argv[2:]
+    __import__(module).main()
+
+
+if __name__ == "__main__":
+    main()
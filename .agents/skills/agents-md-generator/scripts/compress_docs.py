@@ -14,23 +14,101 @@ Usage:
 
     # Preview compression ratio without writing
     python compress_docs.py ./docs "My Docs" --dry-run
+
+    # Add a heading-level index (byte offset + length per section)
+    python compress_docs.py ./docs "My Docs" --heading-index
+
+    # Index a single-file docs pack (see docs_pack.py) straight from its table
+    python compress_docs.py ./ai-sdk-docs.dpk "Vercel AI SDK" --extract-titles
+
+    # Index a docs archive (.zip, .tar, .tar.gz) without extracting it
+    python compress_docs.py ./next.js-docs.tar.gz "Next.js Docs" --extract-titles
+
+    # Shard a huge docs tree into per-subtree files under an 8KB budget each
+    python compress_docs.py ./docs "My Docs" --shard-dir ./docs-index --shard-bytes 8192 -o index.md
+
+    # List repeated subtrees (v1/, v2/, locales) once and alias the copies
+    python compress_docs.py ./docs "My Docs" --dedupe
+
+    # Walk symlinked directories (e.g. a pnpm store), listing each physical file once
+    python compress_docs.py ./node_modules/some-pkg/docs "Some Pkg" --follow-links
+
+    # See which directories and titles take up the index bytes
+    python compress_docs.py ./docs "My Docs" --extract-titles --size-report 20 --dry-run
+
+    # Quickly estimate index size on a huge mirror by sampling (no full walk)
+    python compress_docs.py ./docs "My Docs" --extract-titles --estimate
 """
 
 import argparse
 import os
 import sys
 import re
-from pathlib import Path
+
+from doc_tree import DocTree
+from docs_archive import DocsArchive, is_archive
+from docs_pack import DocsPack, is_pack
+
+
+TITLE_HEAD_BYTES = 2048
 
 
 def extract_title(filepath: str) -> str:
     """Extract title from markdown file frontmatter or first heading."""
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read(2048)  # Only read beginning
+            content = f.read(TITLE_HEAD_BYTES)  # Only read beginning
     except Exception:
         return ""
 
+    return title_from_head(content)
+
+
+class TitleCache:
+    """Page titles of one docs directory, persisted in the shared disk cache.
+
+    Each directory gets its own entry mapping page names to the size, mtime and
+    title they had when last read, so entries stay small however big the mirror
+    is. Stamps come from the `DocTree` listing, so a rerun reopens only pages
+    that changed and stats nothing again. Safe to share across the
+    `read_titles` worker threads.
+    """
+
+    def __init__(self, docs_dir: str):
+        from disk_cache import get_cache
+
+        self.cache = get_cache()
+        self.docs_dir = docs_dir
+        self.root = os.path.abspath(docs_dir)
+
+    def dir_titles(self, tree: DocTree, dir_id: int) -> list[tuple[int, str]]:
+        """[(file_id, title), ...] for the titled markdown files directly in `dir_id`."""
+        rel_root = tree.dir_path(dir_id)
+        key = os.path.join(self.root, rel_root)
+        old = (self.cache.get("titles", key) if self.cache else None) or {}
+        new: dict[str, list] = {}
+        titles = []
+        for file_id in tree.files(dir_id):
+            name = tree.file_name(file_id)
+            if not name.endswith((".md", ".mdx")):
+                continue
+            stamp = [tree.file_size(file_id), tree.file_mtime(file_id)]
+            entry = old.get(name)
+            if stamp[1] and entry and entry[:2] == stamp:
+                title = entry[2]
+            else:
+                title = extract_title(os.path.join(self.docs_dir, rel_root, name))
+            if stamp[1]:
+                new[name] = stamp + [title]
+            if title:
+                titles.append((file_id, title))
+        if self.cache is not None and new != old:
+            self.cache.put("titles", key, new)
+        return titles
+
+
+def title_from_head(content: str) -> str:
+    """Title from the beginning of a markdown file: frontmatter ``title:`` or first heading."""
     # Try frontmatter title
     if content.startswith("---"):
         parts = content.split("---", 2)
@@ -49,6 +127,88 @@ def extract_title(filepath: str) -> str:
     return ""
 
 
+# A closing run of #s only counts when whitespace precedes it, so "# C#" keeps its "#"
+HEADING_RE = re.compile(rb"^(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$")
+
+
+def index_headings(filepath) -> tuple[str, list[dict]]:
+    """Stream a markdown file once, returning its title and every heading's byte range.
+
+    `filepath` may also be an open binary file object (e.g. a page from a docs pack).
+
+    Each heading is a dict with ``level``, ``title``, ``offset`` (byte offset of
+    the heading line) and ``length`` (bytes up to the next heading of the same or
+    higher level, or end of file). Frontmatter and fenced code blocks are skipped.
+    The title follows the same rules as ``extract_title``.
+    """
+    fm_title = ""
+    headings: list[dict] = []
+    open_sections: list[dict] = []
+    offset = 0
+    fence = None
+    in_frontmatter = False
+
+    try:
+        with open(filepath, "rb") if isinstance(filepath, str) else filepath as f:
+            for lineno, line in enumerate(f):
+                stripped = line.strip()
+                if lineno == 0 and stripped == b"---":
+                    in_frontmatter = True
+                elif in_frontmatter:
+                    if stripped == b"---":
+                        in_frontmatter = False
+                    elif stripped.startswith(b"title:") and not fm_title:
+                        fm_title = stripped[6:].decode("utf-8", "replace").strip().strip("'\"")
+                elif fence:
+                    if stripped.startswith(fence):
+                        fence = None
+                elif stripped.startswith((b"```", b"~~~")):
+                    fence = stripped[:3]
+                else:
+                    match = HEADING_RE.match(line.rstrip(b"\r\n"))
+                    if match:
+                        level = len(match.group(1))
+                        while open_sections and open_sections[-1]["level"] >= level:
+                            closed = open_sections.pop()
+                            closed["length"] = offset - closed["offset"]
+                        heading = {
+                            "level": level,
+                            "title": match.group(2).decode("utf-8", "replace"),
+                            "offset": offset,
+                            "length": 0,
+                        }
+                        headings.append(heading)
+                        open_sections.append(heading)
+                offset += len(line)
+    except OSError:
+        return "", []
+
+    for heading in open_sections:
+        heading["length"] = offset - heading["offset"]
+
+    title = fm_title or (headings[0]["title"] if headings else "")
+    return title, headings
+
+
+def format_heading_index(rel_path: str, headings: list[dict], max_level: int = 3) -> str:
+    """Render one file's headings as ``|path#{Title@offset+length,...}``.
+
+    ``|``, ``@`` and ``\\`` in titles are backslash-escaped so they can't be
+    mistaken for the line or offset separators.
+    """
+    parts = []
+    for h in headings:
+        if h["level"] > max_level:
+            continue
+        title = h["title"].replace(",", " ").replace("{", "").replace("}", "")
+        title = title[:50] + "…" if len(title) > 50 else title
+        title = title.replace("\\", "\\\\").replace("|", "\\|").replace("@", "\\@")
+        parts.append(f"{title}@{h['offset']}+{h['length']}")
+    if not parts:
+        return ""
+    return f"|{rel_path}#{{{','.join(parts)}}}"
+
+
 def get_file_sizes(dirpath: str) -> dict:
     """Get sizes of all files in directory."""
     sizes = {}
@@ -63,93 +223,857 @@ def get_file_sizes(dirpath: str) -> dict:
     return sizes
 
 
+def list_docs_tree(docs_dir: str, follow_links: bool = False) -> DocTree:
+    """Walk a docs directory into a compact `DocTree` of non-hidden files and their sizes.
+
+    Symlinked directories are not entered unless ``follow_links`` is set. When
+    following, directories and files are tracked by (st_dev, st_ino): a
+    directory reached again (a loop, or a second link to it) is not re-entered,
+    and a file reachable through several symlinks or hardlinks is listed once,
+    at its first path in breadth-first name order, so it is counted and read once.
+    """
+    tree = DocTree()
+    seen_dirs: set[tuple[int, int]] = set()
+    seen_files: set[tuple[int, int]] = set()
+    if follow_links:
+        try:
+            st = os.stat(docs_dir)
+            seen_dirs.add((st.st_dev, st.st_ino))
+        except OSError:
+            pass
+
+    pending = [""]
+    while pending:
+        # Breadth-first in name order, so the same alias wins on every run
+        next_level = []
+        for rel_root in pending:
+            try:
+                with os.scandir(os.path.join(docs_dir, rel_root)) as it:
+                    entries = sorted((e for e in it if not e.name.startswith(".")), key=lambda e: e.name)
+            except OSError:
+                continue
+
+            names, sizes, mtimes = [], [], []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_links):
+                        if follow_links:
+                            st = entry.stat()
+                            if (st.st_dev, st.st_ino) in seen_dirs:
+                                continue
+                            seen_dirs.add((st.st_dev, st.st_ino))
+                        next_level.append(f"{rel_root}/{entry.name}" if rel_root else entry.name)
+                        continue
+                    if entry.is_dir():
+                        # A symlinked directory while not following links
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    # Broken symlink or a file removed mid-walk
+                    continue
+                if follow_links:
+                    if (st.st_dev, st.st_ino) in seen_files:
+                        continue
+                    seen_files.add((st.st_dev, st.st_ino))
+                names.append(entry.name)
+                sizes.append(st.st_size)
+                mtimes.append(st.st_mtime_ns)
+
+            if names:
+                tree.add_files(tree.add_dir(rel_root), names, sizes, mtimes)
+        pending = next_level
+    return tree
+
+
+def list_pack_tree(pack: DocsPack, extract_titles: bool = False) -> DocTree:
+    """Build a `DocTree` from a docs pack's table alone, without decompressing any page."""
+    return _tree_from_entries(
+        ((rel_path, raw_len, title) for rel_path, _, _, raw_len, title in pack.entries()),
+        extract_titles,
+    )
+
+
+def list_archive_tree(archive: DocsArchive, extract_titles: bool = False) -> DocTree:
+    """Build a `DocTree` from archive member headers, reading only the head of each markdown member for its title."""
+    head_bytes = TITLE_HEAD_BYTES if extract_titles else 0
+    return _tree_from_entries(
+        (
+            (rel_path, size, title_from_head(head.decode("utf-8", "replace")) if head else "")
+            for rel_path, size, head in archive.entries(head_bytes)
+        ),
+        extract_titles,
+    )
+
+
+def tree_from_manifest(manifest) -> DocTree:
+    """Build a titled `DocTree` from (path, size, title) records, e.g. the crawl manifest.
+
+    A path written more than once keeps its last record, as on disk.
+    """
+    latest = {path: (path, size, title) for path, size, title in manifest}
+    return _tree_from_entries(latest.values(), extract_titles=True)
+
+
+def _tree_from_entries(entries, extract_titles: bool) -> DocTree:
+    by_dir: dict[str, list[tuple[str, int, str]]] = {}
+    for rel_path, size, title in entries:
+        rel_root, _, name = rel_path.rpartition("/")
+        by_dir.setdefault(rel_root, []).append((name, size, title))
+
+    tree = DocTree()
+    for rel_root, files in by_dir.items():
+        files.sort()
+        file_ids = tree.add_files(tree.add_dir(rel_root), [f[0] for f in files], [f[1] for f in files])
+        if extract_titles:
+            for file_id, (_, _, title) in zip(file_ids, files):
+                if title:
+                    tree.set_title(file_id, title)
+    return tree
+
+
+def load_docs_source(
+    docs_dir: str, extract_titles: bool = False, follow_links: bool = False
+) -> tuple[DocTree | None, DocsPack | DocsArchive | None]:
+    """Load a docs directory, pack or archive as a `DocTree`; (None, None) if it does not exist.
+
+    For a pack or archive, titles (if requested) are already set on the tree and
+    the open source is returned alongside it for any further page reads.
+    ``follow_links`` applies to directories (see `list_docs_tree`).
+    """
+    source = open_docs_source(docs_dir)
+    if isinstance(source, DocsPack):
+        return list_pack_tree(source, extract_titles), source
+    if isinstance(source, DocsArchive):
+        return list_archive_tree(source, extract_titles), source
+    if os.path.isdir(docs_dir):
+        return list_docs_tree(docs_dir, follow_links), None
+    return None, None
+
+
+def open_docs_source(docs_dir: str) -> DocsPack | DocsArchive | None:
+    """Open `docs_dir` as a docs pack or archive; None for a plain directory."""
+    if is_pack(docs_dir):
+        return DocsPack(docs_dir)
+    if is_archive(docs_dir):
+        return DocsArchive(docs_dir)
+    return None
+
+
+def source_hint(source: DocsPack | DocsArchive | None) -> str | None:
+    """Index line telling agents how to read one page out of a pack or archive."""
+    if isinstance(source, DocsPack):
+        return f"|pack: read pages with docs_pack.py extract {source.path} PATH"
+    if isinstance(source, DocsArchive):
+        return f"|archive: read pages with {source.read_hint()}"
+    return None
+
+
+def archive_headings(archive: DocsArchive) -> dict[str, tuple[str, list[dict]]]:
+    """{path: (title, headings)} for every markdown page of an archive, read front to back once."""
+    return {rel_path: index_headings(f) for rel_path, f in archive.pages()}
+
+
+def build_docs_tree(docs_dir: str, extract_titles: bool = False, follow_links: bool = False) -> DocTree | None:
+    """Load a docs directory, pack or archive as a `DocTree` with titles applied; None if missing."""
+    tree, pack = load_docs_source(docs_dir, extract_titles, follow_links)
+    if tree is not None and extract_titles:
+        title_cache = TitleCache(docs_dir) if pack is None else None
+        titles, _ = read_titles(
+            docs_dir, tree, tree.dirs(), extract_titles=True, pack=pack, title_cache=title_cache
+        )
+        for file_id, title in titles:
+            tree.set_title(file_id, title)
+    if pack is not None:
+        pack.close()
+    return tree
+
+
+def read_titles(
+    docs_dir: str,
+    tree: DocTree,
+    dir_ids,
+    extract_titles: bool = False,
+    heading_index: bool = False,
+    heading_max_level: int = 3,
+    pack: DocsPack | DocsArchive | None = None,
+    title_cache: TitleCache | None = None,
+    page_headings: dict[str, tuple[str, list[dict]]] | None = None,
+) -> tuple[list[tuple[int, str]], list[str]]:
+    """Read titles (and optionally heading offsets) for the markdown files in `dir_ids`.
+
+    Only reads the tree, so it is safe to call from worker threads; apply the
+    returned titles with `DocTree.set_title` afterwards. For a docs `pack` (or
+    archive), titles already came with the listing, so pages are only read for
+    heading offsets. With a `title_cache`, unchanged pages are not reopened.
+    With `page_headings` (from `archive_headings`), heading offsets are looked
+    up there instead of opening each page.
+
+    Returns:
+        tuple: ([(file_id, title), ...], heading index lines)
+    """
+    titles: list[tuple[int, str]] = []
+    heading_lines: list[str] = []
+    if not (extract_titles or heading_index):
+        return titles, heading_lines
+    if pack is not None and not heading_index:
+        return titles, heading_lines
+
+    for dir_id in dir_ids:
+        if title_cache is not None and not heading_index:
+            titles.extend(title_cache.dir_titles(tree, dir_id))
+            continue
+        rel_root = tree.dir_path(dir_id)
+        for file_id in tree.files(dir_id):
+            f = tree.file_name(file_id)
+            if not f.endswith((".md", ".mdx")):
+                continue
+            rel_path = f"{rel_root}/{f}" if rel_root else f
+            if page_headings is not None:
+                fp = None
+            else:
+                fp = pack.open(rel_path) if pack is not None else os.path.join(docs_dir, rel_path)
+            if heading_index:
+                # One sequential read yields both the title and the sections
+                if fp is None:
+                    title, headings = page_headings.get(rel_path, ("", []))
+                else:
+                    title, headings = index_headings(fp)
+                line = format_heading_index(rel_path, headings, heading_max_level)
+                if line:
+                    heading_lines.append(line)
+            else:
+                title = extract_title(fp)
+            if extract_titles and title and pack is None:
+                titles.append((file_id, title))
+
+    return titles, heading_lines
+
+
+def short_title(title: str) -> str:
+    return title[:50] + "…" if len(title) > 50 else title
+
+
+def render_dir_line(tree: DocTree, dir_id: int, file_ids=None) -> str:
+    """Render one `|dir:{file,...}` line, inlining titles stored on the tree."""
+    parts = []
+    for file_id in tree.files(dir_id) if file_ids is None else file_ids:
+        f = tree.file_name(file_id)
+        title = tree.file_title(file_id)
+        if title:
+            # Include titles inline: {file.md:Title,file2.md:Title2}, truncating long ones
+            parts.append(f"{f}:{short_title(title)}")
+        else:
+            parts.append(f)
+
+    key = tree.dir_path(dir_id) or "root"
+    return f"|{key}:{{{','.join(parts)}}}"
+
+
+def plan_aliases(tree: DocTree, min_files: int = 2) -> dict[int, int]:
+    """Find subtrees whose listing repeats an earlier subtree, in path order.
+
+    Returns ``{alias_dir_id: canonical_dir_id}`` for the topmost repeated
+    subtrees holding at least ``min_files`` files. Canonical subtrees are always
+    the first occurrence, so they are still listed (or aliased piecewise) in full.
+    """
+    # Titles are part of the rendered listing, so they must match too
+    classes, file_counts = tree.subtree_classes(with_titles=True)
+    first: dict[int, int] = {}
+    aliases: dict[int, int] = {}
+    for dir_id in tree.all_dirs():
+        ancestor = tree.parent(dir_id)
+        while ancestor >= 0 and ancestor not in aliases:
+            ancestor = tree.parent(ancestor)
+        if ancestor >= 0:
+            continue
+        canonical = first.setdefault(classes[dir_id], dir_id)
+        if canonical != dir_id and file_counts[dir_id] >= min_files:
+            aliases[dir_id] = canonical
+    return aliases
+
+
+def render_listing(tree: DocTree, aliases: dict[int, int] | None = None) -> list[str]:
+    """Render every directory line in path order, replacing aliased subtrees with `|dir/**=canonical/**`."""
+    if not aliases:
+        return [render_dir_line(tree, dir_id) for dir_id in tree.dirs()]
+
+    lines = ["|aliases: A/**=B/** means A holds the same files as B (swap the prefix)"]
+    for dir_id in tree.all_dirs():
+        ancestor = dir_id
+        while ancestor >= 0 and ancestor not in aliases:
+            ancestor = tree.parent(ancestor)
+        if ancestor == dir_id:
+            lines.append(f"|{tree.dir_path(dir_id)}/**={tree.dir_path(aliases[dir_id]) or 'root'}/**")
+        elif ancestor < 0 and tree.files(dir_id):
+            lines.append(render_dir_line(tree, dir_id))
+    return lines
+
+
 def compress_directory(
     docs_dir: str,
     label: str,
     extract_titles: bool = False,
     include_sizes: bool = False,
+    heading_index: bool = False,
+    heading_max_level: int = 3,
+    tree: DocTree | None = None,
+    dedupe: bool = False,
+    follow_links: bool = False,
 ) -> tuple[str, dict]:
     """Compress a docs directory into pipe-delimited index format.
 
+    Pass a pre-built ``tree`` (e.g. from `build_docs_tree`) to render it without
+    walking `docs_dir` again; its titles are used as-is. With ``heading_index``
+    as well, titles come from the heading pass and are set on ``tree``, so it
+    can be built without them instead of reading every page twice.
+
+    With ``heading_index``, every markdown file is also streamed once to record
+    its headings (up to ``heading_max_level``) with byte offsets, appended as
+    ``|path#{Title@offset+length}`` lines after the directory listing.
+
+    With ``dedupe``, a subtree whose listing (names and titles) repeats an
+    earlier one, as in versioned or localized mirrors, is emitted once and later
+    copies become ``|copy/**=first/**`` alias lines.
+
+    With ``follow_links``, symlinked directories are walked too, and a file
+    reachable through several links is listed, counted and read only once.
+
     Returns:
         tuple: (compressed_content, stats_dict)
     """
-    if not os.path.isdir(docs_dir):
-        return f"# ⚠ Directory not found: {docs_dir}", {"error": True}
+    read_extract = extract_titles
+    if tree is None:
+        tree, pack = load_docs_source(docs_dir, extract_titles, follow_links)
+        if tree is None:
+            return f"# ⚠ Directory not found: {docs_dir}", {"error": True}
+    else:
+        pack = open_docs_source(docs_dir)
+        read_extract = extract_titles and heading_index
 
     lines = []
     lines.append(f"[{label}]|root: {docs_dir}")
     lines.append(
         f"|IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning for any {label} tasks."
     )
+    hint = source_hint(pack)
+    if hint:
+        lines.append(hint)
+
+    dir_ids = tree.dirs()
+    title_cache = TitleCache(docs_dir) if read_extract and pack is None and not heading_index else None
+    titles, heading_lines = read_titles(
+        docs_dir, tree, dir_ids,
+        extract_titles=read_extract,
+        heading_index=heading_index,
+        heading_max_level=heading_max_level,
+        pack=pack,
+        title_cache=title_cache,
+        page_headings=archive_headings(pack) if heading_index and isinstance(pack, DocsArchive) else None,
+    )
+    for file_id, title in titles:
+        tree.set_title(file_id, title)
+    if pack is not None:
+        pack.close()
+
+    # Build compressed index
+    aliases = plan_aliases(tree) if dedupe else {}
+    lines.extend(render_listing(tree, aliases))
 
-    # Collect directory structure
-    dir_entries: dict[str, list[str]] = {}
-    title_map: dict[str, str] = {}
+    if heading_lines:
+        source = f" --source {docs_dir}" if pack is not None else ""
+        lines.append(f"|sections: read with read_section.py FILE OFFSET+LENGTH{source}")
+        lines.extend(sorted(heading_lines))
 
-    for root, dirs, files in os.walk(docs_dir):
-        dirs[:] = sorted([d for d in dirs if not d.startswith(".")])
-        rel_root = os.path.relpath(root, docs_dir)
-        if rel_root == ".":
-            rel_root = ""
+    compressed = "\n".join(lines)
 
-        doc_files = sorted([f for f in files if not f.startswith(".")])
-        if not doc_files:
+    # Calculate stats
+    full_size = tree.total_size
+    compressed_size = len(compressed.encode("utf-8"))
+    file_count = tree.file_count
+    dir_count = len(dir_ids)
+    if aliases:
+        _, subtree_files = tree.subtree_classes()
+        aliased_files = sum(subtree_files[d] for d in aliases)
+    else:
+        aliased_files = 0
+
+    stats = {
+        "full_size_bytes": full_size,
+        "compressed_size_bytes": compressed_size,
+        "compression_ratio": (1 - compressed_size / full_size) * 100 if full_size > 0 else 0,
+        "file_count": file_count,
+        "dir_count": dir_count,
+        "heading_files": len(heading_lines),
+        "aliased_subtrees": len(aliases),
+        "aliased_files": aliased_files,
+    }
+
+    return compressed, stats
+
+
+LINE_KEY_RE = re.compile(r"^\|(.+?)(?::\{|#\{|/\*\*=)")
+
+
+def estimate_tokens(n_bytes: int) -> int:
+    """Rough token count for index text (~4 bytes per token)."""
+    return (n_bytes + 3) // 4
+
+
+def size_report(tree: DocTree, compressed: str, top: int = 15) -> str:
+    """Attribute the bytes of a compressed index to directories, top-level subtrees and titles.
+
+    Directory lines, heading lines and alias lines are charged to their
+    directory; everything else (label, instructions) to ``(header)``. Title bytes
+    are the ``:Title`` suffixes in the rendered listing, grouped by title text.
+    Each table lists the largest entries with their share of the whole index
+    and the running cumulative share.
+    """
+    total = len(compressed.encode("utf-8"))
+    by_dir: dict[str, int] = {}
+    listed: set[str] = set()
+    lines = compressed.split("\n")
+    for i, line in enumerate(lines):
+        # Every line but the last carries its newline
+        size = len(line.encode("utf-8")) + (i < len(lines) - 1)
+        match = LINE_KEY_RE.match(line)
+        if not match or line.startswith(("|IMPORTANT:", "|sections:", "|aliases:", "|pack:", "|archive:")):
+            key = "(header)"
+        elif match.group(0).endswith("#{"):
+            key = match.group(1).rpartition("/")[0] or "root"
+        else:
+            key = match.group(1)
+            if match.group(0).endswith(":{"):
+                listed.add(key)
+        by_dir[key] = by_dir.get(key, 0) + size
+
+    by_subtree: dict[str, int] = {}
+    for key, size in by_dir.items():
+        top_key = key if key.startswith("(") else key.split("/", 1)[0]
+        by_subtree[top_key] = by_subtree.get(top_key, 0) + size
+
+    by_title: dict[str, list[int]] = {}
+    for dir_id in tree.dirs():
+        if (tree.dir_path(dir_id) or "root") not in listed:
             continue
+        for file_id in tree.files(dir_id):
+            title = tree.file_title(file_id)
+            if title:
+                entry = by_title.setdefault(short_title(title), [0, 0])
+                entry[0] += len(f":{short_title(title)}".encode("utf-8"))
+                entry[1] += 1
 
-        dir_entries[rel_root] = doc_files
+    def table(heading: str, rows: list[tuple[str, int, str]]) -> list[str]:
+        rows.sort(key=lambda r: -r[1])
+        out = [f"   {heading} (top {min(top, len(rows))} of {len(rows)}):"]
+        out.append(f"   {'bytes':>8} {'tokens':>7} {'share':>6} {'cum.':>6}")
+        cumulative = 0
+        for name, size, extra in rows[:top]:
+            cumulative += size
+            share = size / total * 100 if total else 0
+            cum_share = cumulative / total * 100 if total else 0
+            out.append(f"   {size:>8} {estimate_tokens(size):>7} {share:>5.1f}% {cum_share:>5.1f}%  {name}{extra}")
+        return out
 
-        if extract_titles:
-            for f in doc_files:
-                if f.endswith((".md", ".mdx")):
-                    fp = os.path.join(root, f)
-                    title = extract_title(fp)
-                    if title:
-                        rel_path = os.path.join(rel_root, f) if rel_root else f
-                        title_map[rel_path] = title
+    lines = [f"📏 Size report: {total} bytes ≈ {estimate_tokens(total)} tokens"]
+    lines += table("Directories", [(k, v, "") for k, v in by_dir.items()])
+    lines += table("Top-level subtrees", [(k, v, "") for k, v in by_subtree.items()])
+    if by_title:
+        lines += table("Titles", [(k, v[0], f" (×{v[1]})" if v[1] > 1 else "") for k, v in by_title.items()])
+    return "\n".join(lines)
 
-    # Build compressed index
-    for dir_path in sorted(dir_entries.keys()):
-        files = dir_entries[dir_path]
 
-        if extract_titles:
-            # Include titles inline: {file.md:Title,file2.md:Title2}
-            parts = []
-            for f in files:
-                rel = os.path.join(dir_path, f) if dir_path else f
-                title = title_map.get(rel, "")
-                if title:
-                    # Truncate long titles
-                    title_short = title[:50] + "…" if len(title) > 50 else title
-                    parts.append(f"{f}:{title_short}")
+def estimate_directory(
+    docs_dir: str,
+    label: str,
+    extract_titles: bool = False,
+    heading_index: bool = False,
+    heading_max_level: int = 3,
+    probes: int = 200,
+    sample_files: int = 5,
+    seed: int | None = None,
+    follow_links: bool = False,
+) -> dict:
+    """Estimate index size, tokens, file count and source bytes without a full walk.
+
+    Uses Knuth's random-probe estimator: each probe descends from the root
+    through uniformly chosen subdirectories and weights every directory it
+    passes by the product of the branching factors above it, which is an
+    unbiased estimate of the sum over all directories. Within a visited
+    directory, titles (and heading lines) are read for at most
+    ``sample_files`` markdown files and scaled to the rest. Listings and title
+    samples are cached, so repeated probes only touch new directories.
+
+    Links are treated as in `list_docs_tree`: symlinked directories are only
+    entered with ``follow_links``, then a directory already listed under another
+    path (a loop or a second link) is not entered again, and broken links are skipped.
+
+    Returns:
+        dict of ``(estimate, low, high)`` 95% bounds for ``index_bytes``,
+        ``tokens``, ``file_count``, ``dir_count`` and ``full_size_bytes``, plus
+        ``probes`` and ``dirs_listed``
+    """
+    import random
+    import statistics
+
+    rng = random.Random(seed)
+    header = (
+        f"[{label}]|root: {docs_dir}\n"
+        f"|IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning for any {label} tasks."
+    )
+    header_bytes = len(header.encode("utf-8"))
+    cache: dict[str, tuple[list[str], tuple[float, ...]]] = {}
+    # (st_dev, st_ino) -> the one path a directory is probed under when following links
+    dir_paths: dict[tuple[int, int], str] = {}
+    if follow_links:
+        try:
+            st = os.stat(docs_dir)
+            dir_paths[(st.st_dev, st.st_ino)] = ""
+        except OSError:
+            pass
+
+    def visit(rel_root: str) -> tuple[list[str], tuple[float, ...]]:
+        """Child directories and (index bytes, files, dirs with files, source bytes) of one directory."""
+        if rel_root in cache:
+            return cache[rel_root]
+        try:
+            with os.scandir(os.path.join(docs_dir, rel_root)) as it:
+                entries = sorted((e for e in it if not e.name.startswith(".")), key=lambda e: e.name)
+        except OSError:
+            entries = []
+        subdirs, files, sizes = [], [], []
+        for e in entries:
+            try:
+                if e.is_dir(follow_symlinks=follow_links):
+                    rel_path = f"{rel_root}/{e.name}" if rel_root else e.name
+                    if follow_links:
+                        st = e.stat()
+                        if dir_paths.setdefault((st.st_dev, st.st_ino), rel_path) != rel_path:
+                            continue
+                    subdirs.append(rel_path)
+                    continue
+                if e.is_dir():
+                    # A symlinked directory while not following links
+                    continue
+                sizes.append(e.stat().st_size)
+            except OSError:
+                # Broken symlink or a file removed mid-walk
+                continue
+            files.append(e)
+        if not files:
+            cache[rel_root] = (subdirs, (0.0, 0.0, 0.0, 0.0))
+            return cache[rel_root]
+
+        key = rel_root or "root"
+        # "|key:{a,b,c}\n"
+        line_bytes = len(f"|{key}:{{}}".encode("utf-8")) + 1
+        line_bytes += sum(len(e.name.encode("utf-8")) for e in files) + len(files) - 1
+        source_bytes = sum(sizes)
+
+        md_files = [e for e in files if e.name.endswith((".md", ".mdx"))]
+        if md_files and (extract_titles or heading_index):
+            sample = rng.sample(md_files, min(sample_files, len(md_files)))
+            extra = 0
+            for e in sample:
+                rel_path = f"{rel_root}/{e.name}" if rel_root else e.name
+                if heading_index:
+                    title, headings = index_headings(e.path)
+                    heading_line = format_heading_index(rel_path, headings, heading_max_level)
+                    if heading_line:
+                        extra += len(heading_line.encode("utf-8")) + 1
                 else:
-                    parts.append(f)
-            file_list = ",".join(parts)
+                    title = extract_title(e.path)
+                if extract_titles and title:
+                    extra += len(f":{short_title(title)}".encode("utf-8"))
+            line_bytes += extra * len(md_files) / len(sample)
+
+        cache[rel_root] = (subdirs, (line_bytes, float(len(files)), 1.0, float(source_bytes)))
+        return cache[rel_root]
+
+    totals = []
+    for _ in range(max(probes, 2)):
+        weight = 1.0
+        sums = [0.0, 0.0, 0.0, 0.0]
+        rel_root = ""
+        while True:
+            subdirs, values = visit(rel_root)
+            for i, v in enumerate(values):
+                sums[i] += weight * v
+            if not subdirs:
+                break
+            weight *= len(subdirs)
+            rel_root = rng.choice(subdirs)
+        totals.append(sums)
+
+    # Whatever was actually listed is a hard lower bound
+    seen = [sum(values[i] for _, values in cache.values()) for i in range(4)]
+
+    def bounds(i: int, offset: float = 0.0) -> tuple[int, int, int]:
+        samples = [t[i] for t in totals]
+        mean = statistics.fmean(samples)
+        half = 1.96 * statistics.stdev(samples) / len(samples) ** 0.5
+        low = max(mean - half, seen[i])
+        mean = max(mean, seen[i])
+        return round(mean + offset), round(low + offset), round(max(mean + half, low) + offset)
+
+    index_bytes = bounds(0, header_bytes)
+    return {
+        "index_bytes": index_bytes,
+        "tokens": tuple(estimate_tokens(b) for b in index_bytes),
+        "file_count": bounds(1),
+        "dir_count": bounds(2),
+        "full_size_bytes": bounds(3),
+        "probes": len(totals),
+        "dirs_listed": len(cache),
+    }
+
+
+SHARD_FILE_RE = re.compile(r"^\d{3}-.+\.md$")
+
+
+def plan_shards(
+    tree: DocTree,
+    shard_bytes: int,
+    extract_titles: bool = False,
+    heading_index: bool = False,
+) -> list[tuple[str, bool]]:
+    """Split a docs tree into scopes whose estimated index size fits `shard_bytes`.
+
+    A subtree that fits the budget becomes one scope ``(prefix, True)``; larger
+    subtrees are split into the directory's own files ``(prefix, False)`` plus
+    one or more scopes per child, recursively.
+
+    Returns:
+        list of (dir_prefix, recursive) scopes in path order
+    """
+    own: dict[str, int] = {}
+    subtree: dict[str, int] = {"": 0}
+    children: dict[str, set[str]] = {"": set()}
+
+    for dir_id in tree.dirs():
+        dir_path = tree.dir_path(dir_id)
+        size = len(render_dir_line(tree, dir_id)) + 1
+        md_count = sum(
+            1 for file_id in tree.files(dir_id)
+            if tree.file_name(file_id).endswith((".md", ".mdx"))
+        )
+        # Rough allowances for ":Title" and "|path#{...}" per markdown file
+        if extract_titles:
+            size += 24 * md_count
+        if heading_index:
+            size += 160 * md_count
+        own[dir_path] = size
+
+        subtree[""] += size
+        parent = ""
+        path = ""
+        for part in dir_path.split("/") if dir_path else []:
+            path = f"{path}/{part}" if path else part
+            children.setdefault(parent, set()).add(path)
+            subtree[path] = subtree.get(path, 0) + size
+            parent = path
+
+    def split(prefix: str) -> list[tuple[str, bool]]:
+        if subtree[prefix] <= shard_bytes:
+            return [(prefix, True)]
+        scopes = []
+        if prefix in own:
+            scopes.append((prefix, False))
+        for child in sorted(children.get(prefix, ())):
+            scopes.extend(split(child))
+        return scopes
+
+    return split("")
+
+
+def _scope_label(prefix: str, recursive: bool) -> str:
+    return f"{prefix or 'root'}/{'**' if recursive else '*'}"
+
+
+def _scope_dirs(tree: DocTree, dir_paths: dict[int, str], prefix: str, recursive: bool) -> list[int]:
+    if not recursive:
+        return [tree.find_dir(prefix)]
+    return [
+        d for d, path in dir_paths.items()
+        if not prefix or path == prefix or path.startswith(prefix + "/")
+    ]
+
+
+def _dir_lines(tree: DocTree, dir_id: int, budget: int) -> list[str]:
+    """Render a directory as one line, or several if it alone exceeds the budget."""
+    line = render_dir_line(tree, dir_id)
+    if len(line.encode("utf-8")) < budget:
+        return [line]
+
+    files = tree.files(dir_id)
+    lines = []
+    start = 0
+    for end in range(1, len(files) + 1):
+        candidate = render_dir_line(tree, dir_id, files[start:end])
+        if end - start > 1 and len(candidate.encode("utf-8")) >= budget:
+            lines.append(render_dir_line(tree, dir_id, files[start:end - 1]))
+            start = end - 1
+    lines.append(render_dir_line(tree, dir_id, files[start:]))
+    return lines
+
+
+def _pack_lines(lines: list[str], budget: int) -> list[list[str]]:
+    """Greedily pack lines, in order, into chunks of at most `budget` bytes."""
+    chunks: list[list[str]] = [[]]
+    size = 0
+    for line in lines:
+        line_size = len(line.encode("utf-8")) + 1
+        if chunks[-1] and size + line_size > budget:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(line)
+        size += line_size
+    return chunks
+
+
+def compress_sharded(
+    docs_dir: str,
+    label: str,
+    shard_dir: str,
+    shard_bytes: int = 8192,
+    extract_titles: bool = False,
+    heading_index: bool = False,
+    heading_max_level: int = 3,
+    workers: int | None = None,
+    write: bool = True,
+    follow_links: bool = False,
+) -> tuple[str, dict]:
+    """Compress a docs directory into a small top-level index plus per-subtree shard files.
+
+    Files for each scope from `plan_shards` are read in parallel, then adjacent scopes are
+    merged into shards of at most `shard_bytes` and written to `shard_dir` as
+    `NNN-<subtree>.md`. A scope too large for one shard is split into ordered
+    parts (`NNN-<subtree>-{1..N}.md`). The returned top-level index maps each
+    shard to the subtrees it covers (`dir/**` for a whole subtree, `dir/*` for a
+    directory's own files) so agents load only the shard they need.
+
+    Returns:
+        tuple: (top_level_index, stats_dict)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    tree, pack = load_docs_source(docs_dir, extract_titles, follow_links)
+    if tree is None:
+        return f"# ⚠ Directory not found: {docs_dir}", {"error": True}
+
+    # Sorted by path, so every scope's directories come out in path order
+    dir_paths = {d: tree.dir_path(d) for d in tree.dirs()}
+    scopes = plan_shards(
+        tree, shard_bytes,
+        extract_titles=extract_titles, heading_index=heading_index,
+    )
+
+    def shard_header(shard_scopes) -> str:
+        scope_list = ",".join(_scope_label(p, r) for p, r in shard_scopes)
+        return f"[{label}]|root: {docs_dir}|shard: {{{scope_list}}}"
+
+    def body_budget(shard_scopes) -> int:
+        # What's left of shard_bytes after this shard's own header line and its newline
+        return max(shard_bytes - len(shard_header(shard_scopes).encode("utf-8")) - 1, 1)
+
+    scope_dirs = [_scope_dirs(tree, dir_paths, *scope) for scope in scopes]
+    title_cache = TitleCache(docs_dir) if extract_titles and pack is None and not heading_index else None
+    page_headings = archive_headings(pack) if heading_index and isinstance(pack, DocsArchive) else None
+
+    def read_scope(dirs: list[int]) -> list[tuple[list[tuple[int, str]], list[str]]]:
+        return [
+            read_titles(
+                docs_dir, tree, [d],
+                extract_titles=extract_titles,
+                heading_index=heading_index,
+                heading_max_level=heading_max_level,
+                pack=pack,
+                title_cache=title_cache,
+                page_headings=page_headings,
+            )
+            for d in dirs
+        ]
+
+    # File reads run in parallel; the tree is only mutated back on this thread
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scope_reads = list(pool.map(read_scope, scope_dirs))
+    if pack is not None:
+        pack.close()
+
+    rendered = []
+    for scope, dirs, reads in zip(scopes, scope_dirs, scope_reads):
+        budget = body_budget([scope])
+        body = []
+        for d, (titles, heading_lines) in zip(dirs, reads):
+            for file_id, title in titles:
+                tree.set_title(file_id, title)
+            body.extend(_dir_lines(tree, d, budget))
+            body.extend(heading_lines)
+        rendered.append((body, sum(len(tree.files(d)) for d in dirs)))
+
+    # Merge adjacent scopes by their real rendered size, header included: it grows with every scope
+    shards: list[dict] = []
+    for scope, (body, file_count) in zip(scopes, rendered):
+        size = sum(len(line.encode("utf-8")) + 1 for line in body)
+        last = shards[-1] if shards else None
+        if last and last["size"] + size <= body_budget(last["scopes"] + [scope]):
+            last["scopes"].append(scope)
+            last["body"].extend(body)
+            last["size"] += size
+            last["files"] += file_count
         else:
-            file_list = ",".join(files)
+            shards.append({"scopes": [scope], "body": body, "size": size, "files": file_count})
 
-        key = dir_path if dir_path else "root"
-        lines.append(f"|{key}:{{{file_list}}}")
+    index_lines = []
+    shard_files: dict[str, str] = {}
+    for number, shard in enumerate(shards, 1):
+        scope_list = ",".join(_scope_label(p, r) for p, r in shard["scopes"])
+        header = shard_header(shard["scopes"])
+        slug = re.sub(r"[^\w.-]+", "-", shard["scopes"][0][0]).strip("-") or "root"
+        chunks = _pack_lines(shard["body"], body_budget(shard["scopes"]))
+        if len(chunks) == 1:
+            name = f"{number:03d}-{slug}.md"
+            shard_files[name] = "\n".join([header] + chunks[0])
+        else:
+            name = f"{number:03d}-{slug}-{{1..{len(chunks)}}}.md"
+            for part, chunk in enumerate(chunks, 1):
+                shard_files[f"{number:03d}-{slug}-{part}.md"] = "\n".join([header] + chunk)
+        index_lines.append(f"|@{name}:{{{scope_list}}}({shard['files']} files)")
 
-    compressed = "\n".join(lines)
+    if write:
+        os.makedirs(shard_dir, exist_ok=True)
+        for stale in os.listdir(shard_dir):
+            if SHARD_FILE_RE.match(stale):
+                os.remove(os.path.join(shard_dir, stale))
+        for name, content in shard_files.items():
+            with open(os.path.join(shard_dir, name), "w", encoding="utf-8") as f:
+                f.write(content)
 
-    # Calculate stats
-    full_size = sum(
-        os.path.getsize(os.path.join(root, f))
-        for root, dirs, files in os.walk(docs_dir)
-        for f in files
-        if not f.startswith(".")
+    lines = []
+    lines.append(f"[{label}]|root: {docs_dir}")
+    lines.append(
+        f"|IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning for any {label} tasks."
     )
+    hint = source_hint(pack)
+    if hint:
+        lines.append(hint)
+    lines.append(f"|shards: {shard_dir} (load only the shard covering the path you need; parts are in path order)")
+    lines.extend(index_lines)
+
+    compressed = "\n".join(lines)
+    full_size = tree.total_size
     compressed_size = len(compressed.encode("utf-8"))
-    file_count = sum(len(v) for v in dir_entries.values())
-    dir_count = len(dir_entries)
+    shard_sizes = [len(c.encode("utf-8")) for c in shard_files.values()]
 
     stats = {
         "full_size_bytes": full_size,
         "compressed_size_bytes": compressed_size,
         "compression_ratio": (1 - compressed_size / full_size) * 100 if full_size > 0 else 0,
-        "file_count": file_count,
-        "dir_count": dir_count,
+        "file_count": tree.file_count,
+        "dir_count": len(dir_paths),
+        "heading_files": 0,
+        "shard_count": len(shard_sizes),
+        "shard_total_bytes": sum(shard_sizes),
+        "largest_shard_bytes": max(shard_sizes, default=0),
     }
 
     return compressed, stats
@@ -159,24 +1083,115 @@ def main():
     parser = argparse.ArgumentParser(
         description="Compress documentation directory into AGENTS.md index format"
     )
-    parser.add_argument("docs_dir", help="Path to documentation directory")
+    parser.add_argument("docs_dir", help="Path to documentation directory, docs pack (.dpk) or archive (.zip, .tar, .tar.gz)")
     parser.add_argument("label", help="Label for this docs section (e.g. 'Next.js 16 Docs')")
     parser.add_argument("--output", "-o", help="Output file (default: stdout)")
     parser.add_argument(
         "--extract-titles", action="store_true",
         help="Extract titles from markdown frontmatter/headings"
     )
+    parser.add_argument(
+        "--heading-index", action="store_true",
+        help="Also index every markdown heading with its byte offset and length"
+    )
+    parser.add_argument(
+        "--heading-level", type=int, default=3,
+        help="Deepest heading level to include in the heading index (default: 3)"
+    )
+    parser.add_argument(
+        "--shard-dir", metavar="DIR",
+        help="Write per-subtree shard files here and output only a top-level index"
+    )
+    parser.add_argument(
+        "--shard-bytes", type=int, default=8192,
+        help="Byte budget per shard file (default: 8192)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Parallel workers for shard generation (default: Python's choice)"
+    )
+    parser.add_argument(
+        "--dedupe", action="store_true",
+        help="List repeated subtrees once and reference later copies by alias"
+    )
+    parser.add_argument(
+        "--follow-links", action="store_true",
+        help="Walk symlinked directories, listing each physical file (by device and inode) once"
+    )
+    parser.add_argument(
+        "--size-report", type=int, nargs="?", const=15, metavar="N",
+        help="Attribute index bytes and tokens to directories and titles, showing the top N (default: 15)"
+    )
+    parser.add_argument(
+        "--estimate", type=int, nargs="?", const=200, metavar="PROBES",
+        help="Estimate sizes from random directory probes instead of a full run (default: 200 probes)"
+    )
     parser.add_argument(
         "--dry-run", action="store_true",
         help="Show compression stats without writing output"
     )
 
     args = parser.parse_args()
+    if args.dedupe and args.shard_dir:
+        parser.error("--dedupe cannot be combined with --shard-dir")
+    if args.size_report is not None and args.shard_dir:
+        parser.error("--size-report cannot be combined with --shard-dir")
 
-    compressed, stats = compress_directory(
-        args.docs_dir, args.label,
-        extract_titles=args.extract_titles,
-    )
+    if args.estimate is not None:
+        if args.estimate < 2:
+            parser.error("--estimate needs at least 2 probes")
+        if not os.path.isdir(args.docs_dir):
+            parser.error("--estimate needs a docs directory (packs and archives list their contents cheaply)")
+        est = estimate_directory(
+            args.docs_dir, args.label,
+            extract_titles=args.extract_titles,
+            heading_index=args.heading_index,
+            heading_max_level=args.heading_level,
+            probes=args.estimate,
+            follow_links=args.follow_links,
+        )
+
+        def fmt(key: str, scale: float = 1, unit: str = "") -> str:
+            value, low, high = (v / scale for v in est[key])
+            digits = 1 if scale > 1 else 0
+            return f"~{value:.{digits}f}{unit} (95%: {low:.{digits}f}–{high:.{digits}f}{unit})"
+
+        print(f"📐 Estimate for '{args.label}' ({est['probes']} probes, {est['dirs_listed']} dirs listed):", file=sys.stderr)
+        print(f"   Source:      {fmt('full_size_bytes', 1024, 'KB')}", file=sys.stderr)
+        print(f"   Files:       {fmt('file_count')} in {fmt('dir_count')} dirs", file=sys.stderr)
+        print(f"   Index:       {fmt('index_bytes', 1024, 'KB')}", file=sys.stderr)
+        print(f"   Tokens:      {fmt('tokens')}", file=sys.stderr)
+        return
+
+    if args.shard_dir:
+        compressed, stats = compress_sharded(
+            args.docs_dir, args.label, args.shard_dir,
+            shard_bytes=args.shard_bytes,
+            extract_titles=args.extract_titles,
+            heading_index=args.heading_index,
+            heading_max_level=args.heading_level,
+            workers=args.workers,
+            write=not args.dry_run,
+            follow_links=args.follow_links,
+        )
+    else:
+        tree = None
+        if args.size_report is not None:
+            # The heading pass reads a directory's titles along the way, so don't read them up front
+            # too; packs and archives list theirs with the tree, and the heading pass doesn't set them
+            listed_titles = is_pack(args.docs_dir) or is_archive(args.docs_dir)
+            tree = build_docs_tree(
+                args.docs_dir, args.extract_titles and (listed_titles or not args.heading_index), args.follow_links
+            )
+        compressed, stats = compress_directory(
+            args.docs_dir, args.label,
+            extract_titles=args.extract_titles,
+            heading_index=args.heading_index,
+            heading_max_level=args.heading_level,
+            tree=tree,
+            dedupe=args.dedupe,
+            follow_links=args.follow_links,
+        )
 
     if "error" in stats:
         print(compressed, file=sys.stderr)
@@ -190,7 +1205,17 @@ def main():
     print(f"📊 Compression Results for '{args.label}':", file=sys.stderr)
     print(f"   Source:      {full_kb:.1f}KB ({stats['file_count']} files in {stats['dir_count']} dirs)", file=sys.stderr)
     print(f"   Index:       {comp_kb:.1f}KB", file=sys.stderr)
+    if stats.get("shard_count"):
+        shard_kb = stats["shard_total_bytes"] / 1024
+        largest_kb = stats["largest_shard_bytes"] / 1024
+        print(f"   Shards:      {stats['shard_count']} files, {shard_kb:.1f}KB total (largest {largest_kb:.1f}KB)", file=sys.stderr)
+    if stats.get("aliased_subtrees"):
+        print(f"   Dedupe:      {stats['aliased_subtrees']} repeated subtrees ({stats['aliased_files']} files) aliased", file=sys.stderr)
+    if stats["heading_files"]:
+        print(f"   Sections:    {stats['heading_files']} files with heading offsets", file=sys.stderr)
     print(f"   Compression: {ratio:.0f}% reduction", file=sys.stderr)
+    if args.size_report is not None and tree is not None:
+        print(f"\n{size_report(tree, compressed, args.size_report)}", file=sys.stderr)
 
     if args.dry_run:
         print(f"\n   [Dry run - no output written]", file=sys.stderr)
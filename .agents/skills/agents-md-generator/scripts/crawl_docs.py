@@ -13,6 +13,22 @@ Usage:
 
     # Crawl and immediately generate compressed index
     python crawl_docs.py https://v3.tauri.app/docs --output ./.tauri-docs --compress
+
+    # Write a single compressed pack file instead of one .md per page
+    python crawl_docs.py https://v3.tauri.app/docs --output ./.tauri-docs --pack ./tauri-docs.dpk
+
+    # Strip nav/footers, base64 images and extra blank lines; cap pages at 64KB
+    python crawl_docs.py https://v3.tauri.app/docs --output ./.tauri-docs --normalize --max-page-bytes 65536
+
+    # Talk to a self-hosted Firecrawl or the local stub (firecrawl_stub.py) over plain HTTP
+    python crawl_docs.py https://docs.example.com/docs --output ./.stub-docs --api-url http://127.0.0.1:3002
+
+    # Refetch only pages the sitemap lists as new or changed; delete pages it no longer lists
+    python crawl_docs.py https://v3.tauri.app/docs --output ./.tauri-docs --sitemap
+
+Pages are written as each poll returns them, and progress is checkpointed to
+<output>/.crawl-checkpoint.json. Rerunning the same command after an interruption
+resumes the crawl job and skips pages already written (use --no-resume to start over).
 """
 
 import argparse
@@ -20,9 +36,11 @@ import os
 import sys
 import re
 import json
-from pathlib import Path
+import time
 from urllib.parse import urlparse
 
+from url_frontier import UrlFrontier, canonicalize_url
+
 
 def sanitize_filename(url_path: str) -> str:
     """Convert a URL path into a filesystem-safe path."""
@@ -41,88 +59,415 @@ def sanitize_filename(url_path: str) -> str:
     return path
 
 
-def organize_crawl_results(results: list[dict], output_dir: str, base_url: str) -> dict:
-    """Organize crawl results into a directory structure matching the URL hierarchy."""
-    os.makedirs(output_dir, exist_ok=True)
-
-    parsed_base = urlparse(base_url)
-    base_path = parsed_base.path.rstrip("/")
-
-    stats = {"pages": 0, "total_bytes": 0, "errors": 0}
-
-    for page in results:
-        url = page.get("url", "") or page.get("sourceURL", "")
-        content = page.get("markdown", "") or page.get("content", "")
-        title = page.get("metadata", {}).get("title", "")
-
-        if not url or not content:
-            stats["errors"] += 1
-            continue
-
-        # Extract path relative to base URL
-        parsed = urlparse(url)
-        rel_path = parsed.path
-        if rel_path.startswith(base_path):
-            rel_path = rel_path[len(base_path):]
-
-        filepath = sanitize_filename(rel_path)
-        if not filepath or filepath == ".md":
-            filepath = "index.md"
-
-        full_path = os.path.join(output_dir, filepath)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
-        # Add frontmatter with source URL and title
-        frontmatter = f"---\ntitle: \"{title}\"\nsource: {url}\n---\n\n"
-        final_content = frontmatter + content
-
-        with open(full_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
-
+def organize_crawl_results(
+    results: list[dict], output_dir: str, base_url: str, pack=None, stages=None, frontier=None
+) -> dict:
+    """Organize crawl results into a directory structure matching the URL hierarchy.
+
+    With `pack` (a `docs_pack.PackWriter`), pages are appended to the single-file
+    pack under the same relative paths instead of being written to `output_dir`.
+
+    With `stages` (see page_stages.py), page contents stream through each
+    normalization stage before being written; stages keep their own byte savings.
+    Deferred stages (boilerplate) only run later, in `finish_deferred_stages`.
+
+    Each page's frontmatter records its ``source:`` URL and a ``crawled:`` UTC
+    timestamp, which ``--sitemap`` compares with the sitemap's ``<lastmod>``.
+
+    The returned stats include a ``manifest`` of (path, size, title) for every
+    page written, with titles as compress_docs would read them back, so the
+    index can be built with `compress_docs.tree_from_manifest` without
+    reopening any page.
+
+    Page URLs are canonicalized through `frontier` (a `url_frontier.UrlFrontier`;
+    pass the same one for every batch of a crawl). Variants of a URL already
+    written are counted in ``duplicates``; a distinct URL that maps to a path
+    another URL already holds is skipped before anything is written and listed
+    in ``collisions`` as (path, kept URL, skipped URL).
+    """
+    from compress_docs import TITLE_HEAD_BYTES, title_from_head
+
+    if pack is None:
+        os.makedirs(output_dir, exist_ok=True)
+    if frontier is None:
+        frontier = UrlFrontier(base_url)
+
+    stats = {"pages": 0, "total_bytes": 0, "errors": 0, "duplicates": 0, "collisions": [], "manifest": []}
+    crawled = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    def ingest():
+        for page in results:
+            url = _page_url(page)
+            content = _field(page, "markdown", "") or _field(page, "content", "")
+            title = _field(_field(page, "metadata", {}) or {}, "title", "") or ""
+
+            if not url or not content:
+                stats["errors"] += 1
+                continue
+
+            canonical = canonicalize_url(url)
+            if not frontier.seen.add(canonical):
+                stats["duplicates"] += 1
+                continue
+            # Path relative to base URL; claimed before any stage or write sees the page
+            filepath, owner = frontier.claim(url)
+            if owner:
+                stats["collisions"].append((filepath, owner, canonical))
+                continue
+
+            yield {"path": filepath, "url": url, "title": title, "content": content}
+
+    pages = ingest()
+    for stage in stages or []:
+        pages = stage(pages)
+
+    for page in pages:
+        filepath, url, title = page["path"], page["url"], page["title"]
+
+        # Add frontmatter with source URL, title and crawl time
+        frontmatter = f"---\ntitle: \"{title}\"\nsource: {url}\ncrawled: {crawled}\n---\n\n"
+        final_content = frontmatter + page["content"]
+
+        if pack is not None:
+            pack.add(filepath, final_content, title)
+        else:
+            full_path = os.path.join(output_dir, filepath)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w", encoding="utf-8") as f:
+                f.write(final_content)
+
+        size = len(final_content.encode("utf-8"))
         stats["pages"] += 1
-        stats["total_bytes"] += len(final_content.encode("utf-8"))
+        stats["total_bytes"] += size
+        # A pack stores the title in its table; a directory page's comes from its frontmatter
+        if pack is None:
+            title = title_from_head(final_content[:TITLE_HEAD_BYTES])
+        stats["manifest"].append((filepath, size, title))
 
     return stats
 
 
-def crawl_with_firecrawl(url: str, max_pages: int = 100, **kwargs) -> list[dict]:
-    """Crawl a URL using Firecrawl and return results."""
+def _split_frontmatter(text: str) -> tuple[str, str]:
+    """(frontmatter block, body) of a page written by `organize_crawl_results`."""
+    if text.startswith("---\n"):
+        end = text.find("\n---\n\n")
+        if end != -1:
+            return text[:end + 6], text[end + 6:]
+    return "", text
+
+
+def finish_deferred_stages(stages, rel_paths: list[str], output_dir: str, pack_path: str | None = None) -> dict:
+    """Run the deferred stages over the pages of a finished crawl, in two passes.
+
+    Every page in `rel_paths` is read once so the stages can learn from all of
+    them, then read again and rewritten if a stage changed it. Frontmatter is
+    left alone. A pack (closed by now) is copied to a new pack that replaces it,
+    rather than growing by a second blob for each rewritten page.
+
+    Returns:
+        {relative path: new size in bytes} for every page that changed
+    """
+    from page_stages import apply_deferred, learn_deferred
+
+    rel_paths = sorted(set(rel_paths))
+    if pack_path:
+        from docs_pack import DocsPack, PackWriter
+
+        with DocsPack(pack_path) as reader:
+            present = {path for path, *_ in reader.entries()}
+            rel_paths = [p for p in rel_paths if p in present]
+            if not learn_deferred(stages, (_split_frontmatter(reader.read(p))[1] for p in rel_paths)):
+                return {}
+            targets = set(rel_paths)
+            changed = {}
+            tmp = pack_path + ".tmp"
+            with PackWriter(tmp) as writer:
+                for path, _, _, _, title in reader.entries():
+                    text = reader.read(path)
+                    if path in targets:
+                        frontmatter, body = _split_frontmatter(text)
+                        new_body = apply_deferred(stages, body)
+                        if new_body != body:
+                            text = frontmatter + new_body
+                            changed[path] = len(text.encode("utf-8"))
+                    writer.add(path, text, title)
+        os.replace(tmp, pack_path)
+        return changed
+
+    def read(rel_path):
+        try:
+            with open(os.path.join(output_dir, rel_path), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    if not learn_deferred(stages, (_split_frontmatter(text)[1] for text in map(read, rel_paths) if text is not None)):
+        return {}
+    changed = {}
+    for rel_path in rel_paths:
+        text = read(rel_path)
+        if text is None:
+            continue
+        frontmatter, body = _split_frontmatter(text)
+        new_body = apply_deferred(stages, body)
+        if new_body != body:
+            text = frontmatter + new_body
+            with open(os.path.join(output_dir, rel_path), "w", encoding="utf-8") as f:
+                f.write(text)
+            changed[rel_path] = len(text.encode("utf-8"))
+    return changed
+
+
+def _field(obj, name: str, default=None):
+    """Read a field from a Firecrawl response, which may be a dict or a model object."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _page_url(page) -> str:
+    metadata = _field(page, "metadata", {}) or {}
+    return _field(page, "url", "") or _field(page, "sourceURL", "") or _field(metadata, "sourceURL", "")
+
+
+class FirecrawlRestClient:
+    """Minimal stdlib client for the Firecrawl v1 crawl and batch scrape endpoints.
+
+    Used with `--api-url` (or FIRECRAWL_API_URL) to reach a self-hosted
+    Firecrawl or firecrawl_stub.py without firecrawl-py. Status responses are
+    paginated through ``next``; the client remembers how many pages it has
+    fetched per job and asks only for the rest with ``?skip=``, so each poll
+    returns new pages instead of the whole crawl so far.
+    """
+
+    def __init__(self, api_url: str, api_key: str | None = None, timeout: float = 60.0):
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self._offsets: dict[str, int] = {}
+
+    def _request(self, method: str, url: str, body: dict | None = None) -> dict:
+        from urllib.request import Request, urlopen
+
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        with urlopen(Request(url, data=data, headers=headers, method=method), timeout=self.timeout) as resp:
+            return json.load(resp)
+
+    def async_crawl_url(self, url: str, params: dict | None = None) -> dict:
+        return self._request("POST", f"{self.api_url}/v1/crawl", {"url": url, **(params or {})})
+
+    def check_crawl_status(self, job_id: str) -> dict:
+        return self._status("crawl", job_id)
+
+    def async_batch_scrape_urls(self, urls: list[str], params: dict | None = None) -> dict:
+        return self._request("POST", f"{self.api_url}/v1/batch/scrape", {"urls": urls, **(params or {})})
+
+    def check_batch_scrape_status(self, job_id: str) -> dict:
+        return self._status("batch/scrape", job_id)
+
+    def _status(self, kind: str, job_id: str) -> dict:
+        offset = self._offsets.get(job_id, 0)
+        status = self._request("GET", f"{self.api_url}/v1/{kind}/{job_id}?skip={offset}")
+        data = list(status.get("data") or [])
+        while status.get("next"):
+            status = self._request("GET", status["next"])
+            data.extend(status.get("data") or [])
+        # Only advance once every page of the response has arrived
+        self._offsets[job_id] = offset + len(data)
+        status["data"] = data
+        return status
+
+
+def load_checkpoint(path: str, url: str) -> dict:
+    """Load a crawl checkpoint for `url`, or return a fresh one."""
+    fresh = {"url": url, "job_id": None, "seen": []}
+    if not path or not os.path.isfile(path):
+        return fresh
     try:
-        from firecrawl import FirecrawlApp
-    except ImportError:
-        print("❌ firecrawl-py not installed. Run: pip install firecrawl-py", file=sys.stderr)
-        sys.exit(1)
-
-    api_key = os.environ.get("FIRECRAWL_API_KEY")
-    if not api_key:
-        print("❌ FIRECRAWL_API_KEY environment variable not set", file=sys.stderr)
-        sys.exit(1)
-
-    app = FirecrawlApp(api_key=api_key)
-
-    print(f"🔥 Crawling {url} (max {max_pages} pages)...")
-
-    result = app.crawl_url(
-        url,
-        params={
-            "limit": max_pages,
-            "scrapeOptions": {
-                "formats": ["markdown"],
-            },
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return fresh
+    if data.get("url") != url:
+        return fresh
+    return data
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """Atomically write a crawl checkpoint."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def crawl_with_firecrawl(
+    url: str,
+    max_pages: int = 100,
+    on_batch=None,
+    checkpoint_path: str | None = None,
+    app=None,
+    min_poll: float = 1.0,
+    max_poll: float = 30.0,
+    api_url: str | None = None,
+    max_poll_errors: int = 5,
+    urls: list[str] | None = None,
+    **kwargs,
+) -> list[dict]:
+    """Crawl a URL using Firecrawl, streaming pages as each status poll returns them.
+
+    Starts an async crawl job and polls it with adaptive backoff: the interval
+    resets to `min_poll` whenever new pages arrive and grows 1.5x (up to
+    `max_poll`) while the job is idle. Each batch of new pages is passed to
+    `on_batch` as soon as it arrives.
+
+    With `checkpoint_path`, the job id and every received page URL are saved
+    after each batch. A rerun resumes polling the same job (or starts a new one
+    if it expired) and skips pages that were already delivered.
+
+    With `api_url` (or FIRECRAWL_API_URL), the crawl goes through
+    `FirecrawlRestClient` instead of firecrawl-py. A failed status poll is
+    retried with backoff up to `max_poll_errors` times in a row.
+
+    With `urls`, exactly those pages are fetched with a batch scrape job
+    instead of crawling from `url` (used by ``--sitemap`` to refetch only new
+    and changed pages).
+
+    Returns:
+        list of pages received in this run when `on_batch` is None, otherwise []
+    """
+    api_url = api_url or os.environ.get("FIRECRAWL_API_URL")
+    if app is None and api_url:
+        app = FirecrawlRestClient(api_url, os.environ.get("FIRECRAWL_API_KEY"))
+    elif app is None:
+        try:
+            from firecrawl import FirecrawlApp
+        except ImportError:
+            print("❌ firecrawl-py not installed. Run: pip install firecrawl-py", file=sys.stderr)
+            sys.exit(1)
+
+        api_key = os.environ.get("FIRECRAWL_API_KEY")
+        if not api_key:
+            print("❌ FIRECRAWL_API_KEY environment variable not set", file=sys.stderr)
+            sys.exit(1)
+
+        app = FirecrawlApp(api_key=api_key)
+
+    checkpoint = load_checkpoint(checkpoint_path, url)
+    seen = set(checkpoint["seen"])
+    params = {
+        "limit": max_pages,
+        "scrapeOptions": {
+            "formats": ["markdown"],
         },
-        poll_interval=5,
-    )
-
-    # Handle different result formats
-    if isinstance(result, dict):
-        pages = result.get("data", [])
-    elif isinstance(result, list):
-        pages = result
+    }
+
+    if urls is not None:
+        params = {"formats": ["markdown"]}
+
+    def start_job() -> str:
+        if urls is not None:
+            job = app.async_batch_scrape_urls(urls, params=params)
+        else:
+            job = app.async_crawl_url(url, params=params)
+        job_id = _field(job, "id")
+        if not job_id:
+            print(f"❌ Firecrawl did not return a crawl job id: {job}", file=sys.stderr)
+            sys.exit(1)
+        return job_id
+
+    job_id = checkpoint.get("job_id")
+    resuming = bool(job_id)
+    if resuming:
+        print(f"🔁 Resuming crawl job {job_id} ({len(seen)} pages already received)")
     else:
-        pages = []
+        if urls is not None:
+            print(f"🔥 Fetching {len(urls)} pages from {url}...")
+        else:
+            print(f"🔥 Crawling {url} (max {max_pages} pages)...")
+        job_id = start_job()
+        checkpoint["job_id"] = job_id
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, checkpoint)
+
+    collected: list[dict] = []
+    received = 0
+    interval = min_poll
+    errors = 0
+
+    while True:
+        try:
+            if urls is not None:
+                status = app.check_batch_scrape_status(job_id)
+            else:
+                status = app.check_crawl_status(job_id)
+            errors = 0
+            # The job is alive, so later failures are transient like any other poll's
+            resuming = False
+        except Exception as e:
+            if not resuming:
+                errors += 1
+                if errors > max_poll_errors:
+                    raise
+                print(f"   ⚠ Status poll failed ({e}); retrying", file=sys.stderr)
+                interval = min(interval * 1.5, max_poll)
+                time.sleep(interval)
+                continue
+            # The resumed job has expired; crawl again but skip pages already on disk
+            print(f"   ⚠ Could not resume job {job_id} ({e}); starting a new crawl", file=sys.stderr)
+            resuming = False
+            job_id = start_job()
+            checkpoint["job_id"] = job_id
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, checkpoint)
+            continue
 
-    print(f"   Retrieved {len(pages)} pages")
-    return pages
+        batch = []
+        for page in _field(status, "data", []) or []:
+            page_url = _page_url(page)
+            if page_url and page_url in seen:
+                continue
+            if page_url:
+                seen.add(page_url)
+            batch.append(page)
+
+        if batch:
+            if on_batch is not None:
+                on_batch(batch)
+            else:
+                collected.extend(batch)
+            received += len(batch)
+            checkpoint["seen"] = sorted(seen)
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, checkpoint)
+            total = _field(status, "total", 0) or "?"
+            print(f"   +{len(batch)} pages ({len(seen)}/{total})")
+            interval = min_poll
+
+        state = _field(status, "status", "")
+        if state == "completed":
+            break
+        if state in ("failed", "cancelled"):
+            # A rerun starts a new job, still skipping the pages already received
+            checkpoint["job_id"] = None
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, checkpoint)
+            print(f"❌ Crawl job {job_id} {state}", file=sys.stderr)
+            sys.exit(1)
+
+        if not batch:
+            interval = min(interval * 1.5, max_poll)
+        time.sleep(interval)
+
+    if checkpoint_path and os.path.isfile(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    print(f"   Retrieved {received} pages")
+    return collected
 
 
 def main():
@@ -141,37 +486,196 @@ def main():
         "--from-json", metavar="FILE",
         help="Use existing Firecrawl JSON output instead of crawling"
     )
+    parser.add_argument(
+        "--pack", metavar="FILE",
+        help="Write pages into a single-file docs pack (see docs_pack.py) instead of .md files"
+    )
+    parser.add_argument(
+        "--normalize", nargs="?", const="data-uris,boilerplate,whitespace", metavar="STAGES",
+        help="Clean pages before writing with comma-separated stages "
+             "(default: data-uris,boilerplate,whitespace)"
+    )
+    parser.add_argument(
+        "--max-page-bytes", type=int, metavar="N",
+        help="Truncate pages larger than N bytes at a line boundary"
+    )
+    parser.add_argument(
+        "--api-url", metavar="URL",
+        help="Firecrawl API base URL, e.g. a self-hosted instance or firecrawl_stub.py "
+             "(default: $FIRECRAWL_API_URL, else the hosted API via firecrawl-py)"
+    )
+    parser.add_argument(
+        "--sitemap", nargs="?", const="", metavar="URL",
+        help="Incremental recrawl of an existing --output: fetch only pages the sitemap lists as new "
+             "or changed since they were crawled, and delete pages it no longer lists "
+             "(default sitemap: <site>/sitemap.xml)"
+    )
+    parser.add_argument(
+        "--checkpoint", metavar="FILE",
+        help="Checkpoint file for resuming (default: <output>/.crawl-checkpoint.json)"
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true",
+        help="Ignore any existing checkpoint and start a fresh crawl"
+    )
 
     args = parser.parse_args()
     label = args.label or urlparse(args.url).hostname or "Docs"
+    if args.sitemap is not None and (args.pack or args.from_json):
+        parser.error("--sitemap syncs a directory of .md pages; it cannot be combined with --pack or --from-json")
+
+    stages = []
+    if args.normalize or args.max_page_bytes:
+        from page_stages import build_stages
+        try:
+            stages = build_stages(args.normalize or "", args.max_page_bytes)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.sitemap is not None and any(stage.deferred for stage in stages):
+        # Kept pages were cleaned when first crawled, so the few a sync refetches are too little to learn from
+        skipped = ", ".join(stage.name for stage in stages if stage.deferred)
+        stages = [stage for stage in stages if not stage.deferred]
+        print(f"⚠ --sitemap skips the {skipped} stage; it needs a whole crawl to learn from, so recrawl without --sitemap to rerun it")
+
+    # The index can come straight from the manifest only if this run writes everything in it
+    if args.pack:
+        fresh_output = not os.path.exists(args.pack)
+    else:
+        fresh_output = not os.path.isdir(args.output) or not any(
+            not name.startswith(".") for name in os.listdir(args.output)
+        )
 
-    # Get pages from Firecrawl or JSON
-    if args.from_json:
+    pack = None
+    if args.pack:
+        from docs_pack import PackWriter
+        pack = PackWriter(args.pack)
+
+    # Get pages from Firecrawl or JSON, organizing into a directory structure
+    stats = {"pages": 0, "total_bytes": 0, "errors": 0, "duplicates": 0, "collisions": [], "manifest": []}
+    already_received = 0
+    # Pages an interrupted run of this crawl already wrote; deferred stages cover them too
+    resumed_paths: list[str] = []
+    frontier = UrlFrontier(args.url)
+
+    def write_batch(batch: list[dict]):
+        batch_stats = organize_crawl_results(
+            batch, args.output, args.url, pack=pack, stages=stages, frontier=frontier
+        )
+        if pack is not None:
+            # Keep the pack readable before the checkpoint records this batch
+            pack.flush()
+        for key, value in batch_stats.items():
+            stats[key] += value
+
+    sync = None
+    if args.sitemap is not None:
+        from sitemap_sync import default_sitemap_url, delete_pages, fetch_sitemap, local_pages, plan_sync
+        from xml.etree.ElementTree import ParseError
+
+        sitemap_url = args.sitemap or default_sitemap_url(args.url)
+        print(f"🗺  Reading {sitemap_url}...")
+        try:
+            entries = fetch_sitemap(sitemap_url)
+        except (OSError, ValueError, ParseError) as e:
+            print(f"❌ Could not read sitemap {sitemap_url}: {e}", file=sys.stderr)
+            sys.exit(1)
+        pages_on_disk = local_pages(args.output) if os.path.isdir(args.output) else {}
+        sync = plan_sync(args.url, entries, pages_on_disk)
+        if not sync.in_sitemap:
+            # An empty or wrong sitemap would otherwise delete the whole mirror
+            print(f"❌ {sitemap_url} lists no pages under {args.url}; nothing synced", file=sys.stderr)
+            sys.exit(1)
+        print(f"   {sync.summary()}")
+
+        # Pages that stay hold their paths, so a new URL can't overwrite one; vanished paths are free
+        vanished = set(sync.delete)
+        for canonical, (rel_path, _) in pages_on_disk.items():
+            if rel_path not in vanished:
+                frontier.claims[rel_path] = canonical
+        if sync.fetch:
+            crawl_with_firecrawl(args.url, on_batch=write_batch, api_url=args.api_url, urls=sync.fetch)
+        # Delete only after the fetch, and never a path a new page was just written to
+        written = {path for path, _, _ in stats["manifest"]}
+        stats["deleted"] = delete_pages(args.output, [p for p in sync.delete if p not in written])
+    elif args.from_json:
         print(f"📄 Loading from {args.from_json}...")
         with open(args.from_json, "r") as f:
             data = json.load(f)
         pages = data if isinstance(data, list) else data.get("data", [])
         print(f"   Loaded {len(pages)} pages")
+        if pages:
+            stats = organize_crawl_results(
+                pages, args.output, args.url, pack=pack, stages=stages, frontier=frontier
+            )
     else:
-        pages = crawl_with_firecrawl(args.url, max_pages=args.max_pages)
+        checkpoint = args.checkpoint or os.path.join(args.output, ".crawl-checkpoint.json")
+        if args.no_resume and os.path.isfile(checkpoint):
+            os.remove(checkpoint)
+        received_urls = load_checkpoint(checkpoint, args.url)["seen"]
+        already_received = len(received_urls)
+        # Pages from the interrupted run hold their paths, so a new URL can't overwrite one
+        for url in received_urls:
+            frontier.seen.add(canonicalize_url(url))
+            resumed_paths.append(frontier.claim(url)[0])
+
+        crawl_with_firecrawl(
+            args.url,
+            max_pages=args.max_pages,
+            on_batch=write_batch,
+            checkpoint_path=checkpoint,
+            api_url=args.api_url,
+        )
 
-    if not pages:
+    docs_source = args.output
+    if pack is not None:
+        pack.close()
+        docs_source = args.pack
+
+    if any(stage.deferred for stage in stages):
+        rel_paths = resumed_paths + [path for path, _, _ in stats["manifest"]]
+        changed = finish_deferred_stages(stages, rel_paths, args.output, args.pack)
+        if changed:
+            manifest = []
+            for path, size, title in stats["manifest"]:
+                stats["total_bytes"] += changed.get(path, size) - size
+                manifest.append((path, changed.get(path, size), title))
+            stats["manifest"] = manifest
+
+    if sync is not None and not sync.fetch and not stats["deleted"]:
+        print(f"\n✅ Up to date; {sync.unchanged} pages in {docs_source} match the sitemap")
+        return
+    if not stats["pages"] and not stats["errors"] and not stats["collisions"] and not stats.get("deleted"):
+        if not args.from_json and already_received:
+            print(f"\n✅ No new pages; {already_received} pages from the previous run are already in {docs_source}")
+            return
         print("❌ No pages retrieved", file=sys.stderr)
         sys.exit(1)
 
-    # Organize into directory structure
-    stats = organize_crawl_results(pages, args.output, args.url)
-    print(f"\n📂 Organized {stats['pages']} pages into {args.output}")
+    print(f"\n📂 Organized {stats['pages']} pages into {docs_source}")
     print(f"   Total content: {stats['total_bytes']/1024:.1f}KB")
     if stats["errors"]:
         print(f"   ⚠ {stats['errors']} pages skipped (no content)")
+    if sync is not None:
+        print(f"   Sitemap sync: {sync.unchanged} unchanged, {stats['deleted']} vanished pages deleted")
+    if stats["duplicates"]:
+        print(f"   {stats['duplicates']} duplicate URLs skipped (same page after canonicalization)")
+    if stats["collisions"]:
+        print(f"   ⚠ {len(stats['collisions'])} pages skipped: their URL maps to a file another URL already holds")
+        for path, kept, skipped in stats["collisions"][:5]:
+            print(f"     {path}: kept {kept}, skipped {skipped}")
+    for stage in stages:
+        print(f"   {stage.name + ':':<13} saved {stage.saved/1024:.1f}KB")
 
     # Optionally compress
     if args.compress:
         print(f"\n🗜  Compressing...")
-        from compress_docs import compress_directory
+        from compress_docs import compress_directory, tree_from_manifest
+        tree = None
+        if fresh_output and not already_received:
+            # Every page is in the manifest, so nothing just written is read back
+            tree = tree_from_manifest(stats["manifest"])
         compressed, comp_stats = compress_directory(
-            args.output, label, extract_titles=True
+            docs_source, label, extract_titles=True, tree=tree
         )
         index_file = args.output.rstrip("/") + "-index.md"
         with open(index_file, "w") as f:
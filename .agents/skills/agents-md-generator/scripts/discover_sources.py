@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Find skills and crawled docs mirrors anywhere in a monorepo.
+
+A skill is any directory holding a SKILL.md; its parent becomes a skills
+directory for `scan_skills`. A crawled docs mirror is recognised by the
+``source:`` frontmatter that crawl_docs.py writes into every page; its root is
+found by matching the page's directories against the tail of its source URL,
+the same mapping `organize_crawl_results` used to lay it out. Each source is
+attributed to the nearest package.json above it for a per-package breakdown.
+
+The scan lists directories in parallel and never descends into dependency,
+VCS or build output directories, nor into a skill or docs mirror once found.
+
+Usage:
+    python discover_sources.py .
+    python discover_sources.py . --json
+"""
+
+import json
+import os
+import sys
+from urllib.parse import urlparse
+
+PRUNE_DIRS = frozenset({
+    "node_modules", ".git", ".hg", ".svn", ".next", ".turbo", ".vercel", ".cache",
+    ".pnpm-store", ".yarn", ".venv", "venv", "__pycache__", "dist", "build", "out",
+    "coverage", "target", "storybook-static",
+})
+SOURCE_HEAD_BYTES = 512
+
+
+def _list_dir(path: str) -> tuple[list[str], bool, bool, str | None]:
+    """(subdirectories, has SKILL.md, has package.json, first markdown file) for one directory."""
+    subdirs = []
+    has_skill = has_package = False
+    first_md = None
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in PRUNE_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name == "SKILL.md":
+                    has_skill = True
+                elif entry.name == "package.json":
+                    has_package = True
+                elif entry.name.endswith(".md") and (first_md is None or entry.name < os.path.basename(first_md)):
+                    first_md = entry.path
+    except OSError:
+        pass
+    return subdirs, has_skill, has_package, first_md
+
+
+def read_source_url(md_path: str) -> str | None:
+    """The ``source:`` URL from a crawled page's frontmatter, if any."""
+    try:
+        with open(md_path, "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(SOURCE_HEAD_BYTES)
+    except OSError:
+        return None
+    if not head.startswith("---"):
+        return None
+    for line in head.split("\n")[1:]:
+        if line.strip() == "---":
+            break
+        if line.startswith("source:"):
+            url = line[len("source:"):].strip()
+            return url if url.startswith(("http://", "https://")) else None
+    return None
+
+
+def docs_root_for(md_path: str, url: str) -> tuple[str, str]:
+    """Walk up from a crawled page while its directories match its URL path; returns (root, label).
+
+    The walk stops at the first directory whose index.md is the page for the
+    URL path walked so far: only the base URL is written to index.md, so that
+    directory is the root even if its own name matches the next URL segment
+    (e.g. ``https://example.com/docs`` crawled into ``./docs``).
+    """
+    from crawl_docs import sanitize_filename
+
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split("/") if s]
+    directory = os.path.dirname(md_path)
+    name = os.path.basename(md_path)
+
+    def holds_base_page(directory: str) -> bool:
+        index_url = read_source_url(os.path.join(directory, "index.md"))
+        if not index_url:
+            return False
+        index = urlparse(index_url)
+        return index.hostname == parsed.hostname and [s for s in index.path.split("/") if s] == segments
+
+    # The page itself maps to the last URL segment (or index.md for the base URL)
+    if segments and sanitize_filename(segments[-1]) == name:
+        segments.pop()
+    while (
+        segments
+        and not holds_base_page(directory)
+        and os.path.basename(directory) == sanitize_filename(segments[-1])[:-len(".md")]
+    ):
+        segments.pop()
+        directory = os.path.dirname(directory)
+
+    label = (parsed.hostname or "docs") + ("/" + "/".join(segments) if segments else "")
+    return directory, label
+
+
+def _package_name(package_dir: str) -> str:
+    try:
+        with open(os.path.join(package_dir, "package.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("name") or os.path.basename(package_dir)
+    except (OSError, ValueError, AttributeError):
+        return os.path.basename(package_dir)
+
+
+def discover_sources(root: str, workers: int | None = None) -> dict:
+    """Scan `root` in parallel for skills and crawled docs mirrors.
+
+    Paths are returned as `root` joined with the path below it, so a relative
+    `root` gives relative paths.
+
+    Returns:
+        dict with ``skills_dirs`` (parents of skill directories), ``skills``
+        (skill directories), ``docs`` ([(root, label)]), ``packages``
+        ({package dir: {"name", "skills", "docs"}}) and ``dirs_scanned``
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    root = os.path.normpath(root)
+    skills: list[str] = []
+    docs: dict[str, str] = {}
+    package_dirs: set[str] = set()
+    scanned = 0
+
+    def inside_docs(path: str) -> bool:
+        return any(path == d or path.startswith(d + os.sep) for d in docs)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_list_dir, root): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                subdirs, has_skill, has_package, first_md = future.result()
+                scanned += 1
+                if has_package:
+                    package_dirs.add(path)
+                if has_skill:
+                    # A skill's own references are not separate sources
+                    skills.append(path)
+                    continue
+                if first_md and not inside_docs(path):
+                    url = read_source_url(first_md)
+                    if url:
+                        docs_root, label = docs_root_for(first_md, url)
+                        if not inside_docs(docs_root):
+                            docs[docs_root] = label
+                        continue
+                for sub in subdirs:
+                    if not inside_docs(sub):
+                        pending[pool.submit(_list_dir, sub)] = sub
+
+    # A mirror found from a deep page can swallow roots registered from its subdirectories
+    for d in list(docs):
+        if any(d != other and d.startswith(other + os.sep) for other in docs):
+            del docs[d]
+
+    packages: dict[str, dict] = {}
+
+    def package_for(path: str) -> dict:
+        current = path
+        while current.startswith(root) and current not in package_dirs:
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        key = current if current in package_dirs else root
+        if key not in packages:
+            packages[key] = {"name": _package_name(key) if key in package_dirs else "(root)", "skills": [], "docs": []}
+        return packages[key]
+
+    for skill in sorted(skills):
+        package_for(skill)["skills"].append(skill)
+    for docs_root in sorted(docs):
+        package_for(docs_root)["docs"].append(docs_root)
+
+    return {
+        "skills_dirs": sorted({os.path.dirname(s) for s in skills}),
+        "skills": sorted(skills),
+        "docs": sorted(docs.items()),
+        "packages": dict(sorted(packages.items())),
+        "dirs_scanned": scanned,
+    }
+
+
+def format_breakdown(found: dict, root: str) -> list[str]:
+    """One line per package: name, path, skill count and docs mirrors."""
+    lines = []
+    for package_dir, package in found["packages"].items():
+        rel = os.path.relpath(package_dir, os.path.abspath(root))
+        docs = ", ".join(os.path.relpath(d, package_dir) for d in package["docs"])
+        lines.append(
+            f"{package['name']} ({rel}): {len(package['skills'])} skills"
+            + (f", docs: {docs}" if docs else "")
+        )
+    return lines
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find skills and crawled docs mirrors in a monorepo")
+    parser.add_argument("root", nargs="?", default=".", help="Repository root to scan (default: .)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel directory listers")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    found = discover_sources(args.root, args.workers)
+    if args.json:
+        print(json.dumps(found, indent=2))
+        return
+
+    print(f"🔎 Scanned {found['dirs_scanned']} dirs: {len(found['skills'])} skills, {len(found['docs'])} docs mirrors")
+    for line in format_breakdown(found, args.root):
+        print(f"   {line}")
+    if not found["skills"] and not found["docs"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Shared on-disk cache for parsed frontmatter, titles, validation results and
+package manifests.
+
+Entries are small JSON files under ``<cache dir>/<namespace>/``, so several CI
+jobs or developers on one machine can share a cache safely:
+
+- writes go to a temporary file that is renamed into place, so readers never
+  see a partial entry;
+- eviction holds an exclusive lock on ``<cache dir>/.lock`` and writers a
+  shared one, so concurrent processes never evict an entry mid-write;
+- every hit refreshes the entry's mtime, and eviction removes the least
+  recently used entries until the cache fits its size cap.
+
+Entries for a file carry a stamp (size and mtime in ns) and a lookup with a
+different stamp is a miss, so edits are picked up without any invalidation.
+
+Environment:
+    AGENTS_MD_CACHE_DIR      cache location (default: $XDG_CACHE_HOME/agents-md or ~/.cache/agents-md)
+    AGENTS_MD_CACHE_MAX_MB   size cap in MB (default: 100)
+    AGENTS_MD_NO_CACHE=1     disable the cache
+
+Usage:
+    python disk_cache.py stats
+    python disk_cache.py prune --max-mb 20
+    python disk_cache.py prune --namespace titles --all
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_MAX_MB = 100
+# Check the size cap at least this often, even when each process writes little
+EVICT_INTERVAL_S = 3600
+TMP_MAX_AGE_S = 600
+
+
+def default_cache_dir() -> str:
+    if os.environ.get("AGENTS_MD_CACHE_DIR"):
+        return os.environ["AGENTS_MD_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "agents-md")
+
+
+def file_stamp(path) -> list[int] | None:
+    """[size, mtime_ns] of a file, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+@contextmanager
+def _locked(path: str, exclusive: bool):
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (Windows): atomic renames still keep entries whole
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class DiskCache:
+    """JSON values addressed by (namespace, key), stored one file per entry."""
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.root = root or default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("AGENTS_MD_CACHE_MAX_MB") or DEFAULT_MAX_MB) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._written = 0
+        self._checked = False
+
+    def _path(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, namespace, digest[:2], digest[2:] + ".json")
+
+    def get(self, namespace: str, key: str, stamp=None):
+        """Cached value for `key`, or None if missing or stored with a different `stamp`."""
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # The key is stored too, so a hash collision is a miss rather than a wrong value
+        if entry.get("key") != key or entry.get("stamp") != stamp:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, namespace: str, key: str, value, stamp=None) -> bool:
+        """Store a JSON-serializable `value`; returns False if it could not be stored."""
+        try:
+            data = json.dumps({"key": key, "stamp": stamp, "value": value}, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return False
+
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with _locked(os.path.join(self.root, ".lock"), exclusive=False):
+                tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+        except OSError:
+            return False
+
+        self._written += len(data)
+        if self._written > self.max_bytes // 16 or not self._checked:
+            self._maybe_evict()
+        return True
+
+    def _maybe_evict(self):
+        marker = os.path.join(self.root, ".last-evict")
+        due = self._written > self.max_bytes // 16
+        if not due:
+            try:
+                due = time.time() - os.path.getmtime(marker) > EVICT_INTERVAL_S
+            except OSError:
+                due = True
+        self._checked = True
+        if due:
+            self.prune()
+            self._written = 0
+
+    def _entries(self, namespace: str | None = None):
+        """Yield (namespace, path, size, mtime) for every entry, removing stale temp files."""
+        try:
+            namespaces = [namespace] if namespace else sorted(
+                n for n in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, n))
+            )
+        except OSError:
+            return
+        now = time.time()
+        for ns in namespaces:
+            for root, _, files in os.walk(os.path.join(self.root, ns)):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if name.endswith(".tmp"):
+                        # Left behind by a killed writer
+                        if now - st.st_mtime > TMP_MAX_AGE_S:
+                            try:
+                                os.remove(path)
+                            except OSError:
+                                pass
+                        continue
+                    yield ns, path, st.st_size, st.st_mtime
+
+    def stats(self) -> dict:
+        """Entry counts and bytes per namespace."""
+        namespaces: dict[str, dict] = {}
+        for ns, _, size, mtime in self._entries():
+            info = namespaces.setdefault(ns, {"entries": 0, "bytes": 0, "oldest": mtime})
+            info["entries"] += 1
+            info["bytes"] += size
+            info["oldest"] = min(info["oldest"], mtime)
+        return {
+            "root": self.root,
+            "max_bytes": self.max_bytes,
+            "total_bytes": sum(n["bytes"] for n in namespaces.values()),
+            "namespaces": namespaces,
+        }
+
+    def prune(self, max_bytes: int | None = None, namespace: str | None = None) -> tuple[int, int]:
+        """Remove least recently used entries until the cache (or `namespace`) fits `max_bytes`.
+
+        Returns:
+            tuple: (entries removed, bytes freed)
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if not os.path.isdir(self.root):
+            return 0, 0
+        removed = freed = 0
+        with _locked(os.path.join(self.root, ".lock"), exclusive=True):
+            entries = sorted(self._entries(namespace), key=lambda e: e[3])
+            total = sum(e[2] for e in entries)
+            for _, path, size, _ in entries:
+                if total <= limit:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                freed += size
+            with open(os.path.join(self.root, ".last-evict"), "w"):
+                pass
+        return removed, freed
+
+
+_shared: DiskCache | None = None
+
+
+def get_cache() -> DiskCache | None:
+    """The process-wide cache, or None when disabled with AGENTS_MD_NO_CACHE."""
+    global _shared
+    if os.environ.get("AGENTS_MD_NO_CACHE", "").lower() in ("1", "true", "yes"):
+        return None
+    if _shared is None:
+        _shared = DiskCache()
+    return _shared
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and prune the shared agents-md cache")
+    parser.add_argument("--dir", default=None, help="Cache directory (default: $AGENTS_MD_CACHE_DIR or ~/.cache/agents-md)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats_parser = sub.add_parser("stats", help="Show entries and bytes per namespace")
+    stats_parser.add_argument("--json", action="store_true", help="Print stats as JSON")
+    prune_parser = sub.add_parser("prune", help="Evict least recently used entries")
+    prune_parser.add_argument("--max-mb", type=float, default=None, help="Target size in MB (default: the size cap)")
+    prune_parser.add_argument("--namespace", default=None, help="Only prune this namespace")
+    prune_parser.add_argument("--all", action="store_true", help="Remove every entry")
+    args = parser.parse_args()
+
+    cache = DiskCache(args.dir)
+    if args.command == "stats":
+        stats = cache.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+            return
+        print(f"🗄  {stats['root']}: {stats['total_bytes']/1024:.1f}KB of {stats['max_bytes']/1024/1024:g}MB")
+        for ns, info in stats["namespaces"].items():
+            age = (time.time() - info["oldest"]) / 3600
+            print(f"   {ns:<12} {info['entries']:>6} entries  {info['bytes']/1024:>9.1f}KB  oldest {age:.1f}h")
+        return
+
+    if args.all:
+        max_bytes = 0
+    elif args.max_mb is not None:
+        max_bytes = int(args.max_mb * 1024 * 1024)
+    else:
+        max_bytes = None
+    removed, freed = cache.prune(max_bytes, args.namespace)
+    print(f"🧹 Removed {removed} entries ({freed/1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory representation of a docs directory listing.
+
+A plain `dict[str, list[str]]` of relative directory paths plus a title map keyed
+by full relative paths repeats every directory prefix and allocates a str per
+path, which runs to gigabytes on million-file trees. `DocTree` instead keeps:
+
+- every distinct name (file name, directory component, title) once, as UTF-8 in
+  a single `bytearray`, addressed by `array` offsets (interned string ids)
+- directories as (parent id, name id) pairs, so prefixes are never repeated
+- files as parallel arrays of name id, size, mtime and title id, contiguous per directory
+
+Memory is proportional to the number of entries plus the bytes of unique names.
+Paths are rebuilt on demand from parent links.
+
+Used by compress_docs.py; not intended to be run directly.
+"""
+
+from array import array
+
+
+class DocTree:
+    """Interned, array-backed listing of a docs tree (directories, files, sizes, titles)."""
+
+    __slots__ = (
+        "_buf",
+        "_offsets",
+        "_by_hash",
+        "_collisions",
+        "_dir_parent",
+        "_dir_name",
+        "_dir_first",
+        "_dir_nfiles",
+        "_dir_by_key",
+        "_file_name",
+        "_file_size",
+        "_file_mtime",
+        "_file_title",
+    )
+
+    ROOT = 0
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._offsets = array("Q", [0])
+        self._by_hash: dict[int, int] = {}
+        self._collisions: dict[str, int] = {}
+
+        # Directory 0 is the root ("")
+        self._dir_parent = array("i", [-1])
+        self._dir_name = array("I", [self.intern("")])
+        self._dir_first = array("I", [0])
+        self._dir_nfiles = array("I", [0])
+        self._dir_by_key: dict[int, int] = {}
+
+        self._file_name = array("I")
+        self._file_size = array("Q")
+        self._file_mtime = array("Q")
+        self._file_title = array("i")
+
+    # -- string interning -------------------------------------------------
+
+    def intern(self, s: str) -> int:
+        """Return the id of `s` in the string buffer, appending it if new."""
+        h = hash(s)
+        sid = self._by_hash.get(h)
+        if sid is not None:
+            if self.string(sid) == s:
+                return sid
+            sid = self._collisions.get(s)
+            if sid is not None:
+                return sid
+            sid = self._append(s)
+            self._collisions[s] = sid
+            return sid
+        sid = self._append(s)
+        self._by_hash[h] = sid
+        return sid
+
+    def _append(self, s: str) -> int:
+        self._buf += s.encode("utf-8")
+        self._offsets.append(len(self._buf))
+        return len(self._offsets) - 2
+
+    def string(self, sid: int) -> str:
+        """Decode interned string `sid`."""
+        return self._buf[self._offsets[sid]:self._offsets[sid + 1]].decode("utf-8")
+
+    # -- building ---------------------------------------------------------
+
+    def add_dir(self, rel_path: str) -> int:
+        """Return the id of directory `rel_path` ("" for root), creating ancestors as needed."""
+        dir_id = self.ROOT
+        if not rel_path:
+            return dir_id
+        for part in rel_path.replace("\\", "/").split("/"):
+            key = (dir_id << 32) | self.intern(part)
+            child = self._dir_by_key.get(key)
+            if child is None:
+                child = len(self._dir_parent)
+                self._dir_parent.append(dir_id)
+                self._dir_name.append(key & 0xFFFFFFFF)
+                self._dir_first.append(0)
+                self._dir_nfiles.append(0)
+                self._dir_by_key[key] = child
+            dir_id = child
+        return dir_id
+
+    def add_files(self, dir_id: int, names: list[str], sizes: list[int], mtimes: list[int] | None = None) -> range:
+        """Add a directory's files in one batch so they stay contiguous; returns their ids.
+
+        ``mtimes`` (in ns) are only known for trees listed from disk; others record 0.
+        """
+        first = len(self._file_name)
+        for name, size in zip(names, sizes):
+            self._file_name.append(self.intern(name))
+            self._file_size.append(size)
+            self._file_title.append(-1)
+        self._file_mtime.extend(mtimes if mtimes is not None else [0] * len(names))
+        self._dir_first[dir_id] = first
+        self._dir_nfiles[dir_id] = len(names)
+        return range(first, first + len(names))
+
+    def set_title(self, file_id: int, title: str):
+        self._file_title[file_id] = self.intern(title)
+
+    # -- queries ----------------------------------------------------------
+
+    def dir_path(self, dir_id: int) -> str:
+        parts = []
+        while dir_id > self.ROOT:
+            parts.append(self.string(self._dir_name[dir_id]))
+            dir_id = self._dir_parent[dir_id]
+        return "/".join(reversed(parts))
+
+    def find_dir(self, rel_path: str) -> int | None:
+        """Return the id of an existing directory, or None."""
+        dir_id = self.ROOT
+        for part in rel_path.split("/") if rel_path else []:
+            sid = self._by_hash.get(hash(part))
+            if sid is None or self.string(sid) != part:
+                sid = self._collisions.get(part)
+            if sid is None:
+                return None
+            dir_id = self._dir_by_key.get((dir_id << 32) | sid)
+            if dir_id is None:
+                return None
+        return dir_id
+
+    def find_file(self, rel_path: str) -> int | None:
+        """Return the id of the file at `rel_path`, or None (binary search within its directory)."""
+        rel_root, _, name = rel_path.rpartition("/")
+        dir_id = self.find_dir(rel_root)
+        if dir_id is None:
+            return None
+        files = self.files(dir_id)
+        lo, hi = 0, len(files)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.file_name(files[mid]) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(files) and self.file_name(files[lo]) == name:
+            return files[lo]
+        return None
+
+    def parent(self, dir_id: int) -> int:
+        """Id of the parent directory (-1 for the root)."""
+        return self._dir_parent[dir_id]
+
+    def all_dirs(self) -> list[int]:
+        """Ids of every directory, including ones that only hold subdirectories, sorted by path."""
+        return sorted(range(len(self._dir_parent)), key=self.dir_path)
+
+    def subtree_classes(self, with_titles: bool = False) -> tuple[array, array]:
+        """Hash-cons every directory's subtree into a structural class id.
+
+        Two directories get the same class id exactly when their subtrees list
+        the same file names (and titles, if ``with_titles``) under the same
+        relative paths. Also returns the number of files under each directory.
+
+        Returns:
+            tuple: (class id per directory id, file count per directory id)
+        """
+        count = len(self._dir_parent)
+        children: list[list[int]] = [[] for _ in range(count)]
+        for dir_id in range(1, count):
+            children[self._dir_parent[dir_id]].append(dir_id)
+
+        classes = array("I", [0]) * count
+        file_counts = array("Q", [0]) * count
+        table: dict[tuple, int] = {}
+        # Children are always created after their parent, so descending ids visit them first
+        for dir_id in range(count - 1, -1, -1):
+            files = self.files(dir_id)
+            own = tuple(self._file_name[f] for f in files)
+            if with_titles:
+                own += tuple(self._file_title[f] for f in files)
+            subdirs = tuple(sorted((self._dir_name[c], classes[c]) for c in children[dir_id]))
+            classes[dir_id] = table.setdefault((own, subdirs), len(table))
+            file_counts[dir_id] = len(files) + sum(file_counts[c] for c in children[dir_id])
+        return classes, file_counts
+
+    def dirs(self) -> list[int]:
+        """Ids of directories that hold files, sorted by relative path."""
+        with_files = [d for d in range(len(self._dir_parent)) if self._dir_nfiles[d]]
+        return sorted(with_files, key=self.dir_path)
+
+    def files(self, dir_id: int) -> range:
+        first = self._dir_first[dir_id]
+        return range(first, first + self._dir_nfiles[dir_id])
+
+    def file_name(self, file_id: int) -> str:
+        return self.string(self._file_name[file_id])
+
+    def file_size(self, file_id: int) -> int:
+        return self._file_size[file_id]
+
+    def file_mtime(self, file_id: int) -> int:
+        """Modification time in ns, or 0 if the listing did not come from disk."""
+        return self._file_mtime[file_id]
+
+    def file_title(self, file_id: int) -> str:
+        sid = self._file_title[file_id]
+        return self.string(sid) if sid >= 0 else ""
+
+    @property
+    def file_count(self) -> int:
+        return len(self._file_name)
+
+    @property
+    def dir_count(self) -> int:
+        """Number of directories that hold files."""
+        return sum(1 for n in self._dir_nfiles if n)
+
+    @property
+    def total_size(self) -> int:
+        return sum(self._file_size)
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the buffers and arrays (excluding the hash indexes)."""
+        arrays = (
+            self._offsets, self._dir_parent, self._dir_name, self._dir_first,
+            self._dir_nfiles, self._file_name, self._file_size, self._file_mtime, self._file_title,
+        )
+        return len(self._buf) + sum(a.itemsize * len(a) for a in arrays)
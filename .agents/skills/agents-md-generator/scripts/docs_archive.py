@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Read-only view of a docs archive (.zip, .tar, .tar.gz/.tgz, .tar.bz2, .tar.xz).
+
+Framework docs often ship as a repo tarball or zip. Listing and sizes come from
+the member headers, and titles from the first bytes of each markdown member,
+so the archive never has to be extracted to disk before indexing. For tar
+archives the headers and the title reads happen in one sequential pass, which
+also works for compressed tarballs that cannot be read out of order cheaply.
+
+Used by compress_docs.py; not intended to be run directly.
+"""
+
+import io
+import os
+import threading
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path: str) -> bool:
+    """True if `path` is a file with a supported archive extension."""
+    return path.lower().endswith(ARCHIVE_SUFFIXES) and os.path.isfile(path)
+
+
+def _skip(rel_path: str) -> bool:
+    # Mirror the directory walk: hidden files and directories are not docs
+    return any(part.startswith(".") for part in rel_path.split("/"))
+
+
+def _tar_path(name: str) -> str:
+    # `tar czf x.tgz .` stores "./docs/a.md"; index it as "docs/a.md"
+    if name.startswith("./"):
+        name = name[2:]
+    return name.strip("/")
+
+
+class DocsArchive:
+    """Archive members as docs pages, addressed by their relative path."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._members: dict[str, object] = {}
+        self._lock = threading.Lock()
+        if path.lower().endswith(".zip"):
+            import zipfile
+
+            self._zip = zipfile.ZipFile(path)
+            self._tar = None
+        else:
+            import tarfile
+
+            self._tar = tarfile.open(path, "r:*")
+            self._zip = None
+            # Iterating the tar consumes `firstmember`, so note the naming style now
+            first = self._tar.firstmember
+            self._dot_prefix = first is not None and (first.name == "." or first.name.startswith("./"))
+
+    def entries(self, head_bytes: int = 0, head_suffixes: tuple[str, ...] = (".md", ".mdx")):
+        """Yield (path, size, head) for every regular, non-hidden member.
+
+        ``head`` is the first ``head_bytes`` bytes of members ending in one of
+        ``head_suffixes`` (empty otherwise), read without decompressing the rest.
+        """
+        if self._zip is not None:
+            for info in self._zip.infolist():
+                rel_path = info.filename.strip("/")
+                if info.is_dir() or not rel_path or _skip(rel_path):
+                    continue
+                self._members[rel_path] = info
+                head = b""
+                if head_bytes and rel_path.endswith(head_suffixes):
+                    with self._zip.open(info) as f:
+                        head = f.read(head_bytes)
+                yield rel_path, info.file_size, head
+            return
+
+        for member in self._tar:
+            rel_path = _tar_path(member.name)
+            if not member.isfile() or not rel_path or _skip(rel_path):
+                continue
+            self._members[rel_path] = member
+            head = b""
+            if head_bytes and rel_path.endswith(head_suffixes):
+                f = self._tar.extractfile(member)
+                head = f.read(head_bytes) if f is not None else b""
+            yield rel_path, member.size, head
+
+    def open(self, rel_path: str):
+        """Return a binary file object over one member.
+
+        Zip members stream straight from the archive. Tar members share one
+        underlying stream, so they are read whole under a lock (safe across threads).
+        """
+        if not self._members:
+            for _ in self.entries():
+                pass
+        try:
+            member = self._members[rel_path.replace(os.sep, "/")]
+        except KeyError:
+            raise KeyError(f"Page not in archive: {rel_path}") from None
+        if self._zip is not None:
+            return self._zip.open(member)
+        with self._lock:
+            return io.BytesIO(self._tar.extractfile(member).read())
+
+    def pages(self, suffixes: tuple[str, ...] = (".md", ".mdx")):
+        """Yield (path, binary file object) for every non-hidden member ending in `suffixes`, in archive order.
+
+        Each file object must be read before the next one is requested. A tar
+        archive is reopened as a stream (``r|*``) and read front to back once;
+        `open` on each member of a compressed tarball would instead restart
+        decompression from the beginning every time it seeks backwards.
+        """
+        if self._zip is not None:
+            for info in self._zip.infolist():
+                rel_path = info.filename.strip("/")
+                if not info.is_dir() and rel_path.endswith(suffixes) and not _skip(rel_path):
+                    yield rel_path, self._zip.open(info)
+            return
+
+        import tarfile
+
+        with tarfile.open(self.path, "r|*") as tar:
+            for member in tar:
+                rel_path = _tar_path(member.name)
+                if not member.isfile() or not rel_path.endswith(suffixes) or _skip(rel_path):
+                    continue
+                f = tar.extractfile(member)
+                if f is not None:
+                    yield rel_path, f
+
+    def read_hint(self) -> str:
+        """Shell command agents can use to print one member."""
+        if self._zip is not None:
+            return f"unzip -p {self.path} PATH"
+        return f"tar -xOf {self.path} {'./' if self._dot_prefix else ''}PATH"
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+        else:
+            self._tar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
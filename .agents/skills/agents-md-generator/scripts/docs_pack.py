@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Single-file docs pack: per-page compressed blobs with a trailing offset table.
+
+Crawled mirrors are often tens of thousands of tiny .md files. A pack stores them
+in one file that is cheap to copy and rsync, can be indexed by memory-mapping only
+its table, and lets one page be extracted without decompressing the rest.
+
+Layout:
+    header   b"DPAK" + version (1 byte) + 3 reserved bytes
+    blobs    zlib-compressed page contents, back to back
+    table    per page: <QIIHH offset, compressed length, raw length, path length,
+             title length> followed by the UTF-8 path and title
+    footer   <QI4s table offset, page count, b"DPAK"
+
+Usage:
+    # Pack an existing docs directory
+    python docs_pack.py pack ./.ai-sdk-docs ai-sdk-docs.dpk
+
+    # List pages (path, size, title) from the table only
+    python docs_pack.py list ai-sdk-docs.dpk
+
+    # Extract one page to stdout (or a file with -o)
+    python docs_pack.py extract ai-sdk-docs.dpk core/generate-text.md
+
+    # Unpack everything back into a directory
+    python docs_pack.py unpack ai-sdk-docs.dpk ./.ai-sdk-docs
+"""
+
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+MAGIC = b"DPAK"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+ENTRY = struct.Struct("<QIIHH")
+FOOTER = struct.Struct("<QI4s")
+
+
+def is_pack(path: str) -> bool:
+    """True if `path` is a file starting with the pack header."""
+    if not os.path.isfile(path):
+        return False
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class PackWriter:
+    """Append pages to a pack, keeping the file valid after every `flush()`.
+
+    Pages are appended as compressed blobs; the table and footer are rewritten
+    at the end of the file on `flush()`/`close()` and overwritten by the next
+    `add()`. Before that first `add()` the current table and footer are copied
+    to ``<pack>.table``, which `flush()` removes again. Reopening a pack that
+    still has that copy (the writer was killed between `add()` and `flush()`)
+    puts it back, so the pack is as it was at its last flush.
+
+    An existing pack is reopened and extended rather than replaced, so a
+    resumed crawl can keep writing to the same file. Adding a path that is
+    already present replaces it in the table.
+    """
+
+    def __init__(self, path: str, level: int = 6):
+        self.path = path
+        self.level = level
+        self._entries: dict[str, tuple[int, int, int, str]] = {}
+        self._journal = path + ".table"
+        self._journaled = False
+
+        if os.path.isfile(self._journal) and is_pack(path):
+            self._restore_journal()
+        if is_pack(path):
+            reader = DocsPack(path)
+            for rel_path, offset, comp_len, raw_len, title in reader.entries():
+                self._entries[rel_path] = (offset, comp_len, raw_len, title)
+            self._data_end = reader.table_offset
+            reader.close()
+            self._file = open(path, "r+b")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "w+b")
+            self._file.write(HEADER)
+            self._data_end = len(HEADER)
+        self._dirty = True
+        # Make sure there is a table on disk for the first add() to save
+        self.flush()
+
+    def _restore_journal(self):
+        """Put back the table and footer saved before an interrupted write."""
+        with open(self._journal, "rb") as f:
+            tail = f.read()
+        if len(tail) < FOOTER.size:
+            raise ValueError(f"Docs pack table copy is damaged: {self._journal}")
+        table_offset, _, magic = FOOTER.unpack_from(tail, len(tail) - FOOTER.size)
+        if magic != MAGIC or table_offset < len(HEADER) or table_offset > os.path.getsize(self.path):
+            raise ValueError(f"Docs pack table copy is damaged: {self._journal}")
+        with open(self.path, "r+b") as f:
+            f.seek(table_offset)
+            f.write(tail)
+            f.truncate()
+        os.remove(self._journal)
+
+    def _save_journal(self):
+        """Copy the table and footer at the end of the file before `add()` overwrites them."""
+        self._file.seek(self._data_end)
+        tail = self._file.read()
+        tmp = self._journal + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(tail)
+        os.replace(tmp, self._journal)
+        self._journaled = True
+
+    def add(self, rel_path: str, content: str, title: str = "") -> int:
+        """Compress and append one page; returns its raw size in bytes."""
+        raw = content.encode("utf-8")
+        blob = zlib.compress(raw, self.level)
+        if not self._journaled:
+            self._save_journal()
+        self._file.seek(self._data_end)
+        self._file.write(blob)
+        self._entries[rel_path.replace(os.sep, "/")] = (self._data_end, len(blob), len(raw), title)
+        self._data_end += len(blob)
+        self._dirty = True
+        return len(raw)
+
+    def flush(self):
+        """Write the table and footer so the pack is readable as-is."""
+        if not self._dirty:
+            return
+        table = bytearray()
+        for rel_path, (offset, comp_len, raw_len, title) in sorted(self._entries.items()):
+            path_b = rel_path.encode("utf-8")
+            title_b = title.encode("utf-8")[:0xFFFF]
+            table += ENTRY.pack(offset, comp_len, raw_len, len(path_b), len(title_b))
+            table += path_b + title_b
+        self._file.seek(self._data_end)
+        self._file.write(table)
+        self._file.write(FOOTER.pack(self._data_end, len(self._entries), MAGIC))
+        self._file.truncate()
+        self._file.flush()
+        if self._journaled:
+            os.remove(self._journal)
+            self._journaled = False
+        self._dirty = False
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DocsPack:
+    """Read-only view of a pack; only the table is touched until a page is read."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC or len(self._mm) < len(HEADER) + FOOTER.size:
+            raise ValueError(f"Not a docs pack: {path}")
+        self.table_offset, self.count, magic = FOOTER.unpack_from(self._mm, len(self._mm) - FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError(f"Docs pack has no table (incomplete write?): {path}")
+        self._index: dict[str, tuple[int, int]] | None = None
+
+    def entries(self):
+        """Yield (path, offset, compressed_length, raw_length, title) from the table."""
+        mm = self._mm
+        pos = self.table_offset
+        for _ in range(self.count):
+            offset, comp_len, raw_len, path_len, title_len = ENTRY.unpack_from(mm, pos)
+            pos += ENTRY.size
+            rel_path = mm[pos:pos + path_len].decode("utf-8")
+            pos += path_len
+            title = mm[pos:pos + title_len].decode("utf-8", "replace")
+            pos += title_len
+            yield rel_path, offset, comp_len, raw_len, title
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        """Decompress a single page by its relative path."""
+        if self._index is None:
+            self._index = {p: (o, c) for p, o, c, _, _ in self.entries()}
+        try:
+            offset, comp_len = self._index[rel_path.replace(os.sep, "/")]
+        except KeyError:
+            raise KeyError(f"Page not in pack: {rel_path}") from None
+        return zlib.decompress(self._mm[offset:offset + comp_len])
+
+    def read(self, rel_path: str) -> str:
+        return self.read_bytes(rel_path).decode("utf-8", "replace")
+
+    def open(self, rel_path: str) -> io.BytesIO:
+        """Return a binary file object over one decompressed page."""
+        return io.BytesIO(self.read_bytes(rel_path))
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pack_directory(docs_dir: str, pack_path: str) -> int:
+    """Pack every non-hidden file under `docs_dir`; returns the page count."""
+    from compress_docs import extract_title
+
+    count = 0
+    with PackWriter(pack_path) as pack:
+        for root, dirs, files in os.walk(docs_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for f in sorted(files):
+                if f.startswith("."):
+                    continue
+                fp = os.path.join(root, f)
+                with open(fp, "r", encoding="utf-8", errors="replace") as fh:
+                    content = fh.read()
+                title = extract_title(fp) if f.endswith((".md", ".mdx")) else ""
+                pack.add(os.path.relpath(fp, docs_dir), content, title)
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create, list and read single-file docs packs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pack", help="Pack a docs directory into one file")
+    p.add_argument("docs_dir")
+    p.add_argument("pack")
+
+    p = sub.add_parser("list", help="List pages in a pack")
+    p.add_argument("pack")
+
+    p = sub.add_parser("extract", help="Extract one page")
+    p.add_argument("pack")
+    p.add_argument("path", help="Page path inside the pack")
+    p.add_argument("--output", "-o", help="Output file (default: stdout)")
+
+    p = sub.add_parser("unpack", help="Extract every page into a directory")
+    p.add_argument("pack")
+    p.add_argument("output_dir")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = pack_directory(args.docs_dir, args.pack)
+        size = os.path.getsize(args.pack)
+        print(f"✅ Packed {count} pages into {args.pack} ({size/1024:.1f}KB)")
+        return
+
+    try:
+        pack = DocsPack(args.pack)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with pack:
+        if args.command == "list":
+            for rel_path, _, comp_len, raw_len, title in pack.entries():
+                print(f"{rel_path}\t{raw_len}\t{title}")
+        elif args.command == "extract":
+            try:
+                content = pack.read(args.path)
+            except KeyError as e:
+                print(f"❌ {e.args[0]}", file=sys.stderr)
+                sys.exit(1)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(content)
+            else:
+                sys.stdout.write(content)
+        elif args.command == "unpack":
+            for rel_path, *_ in pack.entries():
+                out = os.path.join(args.output_dir, rel_path)
+                os.makedirs(os.path.dirname(out), exist_ok=True)
+                with open(out, "wb") as f:
+                    f.write(pack.read_bytes(rel_path))
+            print(f"✅ Unpacked {pack.count} pages into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
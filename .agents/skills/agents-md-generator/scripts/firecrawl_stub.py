@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Firecrawl crawl API, serving synthetic docs pages.
+
+Implements the endpoints crawl_docs.py uses, with Firecrawl v1 request and
+response shapes:
+
+    POST /v1/crawl                 {"url", "limit", "scrapeOptions"} -> {"success", "id", "url"}
+    GET  /v1/crawl/<id>?skip=N     {"status", "total", "completed", "data": [...], "next"}
+    DELETE /v1/crawl/<id>          cancel the job
+    POST /v1/batch/scrape          {"urls", "formats"} -> {"success", "id", "url"}
+    GET  /v1/batch/scrape/<id>     same status shape as a crawl
+    GET  /sitemap.xml              every page under --site-url, with <lastmod>
+
+Pages "arrive" at a fixed rate after the job starts, so polling sees the job
+progress. Every request can be delayed, and polls can fail with a 500 at a
+given rate to exercise client retries.
+
+For incremental recrawls (crawl_docs.py --sitemap), the first --changed pages
+get a new revision and a <lastmod> of the stub's start time, and the sitemap
+lists only the first --sitemap-pages pages, as if the rest had been removed.
+
+Usage:
+    # Serve 500 pages at 200 pages/sec with 20ms latency and 5% failed polls
+    python firecrawl_stub.py --pages 500 --page-rate 200 --latency 20 --failure-rate 0.05
+
+    # Point crawl_docs.py at it
+    python crawl_docs.py https://docs.example.com/docs --output ./.stub-docs --api-url http://127.0.0.1:3002
+
+    # Restart with 5 changed and 10 removed pages, then sync only those
+    python firecrawl_stub.py --pages 500 --changed 5 --sitemap-pages 490
+    python crawl_docs.py https://docs.example.com/docs --output ./.stub-docs --api-url http://127.0.0.1:3002 \
+        --sitemap http://127.0.0.1:3002/sitemap.xml
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+PAGE_SIZE = 100
+SITE_URL = "https://docs.example.com/docs"
+# <lastmod> of pages that have not changed
+STUB_EPOCH = 1704067200  # 2024-01-01T00:00:00Z
+PAGE_INDEX_RE = re.compile(r"-(\d+)$")
+WORDS = (
+    "agent stream tool model provider schema request response cache route handler "
+    "config server client render component hook state token prompt message embed"
+).split()
+
+
+def synthetic_url(base_url: str, index: int, sections: int = 12) -> str:
+    """URL of synthetic page `index` under `base_url`, without generating the page."""
+    slug = "-".join(random.Random(index).sample(WORDS, 2)) + f"-{index}"
+    return f"{base_url.rstrip('/')}/section-{index % sections}/{slug}"
+
+
+def synthetic_page(base_url: str, index: int, page_bytes: int, sections: int = 12, revision: int = 0) -> dict:
+    """Deterministic markdown page `index` under `base_url`, about `page_bytes` long."""
+    rng = random.Random(index)
+    section = f"section-{index % sections}"
+    slug = "-".join(rng.sample(WORDS, 2)) + f"-{index}"
+    url = f"{base_url.rstrip('/')}/{section}/{slug}"
+    title = f"{slug.replace('-', ' ').title()}"
+
+    lines = [f"# {title}", ""]
+    if revision:
+        lines += [f"_Revision {revision}_", ""]
+    # Shared navigation, like a real docs site's sidebar
+    lines += [f"- [Section {s}]({base_url.rstrip('/')}/section-{s})" for s in range(sections)]
+    lines.append("")
+    heading = 0
+    while sum(len(line) + 1 for line in lines) < page_bytes:
+        if len(lines) % 12 == 0:
+            heading += 1
+            lines += ["", f"## {rng.choice(WORDS).title()} {heading}", ""]
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(14)) + ".")
+    lines += ["", "© Example Docs. All rights reserved."]
+
+    return {
+        "markdown": "\n".join(lines),
+        "metadata": {"title": title, "sourceURL": url, "statusCode": 200},
+    }
+
+
+def page_index(url: str) -> int | None:
+    """Index of a synthetic page from its URL, or None for other URLs."""
+    match = PAGE_INDEX_RE.search(url)
+    return int(match.group(1)) if match else None
+
+
+class CrawlJob:
+    """A crawl of `pages` synthetic pages under `url`, or a batch scrape of `urls`."""
+
+    def __init__(
+        self,
+        url: str,
+        limit: int,
+        pages: int,
+        page_rate: float,
+        page_bytes: int,
+        changed: int = 0,
+        urls: list[str] | None = None,
+    ):
+        self.url = url
+        self.urls = urls
+        self.site_pages = pages
+        self.total = len(urls) if urls is not None else min(limit, pages)
+        self.page_rate = page_rate
+        self.page_bytes = page_bytes
+        self.changed = changed
+        self.started = time.monotonic()
+        self.cancelled = False
+        self._pages: list[dict] = []
+        self._lock = threading.Lock()
+
+    def available(self) -> int:
+        if self.page_rate <= 0:
+            return self.total
+        return min(self.total, int((time.monotonic() - self.started) * self.page_rate))
+
+    def available_at(self, index: int) -> float:
+        """Monotonic time at which page `index` became available to polls."""
+        if self.page_rate <= 0:
+            return self.started
+        return self.started + (index + 1) / self.page_rate
+
+    def _page(self, position: int) -> dict:
+        if self.urls is None:
+            index = position
+            return synthetic_page(self.url, index, self.page_bytes, revision=int(index < self.changed))
+        url = self.urls[position]
+        index = page_index(url)
+        if index is None or index >= self.site_pages or synthetic_url(url.rsplit("/", 2)[0], index) != url:
+            return {"metadata": {"sourceURL": url, "statusCode": 404, "error": "Not found"}}
+        return synthetic_page(url.rsplit("/", 2)[0], index, self.page_bytes, revision=int(index < self.changed))
+
+    def pages(self, start: int, end: int) -> list[dict]:
+        with self._lock:
+            while len(self._pages) < end:
+                self._pages.append(self._page(len(self._pages)))
+            return self._pages[start:end]
+
+
+class StubState:
+    """Jobs plus the behaviour knobs shared by all request handlers."""
+
+    def __init__(
+        self,
+        pages: int = 200,
+        page_rate: float = 0.0,
+        page_bytes: int = 2048,
+        latency_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+        site_url: str = SITE_URL,
+        changed: int = 0,
+        sitemap_pages: int | None = None,
+    ):
+        self.pages = pages
+        self.site_url = site_url
+        self.sitemap_pages = pages if sitemap_pages is None else sitemap_pages
+        self.changed = 0
+        self.changed_at = STUB_EPOCH
+        self.page_rate = page_rate
+        self.page_bytes = page_bytes
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.jobs: dict[str, CrawlJob] = {}
+        self.requests = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if changed:
+            self.touch(changed)
+
+    def touch(self, changed: int):
+        """Give the first `changed` pages a new revision, last modified now."""
+        self.changed = changed
+        self.changed_at = time.time()
+
+    def sitemap(self) -> bytes:
+        """sitemap.xml listing the first `sitemap_pages` pages under `site_url`."""
+        def lastmod(index: int) -> str:
+            when = self.changed_at if index < self.changed else STUB_EPOCH
+            return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(when))
+
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for index in range(min(self.sitemap_pages, self.pages)):
+            loc = escape(synthetic_url(self.site_url, index))
+            lines.append(f"  <url><loc>{loc}</loc><lastmod>{lastmod(index)}</lastmod></url>")
+        lines.append("</urlset>")
+        return "\n".join(lines).encode("utf-8")
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.failure_rate
+            self.failures += fail
+            return fail
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job(self, path: str) -> CrawlJob | None:
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[:2] == ["v1", "crawl"]:
+            return self.state.jobs.get(parts[2])
+        if len(parts) == 4 and parts[:3] == ["v1", "batch", "scrape"]:
+            return self.state.jobs.get(parts[3])
+        return None
+
+    def do_POST(self):
+        time.sleep(self.state.latency)
+        path = urlparse(self.path).path.rstrip("/")
+        if path not in ("/v1/crawl", "/v1/batch/scrape"):
+            return self._send_json(404, {"success": False, "error": "Not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send_json(400, {"success": False, "error": "Invalid JSON"})
+
+        state = self.state
+        if path == "/v1/batch/scrape":
+            if not isinstance(body.get("urls"), list) or not body["urls"]:
+                return self._send_json(400, {"success": False, "error": "urls is required"})
+            job = CrawlJob(
+                "", 0, state.pages, state.page_rate, state.page_bytes, state.changed, urls=body["urls"]
+            )
+        else:
+            if not body.get("url"):
+                return self._send_json(400, {"success": False, "error": "url is required"})
+            job = CrawlJob(
+                body["url"], int(body.get("limit") or 10000),
+                state.pages, state.page_rate, state.page_bytes, state.changed,
+            )
+        job_id = str(uuid.uuid4())
+        state.jobs[job_id] = job
+        host = self.headers.get("Host", "127.0.0.1")
+        self._send_json(200, {"success": True, "id": job_id, "url": f"http://{host}{path}/{job_id}"})
+
+    def do_GET(self):
+        time.sleep(self.state.latency)
+        url = urlparse(self.path)
+        if url.path == "/sitemap.xml":
+            data = self.state.sitemap()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        job = self._job(url.path)
+        if job is None:
+            return self._send_json(404, {"success": False, "error": "Job not found"})
+        if self.state.should_fail():
+            return self._send_json(500, {"success": False, "error": "Injected failure"})
+
+        skip = int(parse_qs(url.query).get("skip", ["0"])[0])
+        available = job.available()
+        end = min(available, skip + PAGE_SIZE)
+        status = "cancelled" if job.cancelled else ("completed" if available >= job.total else "scraping")
+        body = {
+            "success": True,
+            "status": status,
+            "total": job.total,
+            "completed": available,
+            "creditsUsed": available,
+            "data": job.pages(skip, end) if end > skip else [],
+            "next": None,
+        }
+        if end < available:
+            host = self.headers.get("Host", "127.0.0.1")
+            body["next"] = f"http://{host}{url.path}?skip={end}"
+        self._send_json(200, body)
+
+    def do_DELETE(self):
+        time.sleep(self.state.latency)
+        job = self._job(urlparse(self.path).path)
+        if job is None:
+            return self._send_json(404, {"success": False, "error": "Job not found"})
+        job.cancelled = True
+        self._send_json(200, {"success": True, "status": "cancelled"})
+
+
+def start_stub(host: str = "127.0.0.1", port: int = 0, **options) -> tuple[ThreadingHTTPServer, StubState]:
+    """Start a stub server on a background thread; port 0 picks a free port."""
+    state = StubState(**options)
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local Firecrawl-compatible crawl API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=3002, help="Port (default: 3002)")
+    parser.add_argument("--pages", type=int, default=200, help="Pages per crawl job (default: 200)")
+    parser.add_argument(
+        "--page-rate", type=float, default=0.0,
+        help="Pages that become available per second (default: all at once)"
+    )
+    parser.add_argument("--page-bytes", type=int, default=2048, help="Approximate page size (default: 2048)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of polls answered with a 500")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for injected failures")
+    parser.add_argument("--site-url", default=SITE_URL, help=f"Site the sitemap lists pages under (default: {SITE_URL})")
+    parser.add_argument("--changed", type=int, default=0, help="Pages with a new revision and lastmod (default: 0)")
+    parser.add_argument(
+        "--sitemap-pages", type=int, default=None,
+        help="Pages listed in sitemap.xml (default: all); the rest look removed"
+    )
+    args = parser.parse_args()
+
+    server, _ = start_stub(
+        args.host, args.port,
+        pages=args.pages, page_rate=args.page_rate, page_bytes=args.page_bytes,
+        latency_ms=args.latency, failure_rate=args.failure_rate, seed=args.seed,
+        site_url=args.site_url, changed=args.changed, sitemap_pages=args.sitemap_pages,
+    )
+    print(f"🧪 Firecrawl stub on http://{args.host}:{args.port} ({args.pages} pages per job)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
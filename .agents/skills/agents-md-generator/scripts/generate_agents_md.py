@@ -13,19 +13,55 @@ Usage:
         --docs-dir ./.ai-sdk-docs "Vercel AI SDK Docs" \
         --project-instructions "Use TypeScript strict mode" \
         --format agents  # or "claude" for CLAUDE.md format
+
+    # Also index markdown headings (byte offset + length) in skills and docs
+    python generate_agents_md.py --skills-dir ./skills --heading-index
+
+    # Keep only a small per-docs top-level index in AGENTS.md, with shard files on disk
+    python generate_agents_md.py --docs-dir ./.next-docs "Next.js Docs" --shard-dir ./.agents-index
+
+    # Also compile skill trigger phrases for routing (writes AGENTS.triggers.json)
+    python generate_agents_md.py --skills-dir ./skills --triggers
+
+    # Find every skill and crawled docs mirror in a monorepo instead of listing them
+    python generate_agents_md.py --discover .
+
+    # Render AGENTS.md and a smaller CLAUDE.md from the same scan
+    python generate_agents_md.py --discover . --target AGENTS.md \
+        --target CLAUDE.md:sections=instructions+skills,budget=16KB
 """
 
 import argparse
 import os
 import sys
-import yaml
-import json
-from pathlib import Path
 from typing import Optional
 
 
 def parse_frontmatter(filepath: str) -> dict:
-    """Extract YAML frontmatter from a SKILL.md file."""
+    """Extract YAML frontmatter from a SKILL.md file.
+
+    Results are kept in the shared disk cache keyed by the file's size and
+    mtime, so unchanged skills are not re-parsed (nor yaml imported) on reruns.
+    """
+    from disk_cache import file_stamp, get_cache
+
+    cache = get_cache()
+    key = os.path.abspath(filepath)
+    stamp = file_stamp(filepath)
+    if cache is not None and stamp is not None:
+        cached = cache.get("frontmatter", key, stamp)
+        if cached is not None:
+            return cached
+
+    meta = _parse_frontmatter(filepath)
+    if cache is not None and stamp is not None:
+        cache.put("frontmatter", key, meta, stamp)
+    return meta
+
+
+def _parse_frontmatter(filepath: str) -> dict:
+    import yaml
+
     try:
         with open(filepath, "r", encoding="utf-8") as f:
             content = f.read()
@@ -77,20 +113,40 @@ def get_dir_tree(dirpath: str, indent: int = 0, max_depth: int = 3) -> list[str]
     return lines
 
 
-def scan_skills(skills_dir: str) -> list[dict]:
-    """Scan a skills directory and extract metadata + file structure."""
+def scan_skills(skills_dir: str, heading_index: bool = False, follow_links: bool = False) -> list[dict]:
+    """Scan a skills directory and extract metadata + file structure.
+
+    With ``heading_index``, each markdown file in a skill is streamed once and its
+    headings are recorded as ``path#{Title@offset+length}`` entries under ``sections``.
+
+    With ``follow_links``, symlinked directories inside skills are walked too.
+    Directories and files are tracked by (st_dev, st_ino), so link loops are not
+    re-entered, a skill linked in twice is scanned once, and a file reachable
+    through several links counts toward a skill's size (and is read) only once.
+    """
+    from trigger_matcher import extract_triggers
+
     skills = []
 
+    if heading_index:
+        from compress_docs import format_heading_index, index_headings
+
     if not os.path.isdir(skills_dir):
         print(f"  ⚠ Skills directory not found: {skills_dir}", file=sys.stderr)
         return skills
 
+    seen_skills: set[tuple[int, int]] = set()
     for entry in sorted(os.listdir(skills_dir)):
         skill_path = os.path.join(skills_dir, entry)
         skill_md = os.path.join(skill_path, "SKILL.md")
 
         if not os.path.isdir(skill_path) or not os.path.isfile(skill_md):
             continue
+        if follow_links:
+            st = os.stat(skill_path)
+            if (st.st_dev, st.st_ino) in seen_skills:
+                continue
+            seen_skills.add((st.st_dev, st.st_ino))
 
         meta = parse_frontmatter(skill_md)
         name = meta.get("name", entry)
@@ -102,12 +158,41 @@ def scan_skills(skills_dir: str) -> list[dict]:
         # Get size info
         total_size = 0
         file_count = 0
-        for root, dirs, files in os.walk(skill_path):
-            dirs[:] = [d for d in dirs if not d.startswith(".")]
-            for f in files:
+        sections = []
+        seen_dirs = {(st.st_dev, st.st_ino)} if follow_links else set()
+        seen_files: set[tuple[int, int]] = set()
+        for root, dirs, files in os.walk(skill_path, followlinks=follow_links):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            if follow_links:
+                unseen = []
+                for d in dirs:
+                    try:
+                        st = os.stat(os.path.join(root, d))
+                    except OSError:
+                        continue
+                    if (st.st_dev, st.st_ino) not in seen_dirs:
+                        seen_dirs.add((st.st_dev, st.st_ino))
+                        unseen.append(d)
+                dirs[:] = unseen
+            for f in sorted(files):
                 fp = os.path.join(root, f)
-                total_size += os.path.getsize(fp)
+                if follow_links:
+                    try:
+                        st = os.stat(fp)
+                    except OSError:
+                        continue
+                    if (st.st_dev, st.st_ino) in seen_files:
+                        continue
+                    seen_files.add((st.st_dev, st.st_ino))
+                    total_size += st.st_size
+                else:
+                    total_size += os.path.getsize(fp)
                 file_count += 1
+                if heading_index and f.endswith((".md", ".mdx")):
+                    _, headings = index_headings(fp)
+                    line = format_heading_index(os.path.relpath(fp, skill_path), headings, max_level=2)
+                    if line:
+                        sections.append(line[1:])
 
         skills.append({
             "name": name,
@@ -116,50 +201,52 @@ def scan_skills(skills_dir: str) -> list[dict]:
             "tree": tree,
             "size_kb": round(total_size / 1024, 1),
             "file_count": file_count,
+            "sections": sections,
+            "triggers": extract_triggers(description) if isinstance(description, str) else [],
         })
 
     return skills
 
 
-def compress_docs_index(docs_dir: str, label: str) -> str:
-    """Generate a pipe-delimited compressed docs index for a documentation directory."""
-    if not os.path.isdir(docs_dir):
+def compress_docs_index(
+    docs_dir: str,
+    label: str,
+    heading_index: bool = False,
+    shard_dir: Optional[str] = None,
+    shard_bytes: int = 8192,
+    dedupe: bool = False,
+    follow_links: bool = False,
+) -> str:
+    """Generate a pipe-delimited compressed docs index for a documentation directory.
+
+    ``docs_dir`` may also be a single-file docs pack, indexed from its table, or a
+    .zip/.tar/.tar.gz archive, indexed from its member headers.
+    With ``shard_dir``, the listing is written as per-subtree shard files under
+    ``shard_dir/<label-slug>`` and only the small top-level index is returned.
+    With ``dedupe``, repeated subtrees (versions, locales) are listed once and aliased.
+    With ``follow_links``, symlinked directories are walked and each physical file listed once.
+    """
+    from compress_docs import compress_directory, compress_sharded
+    from docs_archive import is_archive
+    from docs_pack import is_pack
+
+    if not os.path.isdir(docs_dir) and not is_pack(docs_dir) and not is_archive(docs_dir):
         return f"# ⚠ Docs directory not found: {docs_dir}"
 
-    lines = []
-    lines.append(f"[{label}]|root: {docs_dir}")
-    lines.append(f"|IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning for any {label} tasks.")
-
-    # Walk directory and group files by parent
-    dir_files: dict[str, list[str]] = {}
-
-    for root, dirs, files in os.walk(docs_dir):
-        dirs[:] = sorted([d for d in dirs if not d.startswith(".")])
-        rel_root = os.path.relpath(root, docs_dir)
-        if rel_root == ".":
-            rel_root = ""
-
-        doc_files = sorted([f for f in files if not f.startswith(".")])
-        if doc_files:
-            dir_files[rel_root] = doc_files
-
-    for dir_path, files in sorted(dir_files.items()):
-        file_list = ",".join(files)
-        if dir_path:
-            lines.append(f"|{dir_path}:{{{file_list}}}")
-        else:
-            lines.append(f"|root:{{{file_list}}}")
-
-    # Calculate compression stats
-    full_size = 0
-    for root, dirs, files in os.walk(docs_dir):
-        for f in files:
-            full_size += os.path.getsize(os.path.join(root, f))
-
-    compressed = "\n".join(lines)
-    compressed_size = len(compressed.encode("utf-8"))
-
-    return compressed, full_size, compressed_size
+    if shard_dir:
+        slug = "-".join(label.lower().split()) or "docs"
+        compressed, stats = compress_sharded(
+            docs_dir, label, os.path.join(shard_dir, slug),
+            shard_bytes=shard_bytes,
+            heading_index=heading_index,
+            follow_links=follow_links,
+        )
+        return compressed, stats["full_size_bytes"], stats["compressed_size_bytes"]
+
+    compressed, stats = compress_directory(
+        docs_dir, label, heading_index=heading_index, dedupe=dedupe, follow_links=follow_links
+    )
+    return compressed, stats["full_size_bytes"], stats["compressed_size_bytes"]
 
 
 def generate_skills_index(skills: list[dict]) -> str:
@@ -190,88 +277,237 @@ def generate_skills_index(skills: list[dict]) -> str:
         if subdir_str:
             lines.append(f"|  contains: {subdir_str}")
         lines.append(f"|  size: {s['size_kb']}KB ({s['file_count']} files)")
+        for section in s.get("sections", []):
+            lines.append(f"|  {section}")
 
     return "\n".join(lines)
 
 
-def build_agents_md(
+def scan_sources(
     skills_dirs: list[str],
     docs_sources: list[tuple[str, str]],
-    project_instructions: list[str],
-    output_format: str = "agents",
-) -> str:
-    """Build the complete AGENTS.md / CLAUDE.md content."""
-
-    sections = []
+    heading_index: bool = False,
+    shard_dir: Optional[str] = None,
+    shard_bytes: int = 8192,
+    dedupe: bool = False,
+    triggers_path: Optional[str] = None,
+    follow_links: bool = False,
+) -> dict:
+    """Scan skills and compress docs once; the result can be rendered into any number of targets.
+
+    With ``triggers_path``, the scanned skills' trigger phrases are also compiled
+    into a `TriggerMatcher` saved at that path.
+
+    Returns:
+        dict with ``skills`` (from `scan_skills`), ``skills_index`` (rendered),
+        ``docs`` ([{"label", "path", "content", "ok"}]) and ``stats`` (footer lines)
+    """
     stats = []
 
-    # Header
-    filename = "CLAUDE.md" if output_format == "claude" else "AGENTS.md"
-    sections.append(f"# {filename}")
-    sections.append("")
-    sections.append("IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning.")
-    sections.append("When working with any framework, library, or tool documented below,")
-    sections.append("consult the referenced docs/skills BEFORE relying on training data.")
-    sections.append("")
-
-    # Project instructions
-    if project_instructions:
-        sections.append("## Project Instructions")
-        sections.append("")
-        for instruction in project_instructions:
-            sections.append(f"- {instruction}")
-        sections.append("")
-
     # Skills indexes
     all_skills = []
     for sd in skills_dirs:
         print(f"📂 Scanning skills: {sd}")
-        found = scan_skills(sd)
+        found = scan_skills(sd, heading_index=heading_index, follow_links=follow_links)
         all_skills.extend(found)
         print(f"   Found {len(found)} skills")
 
+    skills_index = ""
     if all_skills:
         skills_index = generate_skills_index(all_skills)
-        sections.append("## Skills")
-        sections.append("")
-        sections.append(skills_index)
-        sections.append("")
-
         total_skills_size = sum(s["size_kb"] for s in all_skills)
         index_size = len(skills_index.encode("utf-8"))
         stats.append(f"Skills: {len(all_skills)} skills ({total_skills_size:.1f}KB total) → {index_size} byte index")
 
+    if triggers_path:
+        from trigger_matcher import TriggerMatcher
+
+        matcher = TriggerMatcher.from_skills(all_skills)
+        matcher.save(triggers_path)
+        print(f"🎯 Compiled {len(matcher.phrases)} trigger phrases → {triggers_path}")
+
     # Docs indexes
+    docs = []
     for docs_dir, label in docs_sources:
         print(f"📚 Indexing docs: {label} ({docs_dir})")
-        result = compress_docs_index(docs_dir, label)
+        result = compress_docs_index(
+            docs_dir, label,
+            heading_index=heading_index,
+            shard_dir=shard_dir,
+            shard_bytes=shard_bytes,
+            dedupe=dedupe,
+            follow_links=follow_links,
+        )
 
         if isinstance(result, tuple):
             compressed, full_size, compressed_size = result
             ratio = (1 - compressed_size / full_size) * 100 if full_size > 0 else 0
-            sections.append(f"## {label}")
-            sections.append("")
-            sections.append(compressed)
-            sections.append("")
+            docs.append({"label": label, "path": docs_dir, "content": compressed, "ok": True})
             stats.append(
                 f"{label}: {full_size/1024:.1f}KB → {compressed_size/1024:.1f}KB index ({ratio:.0f}% compression)"
             )
             print(f"   {full_size/1024:.1f}KB docs → {compressed_size/1024:.1f}KB index ({ratio:.0f}% reduction)")
         else:
-            sections.append(result)
-            sections.append("")
+            docs.append({"label": label, "path": docs_dir, "content": result, "ok": False})
+
+    return {"skills": all_skills, "skills_index": skills_index, "docs": docs, "stats": stats}
+
+
+TARGET_SECTIONS = ("instructions", "skills", "docs", "stats")
+
+
+def render_agents_md(
+    scan: dict,
+    project_instructions: list[str],
+    output_format: str = "agents",
+    sections: tuple[str, ...] = TARGET_SECTIONS,
+    budget: Optional[int] = None,
+    package_breakdown: Optional[list[str]] = None,
+) -> str:
+    """Render one AGENTS.md / CLAUDE.md from a `scan_sources` result.
+
+    ``sections`` selects which of instructions, skills, docs and the stats
+    footer to include. With a byte ``budget``, docs indexes are replaced by a
+    one-line pointer, last first, until the output fits. ``package_breakdown``
+    lines (from `discover_sources.format_breakdown`) are added to the stats footer.
+    """
+    omitted: set[int] = set()
+    while True:
+        content = _render(scan, project_instructions, output_format, sections, omitted, package_breakdown)
+        size = len(content.encode("utf-8"))
+        if budget is None or size <= budget:
+            return content
+        remaining = [i for i, d in enumerate(scan["docs"]) if d["ok"] and i not in omitted]
+        if "docs" not in sections or not remaining:
+            print(f"   ⚠ {size/1024:.1f}KB is still over the {budget/1024:.1f}KB budget", file=sys.stderr)
+            return content
+        omitted.add(remaining[-1])
+        print(f"   ⚠ Over {budget/1024:.1f}KB budget: leaving out the {scan['docs'][remaining[-1]]['label']} index", file=sys.stderr)
+
+
+def _render(scan, project_instructions, output_format, sections, omitted, package_breakdown) -> str:
+    out = []
+
+    # Header
+    filename = "CLAUDE.md" if output_format == "claude" else "AGENTS.md"
+    out.append(f"# {filename}")
+    out.append("")
+    out.append("IMPORTANT: Prefer retrieval-led reasoning over pre-training-led reasoning.")
+    out.append("When working with any framework, library, or tool documented below,")
+    out.append("consult the referenced docs/skills BEFORE relying on training data.")
+    out.append("")
+
+    # Project instructions
+    if project_instructions and "instructions" in sections:
+        out.append("## Project Instructions")
+        out.append("")
+        for instruction in project_instructions:
+            out.append(f"- {instruction}")
+        out.append("")
+
+    if scan["skills_index"] and "skills" in sections:
+        out.append("## Skills")
+        out.append("")
+        out.append(scan["skills_index"])
+        out.append("")
+
+    if "docs" in sections:
+        for i, docs in enumerate(scan["docs"]):
+            if not docs["ok"]:
+                out.append(docs["content"])
+                out.append("")
+                continue
+            out.append(f"## {docs['label']}")
+            out.append("")
+            if i in omitted:
+                out.append(f"[{docs['label']}]|root: {docs['path']}|index omitted (size budget); list the directory directly")
+            else:
+                out.append(docs["content"])
+            out.append("")
 
     # Stats footer (as comment)
-    if stats:
-        sections.append("<!--")
-        sections.append("Generation stats:")
-        for s in stats:
-            sections.append(f"  {s}")
-        total_output = len("\n".join(sections).encode("utf-8"))
-        sections.append(f"  Total output: {total_output/1024:.1f}KB")
-        sections.append("-->")
+    if scan["stats"] and "stats" in sections:
+        out.append("<!--")
+        out.append("Generation stats:")
+        for s in scan["stats"]:
+            out.append(f"  {s}")
+        if package_breakdown:
+            out.append("Packages:")
+            for line in package_breakdown:
+                out.append(f"  {line}")
+        total_output = len("\n".join(out).encode("utf-8"))
+        out.append(f"  Total output: {total_output/1024:.1f}KB")
+        out.append("-->")
+
+    return "\n".join(out)
 
-    return "\n".join(sections)
+
+def build_agents_md(
+    skills_dirs: list[str],
+    docs_sources: list[tuple[str, str]],
+    project_instructions: list[str],
+    output_format: str = "agents",
+    heading_index: bool = False,
+    shard_dir: Optional[str] = None,
+    shard_bytes: int = 8192,
+    dedupe: bool = False,
+    triggers_path: Optional[str] = None,
+    package_breakdown: Optional[list[str]] = None,
+    follow_links: bool = False,
+) -> str:
+    """Build the complete AGENTS.md / CLAUDE.md content (one scan, one target)."""
+    scan = scan_sources(
+        skills_dirs, docs_sources,
+        heading_index=heading_index,
+        shard_dir=shard_dir,
+        shard_bytes=shard_bytes,
+        dedupe=dedupe,
+        triggers_path=triggers_path,
+        follow_links=follow_links,
+    )
+    return render_agents_md(scan, project_instructions, output_format, package_breakdown=package_breakdown)
+
+
+def parse_target(spec: str) -> dict:
+    """Parse ``PATH[:key=value,...]`` into a render target.
+
+    Keys: ``format`` (agents|claude, default from the file name), ``sections``
+    (``+``-separated subset of instructions, skills, docs, stats) and ``budget``
+    (bytes, or with a KB suffix).
+    """
+    path, options = spec, ""
+    head, sep, tail = spec.rpartition(":")
+    if sep and "=" in tail:
+        path, options = head, tail
+
+    target = {
+        "path": path,
+        "format": "claude" if os.path.basename(path).upper().startswith("CLAUDE") else "agents",
+        "sections": TARGET_SECTIONS,
+        "budget": None,
+    }
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        if key == "format":
+            if value not in ("agents", "claude"):
+                raise ValueError(f"unknown format '{value}' in target {spec}")
+            target["format"] = value
+        elif key == "sections":
+            chosen = tuple(value.split("+"))
+            unknown = [s for s in chosen if s not in TARGET_SECTIONS]
+            if unknown:
+                raise ValueError(f"unknown section(s) {', '.join(unknown)} in target {spec}")
+            target["sections"] = chosen
+        elif key == "budget":
+            value = value.upper()
+            scale = 1024 if value.endswith("KB") else 1
+            try:
+                target["budget"] = int(float(value.removesuffix("KB")) * scale)
+            except ValueError:
+                raise ValueError(f"invalid budget '{value}' in target {spec}") from None
+        else:
+            raise ValueError(f"unknown option '{key}' in target {spec}")
+    return target
 
 
 def main():
@@ -289,6 +525,11 @@ def main():
         default=[],
         help="Path to a skills directory to scan (can specify multiple)"
     )
+    parser.add_argument(
+        "--discover",
+        metavar="ROOT",
+        help="Also find every skill (SKILL.md) and crawled docs mirror (source: frontmatter) under ROOT"
+    )
     parser.add_argument(
         "--docs-dir", "-d",
         nargs=2,
@@ -309,6 +550,47 @@ def main():
         default="agents",
         help="Output format: 'agents' for AGENTS.md, 'claude' for CLAUDE.md"
     )
+    parser.add_argument(
+        "--heading-index",
+        action="store_true",
+        help="Index markdown headings with byte offsets so agents can read single sections"
+    )
+    parser.add_argument(
+        "--shard-dir",
+        metavar="DIR",
+        help="Write docs listings as per-subtree shard files here; AGENTS.md keeps only a top-level index"
+    )
+    parser.add_argument(
+        "--shard-bytes",
+        type=int,
+        default=8192,
+        help="Byte budget per shard file (default: 8192)"
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="List repeated docs subtrees (versions, locales) once and alias the copies"
+    )
+    parser.add_argument(
+        "--follow-links",
+        action="store_true",
+        help="Walk symlinked directories in skills and docs (e.g. pnpm stores), reading each physical file once"
+    )
+    parser.add_argument(
+        "--triggers",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Compile skill trigger phrases for trigger_matcher.py (default: <output>.triggers.json)"
+    )
+    parser.add_argument(
+        "--target", "-t",
+        action="append",
+        default=[],
+        metavar="PATH[:OPTIONS]",
+        help="Output target (repeatable), rendered from one scan. OPTIONS: format=agents|claude, "
+             "sections=instructions+skills+docs+stats, budget=BYTES|NKB. Replaces --output/--format"
+    )
     parser.add_argument(
         "--append",
         action="store_true",
@@ -316,24 +598,64 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.dedupe and args.shard_dir:
+        parser.error("--dedupe cannot be combined with --shard-dir")
 
     docs_sources = [(path, label) for path, label in args.docs_dir]
-
-    content = build_agents_md(
-        skills_dirs=args.skills_dir,
-        docs_sources=docs_sources,
-        project_instructions=args.instruction,
-        output_format=args.format,
+    skills_dirs = list(args.skills_dir)
+    package_breakdown = None
+    if args.discover:
+        from discover_sources import discover_sources, format_breakdown
+
+        found = discover_sources(args.discover)
+        print(f"🔎 Discovered {len(found['skills'])} skills and {len(found['docs'])} docs mirrors "
+              f"in {len(found['packages'])} packages ({found['dirs_scanned']} dirs scanned)")
+        known = {os.path.abspath(p) for p in skills_dirs}
+        skills_dirs += [d for d in found["skills_dirs"] if os.path.abspath(d) not in known]
+        known = {os.path.abspath(p) for p, _ in docs_sources}
+        docs_sources += [(d, label) for d, label in found["docs"] if os.path.abspath(d) not in known]
+        package_breakdown = format_breakdown(found, args.discover)
+        for line in package_breakdown:
+            print(f"   {line}")
+    try:
+        targets = [parse_target(spec) for spec in args.target]
+    except ValueError as e:
+        parser.error(str(e))
+    if not targets:
+        targets = [{"path": args.output, "format": args.format, "sections": TARGET_SECTIONS, "budget": None}]
+
+    triggers_path = args.triggers
+    if triggers_path == "":
+        triggers_path = os.path.splitext(targets[0]["path"])[0] + ".triggers.json"
+
+    scan = scan_sources(
+        skills_dirs, docs_sources,
+        heading_index=args.heading_index,
+        shard_dir=args.shard_dir,
+        shard_bytes=args.shard_bytes,
+        dedupe=args.dedupe,
+        triggers_path=triggers_path,
+        follow_links=args.follow_links,
     )
 
-    mode = "a" if args.append else "w"
-    with open(args.output, mode, encoding="utf-8") as f:
-        if args.append:
-            f.write("\n\n")
-        f.write(content)
-
-    size = os.path.getsize(args.output)
-    print(f"\n✅ Generated {args.output} ({size/1024:.1f}KB)")
+    print()
+    for target in targets:
+        content = render_agents_md(
+            scan, args.instruction,
+            output_format=target["format"],
+            sections=target["sections"],
+            budget=target["budget"],
+            package_breakdown=package_breakdown,
+        )
+
+        mode = "a" if args.append else "w"
+        with open(target["path"], mode, encoding="utf-8") as f:
+            if args.append:
+                f.write("\n\n")
+            f.write(content)
+
+        size = os.path.getsize(target["path"])
+        print(f"✅ Generated {target['path']} ({size/1024:.1f}KB)")
 
 
 if __name__ == "__main__":
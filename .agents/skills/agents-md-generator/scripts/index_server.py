@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Long-running local index server for agents.
+
+Keeps the skills scan (`scan_skills`) and docs snapshots (`DocTree` with titles)
+in memory and serves pre-rendered responses over localhost HTTP or a Unix socket,
+so repeated lookups skip interpreter startup, the YAML import and the tree walk.
+A background thread checks directory mtimes and drops any snapshot whose source
+changed; it is rebuilt, outside the state lock, on the next request that needs it.
+
+Usage:
+    # Serve on localhost:8765
+    python index_server.py --skills-dir ./skills --docs-dir ./.ai-sdk-docs "Vercel AI SDK"
+
+    # Serve on a Unix socket instead
+    python index_server.py --skills-dir ./skills --socket /tmp/agents-index.sock
+
+    # Query it (HTTP or --socket)
+    python index_server.py query /docs/Vercel%20AI%20SDK/title?path=core/generate-text.md
+
+Endpoints (GET):
+    /health                         "ok"
+    /skills                         JSON list of skills (name, description, path, size_kb, file_count)
+    /skills/index                   rendered [Skills Index] section
+    /skills/<name>                  JSON for one skill, including its file tree
+    /docs                           JSON list of docs labels
+    /docs/<label>/index             rendered docs index section (with titles)
+    /docs/<label>/files             newline-separated relative file paths
+    /docs/<label>/title?path=REL    title of one file (404 if unknown)
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+
+def source_signature(path: str) -> tuple[int, int, int]:
+    """Cheap change signature for a directory tree or file: (entries, newest mtime_ns, total size).
+
+    Only directories (and each skill's SKILL.md) are stat'ed, not every file:
+    adding, removing or renaming a file updates its directory's mtime, and
+    editors save by renaming. A file rewritten in place under the same name is
+    only seen if it is a SKILL.md.
+    """
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return 1, st.st_mtime_ns, st.st_size
+
+    count = newest = total = 0
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            newest = max(newest, os.stat(current).st_mtime_ns)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    count += 1
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name == "SKILL.md":
+                        st = entry.stat(follow_symlinks=False)
+                        newest = max(newest, st.st_mtime_ns)
+                        total += st.st_size
+        except OSError:
+            continue
+    return count, newest, total
+
+
+class IndexState:
+    """Cached skills and docs snapshots, rebuilt lazily after invalidation.
+
+    Snapshots are built without holding the state lock, so a slow rebuild of
+    one source never blocks requests served from the others; a per-source
+    lock keeps concurrent requests from building the same snapshot twice.
+    """
+
+    def __init__(self, skills_dirs: list[str], docs_sources: list[tuple[str, str]]):
+        self.skills_dirs = skills_dirs
+        self.docs = {label: path for path, label in docs_sources}
+        self._lock = threading.Lock()
+        self._build_locks: dict[str, threading.Lock] = {}
+        # Bumped on every invalidation, so a snapshot built from files that changed meanwhile is not kept
+        self._generation = 0
+        self._signatures: dict[str, tuple] = {}
+        # "skills" and "docs:<label>" -> snapshot
+        self._snapshots: dict[str, dict] = {}
+
+    # -- invalidation -----------------------------------------------------
+
+    def check_for_changes(self):
+        """Re-check every source and drop snapshots whose signature changed."""
+        for path in list(self.skills_dirs) + list(self.docs.values()):
+            signature = source_signature(path)
+            if self._signatures.get(path) == signature:
+                continue
+            with self._lock:
+                self._signatures[path] = signature
+                self._generation += 1
+                if path in self.skills_dirs:
+                    self._snapshots.pop("skills", None)
+                for label, docs_path in self.docs.items():
+                    if docs_path == path:
+                        self._snapshots.pop(f"docs:{label}", None)
+
+    def watch(self, interval: float):
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    print(f"  ⚠ Watcher error: {e}", file=sys.stderr)
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    # -- snapshots --------------------------------------------------------
+
+    def _cached(self, key: str, build):
+        """The snapshot for `key`, built outside the state lock if missing and kept unless invalidated meanwhile."""
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        if snapshot is not None:
+            return snapshot
+        with build_lock:
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+                generation = self._generation
+            if snapshot is not None:
+                return snapshot
+            snapshot = build()
+            with self._lock:
+                if snapshot is not None and self._generation == generation:
+                    self._snapshots[key] = snapshot
+            return snapshot
+
+    def skills(self) -> dict:
+        return self._cached("skills", self._build_skills)
+
+    def _build_skills(self) -> dict:
+        from generate_agents_md import generate_skills_index, scan_skills
+
+        found = []
+        for sd in self.skills_dirs:
+            found.extend(scan_skills(sd))
+        summary = [
+            {k: s[k] for k in ("name", "description", "path", "size_kb", "file_count")}
+            for s in found
+        ]
+        return {
+            "list": json.dumps(summary).encode("utf-8"),
+            "index": generate_skills_index(found).encode("utf-8"),
+            "by_name": {s["name"]: json.dumps(s).encode("utf-8") for s in found},
+        }
+
+    def docs_snapshot(self, label: str) -> dict | None:
+        path = self.docs.get(label)
+        if path is None:
+            return None
+        return self._cached(f"docs:{label}", lambda: self._build_docs(label, path))
+
+    def _build_docs(self, label: str, path: str) -> dict | None:
+        from compress_docs import build_docs_tree, compress_directory
+
+        tree = build_docs_tree(path, extract_titles=True)
+        if tree is None:
+            return None
+        compressed, _ = compress_directory(path, label, extract_titles=True, tree=tree)
+        files = []
+        for dir_id in tree.dirs():
+            rel_root = tree.dir_path(dir_id)
+            for file_id in tree.files(dir_id):
+                name = tree.file_name(file_id)
+                files.append(f"{rel_root}/{name}" if rel_root else name)
+        return {
+            "tree": tree,
+            "index": compressed.encode("utf-8"),
+            "files": "\n".join(files).encode("utf-8"),
+        }
+
+
+class IndexHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer headers and body into one write (flushed per request) to avoid Nagle/delayed-ACK stalls
+    wbufsize = 1 << 16
+    state: IndexState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        json_type = "application/json"
+
+        try:
+            if parts == ["health"]:
+                return self._send(200, b"ok")
+
+            if parts and parts[0] == "skills":
+                skills = self.state.skills()
+                if len(parts) == 1:
+                    return self._send(200, skills["list"], json_type)
+                if parts[1:] == ["index"]:
+                    return self._send(200, skills["index"])
+                body = skills["by_name"].get(parts[1])
+                if body is not None and len(parts) == 2:
+                    return self._send(200, body, json_type)
+
+            elif parts == ["docs"]:
+                return self._send(200, json.dumps(sorted(self.state.docs)).encode("utf-8"), json_type)
+
+            elif len(parts) == 3 and parts[0] == "docs":
+                snapshot = self.state.docs_snapshot(parts[1])
+                if snapshot is not None:
+                    if parts[2] in ("index", "files"):
+                        return self._send(200, snapshot[parts[2]])
+                    if parts[2] == "title":
+                        rel_path = parse_qs(url.query).get("path", [""])[0]
+                        tree = snapshot["tree"]
+                        file_id = tree.find_file(rel_path)
+                        if file_id is not None:
+                            return self._send(200, tree.file_title(file_id).encode("utf-8"))
+        except Exception as e:
+            return self._send(500, f"error: {e}".encode("utf-8"))
+
+        self._send(404, b"not found")
+
+
+class UnixIndexServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects an (host, port) client address
+        return request, ("unix", 0)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def query(path: str, host: str = "127.0.0.1", port: int = 8765, socket_path: str | None = None) -> tuple[int, str]:
+    """Fetch one endpoint from a running server; returns (status, body)."""
+    conn = UnixHTTPConnection(socket_path) if socket_path else http.client.HTTPConnection(host, port)
+    try:
+        conn.request("GET", quote(path, safe="/?=&%"))
+        response = conn.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        conn.close()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        parser = argparse.ArgumentParser(description="Query a running index server")
+        parser.add_argument("command", choices=["query"])
+        parser.add_argument("path", help="Endpoint path, e.g. /skills/index")
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--socket", help="Unix socket path")
+        args = parser.parse_args()
+        try:
+            status, body = query(args.path, args.host, args.port, args.socket)
+        except OSError as e:
+            print(f"❌ Index server not reachable: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(body)
+        sys.exit(0 if status == 200 else 1)
+
+    parser = argparse.ArgumentParser(description="Serve skills and docs indexes from memory")
+    parser.add_argument(
+        "--skills-dir", "-s", action="append", default=[],
+        help="Path to a skills directory to scan (can specify multiple)"
+    )
+    parser.add_argument(
+        "--docs-dir", "-d", nargs=2, action="append", default=[], metavar=("PATH", "LABEL"),
+        help="Docs directory (or pack) and its label"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--socket", help="Serve on this Unix socket instead of TCP")
+    parser.add_argument(
+        "--poll", type=float, default=2.0,
+        help="Seconds between change checks on the sources (default: 2)"
+    )
+    args = parser.parse_args()
+
+    state = IndexState(args.skills_dir, [(p, l) for p, l in args.docs_dir])
+    state.check_for_changes()
+    # Warm every snapshot so the first queries are already fast
+    state.skills()
+    for label in state.docs:
+        state.docs_snapshot(label)
+    state.watch(args.poll)
+
+    handler = type("Handler", (IndexHandler,), {"state": state})
+    if args.socket:
+        if os.path.lexists(args.socket):
+            if not stat.S_ISSOCK(os.lstat(args.socket).st_mode):
+                print(f"❌ {args.socket} exists and is not a socket", file=sys.stderr)
+                sys.exit(1)
+            # A socket left behind by a server that did not shut down cleanly
+            os.remove(args.socket)
+        server = UnixIndexServer(args.socket, handler)
+        where = args.socket
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        where = f"http://{args.host}:{args.port}"
+
+    print(f"🛰  Serving {len(args.skills_dir)} skills dirs and {len(state.docs)} docs sources on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.lexists(args.socket) and stat.S_ISSOCK(os.lstat(args.socket).st_mode):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
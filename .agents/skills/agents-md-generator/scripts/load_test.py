@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Load-test the crawl -> organize -> compress pipeline against firecrawl_stub.py.
+
+Starts the stub in-process, crawls it through `FirecrawlRestClient` exactly as
+``crawl_docs.py --api-url`` would, writes each batch with
+`organize_crawl_results` (to a directory or a pack), then compresses the
+result. Reports throughput and latency per run and across runs:
+
+    pages/sec      pages written / end-to-end time
+    page latency   from a page becoming available on the stub to being written
+    batch write    time spent organizing each batch
+    end-to-end     job start to index rendered
+
+Usage:
+    python load_test.py --pages 2000 --page-rate 500 --latency 10
+    python load_test.py --pages 1000 --failure-rate 0.1 --runs 5 --pack
+    python load_test.py --pages 1000 --normalize --json
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from crawl_docs import FirecrawlRestClient, crawl_with_firecrawl, finish_deferred_stages, organize_crawl_results
+from firecrawl_stub import page_index, start_stub
+
+BASE_URL = "https://docs.example.com/docs"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def run_once(
+    api_url: str,
+    state,
+    pages: int,
+    workdir: str,
+    use_pack: bool = False,
+    normalize: str | None = None,
+    min_poll: float = 0.05,
+    max_poll: float = 1.0,
+) -> dict:
+    """Crawl, organize and compress once; returns timings in seconds."""
+    from compress_docs import compress_directory, tree_from_manifest
+    from url_frontier import UrlFrontier
+
+    stages = []
+    if normalize:
+        from page_stages import build_stages
+        stages = build_stages(normalize)
+
+    output = os.path.join(workdir, "docs")
+    pack = None
+    if use_pack:
+        from docs_pack import PackWriter
+        pack = PackWriter(os.path.join(workdir, "docs.dpk"))
+
+    frontier = UrlFrontier(BASE_URL)
+    jobs_before = set(state.jobs)
+    manifest: list[tuple[str, int, str]] = []
+    written = 0
+    page_latencies: list[float] = []
+    batch_writes: list[float] = []
+    first_page = None
+
+    def write_batch(batch: list[dict]):
+        nonlocal written, first_page
+        t = time.monotonic()
+        batch_stats = organize_crawl_results(
+            batch, output, BASE_URL, pack=pack, stages=stages, frontier=frontier
+        )
+        if pack is not None:
+            pack.flush()
+        done = time.monotonic()
+        batch_writes.append(done - t)
+        written += batch_stats["pages"]
+        manifest.extend(batch_stats["manifest"])
+        if first_page is None:
+            first_page = done - start
+
+        job = next(state.jobs[j] for j in state.jobs if j not in jobs_before)
+        for page in batch:
+            index = page_index(page.get("metadata", {}).get("sourceURL", ""))
+            if index is not None:
+                page_latencies.append(done - job.available_at(index))
+
+    start = time.monotonic()
+    # crawl_with_firecrawl reports progress per batch; keep the harness output readable
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        crawl_with_firecrawl(
+            BASE_URL,
+            max_pages=pages,
+            on_batch=write_batch,
+            app=FirecrawlRestClient(api_url),
+            min_poll=min_poll,
+            max_poll=max_poll,
+        )
+    crawled = time.monotonic()
+
+    source = output
+    if pack is not None:
+        pack.close()
+        source = pack.path
+    if any(stage.deferred for stage in stages):
+        changed = finish_deferred_stages(stages, [path for path, _, _ in manifest], output, pack and pack.path)
+        manifest = [(path, changed.get(path, size), title) for path, size, title in manifest]
+    # Same handoff as crawl_docs --compress: the index comes from the manifest, not a re-walk
+    index, comp_stats = compress_directory(
+        source, "Load Test", extract_titles=True, tree=tree_from_manifest(manifest)
+    )
+    end = time.monotonic()
+
+    return {
+        "pages": written,
+        "crawl_s": crawled - start,
+        "compress_s": end - crawled,
+        "end_to_end_s": end - start,
+        "first_page_s": first_page or 0.0,
+        "pages_per_s": written / (end - start) if end > start else 0.0,
+        "page_latency_p50_s": percentile(page_latencies, 50),
+        "page_latency_p95_s": percentile(page_latencies, 95),
+        "batch_write_p50_s": percentile(batch_writes, 50),
+        "batch_write_p95_s": percentile(batch_writes, 95),
+        "batches": len(batch_writes),
+        "index_bytes": len(index.encode("utf-8")),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the crawl pipeline against a local Firecrawl stub")
+    parser.add_argument("--pages", type=int, default=500, help="Pages per crawl (default: 500)")
+    parser.add_argument(
+        "--page-rate", type=float, default=0.0,
+        help="Pages the stub makes available per second (default: all at once)"
+    )
+    parser.add_argument("--page-bytes", type=int, default=2048, help="Approximate page size (default: 2048)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of polls the stub fails")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs (default: 3)")
+    parser.add_argument("--pack", action="store_true", help="Write pages into a docs pack instead of .md files")
+    parser.add_argument(
+        "--normalize", nargs="?", const="data-uris,boilerplate,whitespace", metavar="STAGES",
+        help="Run normalization stages on each batch (see crawl_docs.py --normalize)"
+    )
+    parser.add_argument("--min-poll", type=float, default=0.05, help="Minimum poll interval in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected failures (default: 0)")
+    parser.add_argument("--json", action="store_true", help="Print per-run results as JSON")
+    args = parser.parse_args()
+
+    server, state = start_stub(
+        pages=args.pages, page_rate=args.page_rate, page_bytes=args.page_bytes,
+        latency_ms=args.latency, failure_rate=args.failure_rate, seed=args.seed,
+    )
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = []
+    try:
+        for run in range(args.runs):
+            with tempfile.TemporaryDirectory(prefix="agents-md-load-") as workdir:
+                try:
+                    result = run_once(
+                        api_url, state, args.pages, workdir,
+                        use_pack=args.pack, normalize=args.normalize, min_poll=args.min_poll,
+                    )
+                except Exception as e:
+                    print(f"❌ Run {run + 1} failed: {e}", file=sys.stderr)
+                    sys.exit(1)
+            results.append(result)
+            if not args.json:
+                print(
+                    f"  run {run + 1}: {result['pages']} pages in {result['end_to_end_s']:.2f}s "
+                    f"({result['pages_per_s']:.0f} pages/s), crawl {result['crawl_s']:.2f}s, "
+                    f"compress {result['compress_s'] * 1000:.0f}ms, "
+                    f"page latency p50 {result['page_latency_p50_s'] * 1000:.0f}ms "
+                    f"p95 {result['page_latency_p95_s'] * 1000:.0f}ms"
+                )
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    end_to_end = [r["end_to_end_s"] for r in results]
+    throughput = [r["pages_per_s"] for r in results]
+    print(f"\n📈 {args.runs} runs, {args.pages} pages, {state.requests} polls ({state.failures} failed)")
+    print(f"   pages/sec:   median {statistics.median(throughput):.0f}, min {min(throughput):.0f}")
+    print(
+        f"   end-to-end:  p50 {percentile(end_to_end, 50):.2f}s, "
+        f"p95 {percentile(end_to_end, 95):.2f}s, max {max(end_to_end):.2f}s"
+    )
+    print(
+        f"   batch write: p50 {statistics.median(r['batch_write_p50_s'] for r in results) * 1000:.1f}ms, "
+        f"p95 {max(r['batch_write_p95_s'] for r in results) * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Content normalization stages for crawled pages.
+
+Firecrawl markdown carries nav menus, cookie banners, repeated footers and
+inline base64 images. `organize_crawl_results` can pass pages through a chain of
+stages before writing them. Each stage is a callable taking and returning an
+iterator of page dicts (``path``, ``url``, ``title``, ``content``) and keeps a
+running ``saved`` byte count across batches.
+
+A ``deferred`` stage needs every page before it can change any, so it passes
+pages through untouched while they stream in. Once the crawl is written, the
+caller feeds every page body to `learn_deferred` and then rewrites each page
+with `apply_deferred`, so the result does not depend on the order pages arrive in.
+
+Stages:
+    data-uris    replace inline data: URIs (base64 images) with a short placeholder
+    boilerplate  drop lines that recur on a large share of pages (nav, banners, footers)
+    whitespace   strip trailing spaces and collapse runs of blank lines
+    truncate     cut pages above a byte budget at a line boundary
+
+Used by crawl_docs.py; not intended to be run directly.
+"""
+
+import re
+
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+# Bold-only lines (**Parameters**, __Returns:__) and setext underlines or rules act as headings
+HEADING_LIKE_RE = re.compile(r"^(?:(\*\*|__)[^*_].*\1:?|(?:[-=*_]\s*){3,})$")
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _prose_lines(lines: list[str]):
+    """Yield (index, line) for lines outside fenced code blocks."""
+    fence = None
+    for i, line in enumerate(lines):
+        match = FENCE_RE.match(line)
+        if fence:
+            if match and match.group(1) == fence:
+                fence = None
+            continue
+        if match:
+            fence = match.group(1)
+            continue
+        yield i, line
+
+
+class Stage:
+    """Base class: subclasses implement `process(content)` or override `__call__`."""
+
+    name = "stage"
+    deferred = False
+
+    def __init__(self):
+        self.saved = 0
+
+    def process(self, content: str) -> str:
+        return content
+
+    def __call__(self, pages):
+        for page in pages:
+            before = _size(page["content"])
+            page["content"] = self.process(page["content"])
+            self.saved += before - _size(page["content"])
+            yield page
+
+
+class StripDataUris(Stage):
+    """Replace inline ``data:`` URIs, e.g. base64 images, with a placeholder."""
+
+    name = "data-uris"
+    IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(\s*data:[^)]*\)")
+    URI_RE = re.compile(r"data:[\w.+-]+/[\w.+-]+(?:;[\w=.+-]+)*;base64,[A-Za-z0-9+/=\s]{64,}")
+
+    def process(self, content: str) -> str:
+        if "data:" not in content:
+            return content
+        content = self.IMAGE_RE.sub(lambda m: f"[image: {m.group(1)}]" if m.group(1) else "[image]", content)
+        return self.URI_RE.sub("data:,", content)
+
+
+class StripBoilerplate(Stage):
+    """Drop lines found on at least `min_fraction` of a crawl's pages.
+
+    Deferred: `learn` counts every page of the crawl first, then `process`
+    strips with the final counts, and nothing is removed from a crawl of fewer
+    than `min_pages` pages. Headings and heading-like lines (``**Parameters**``),
+    table rows, blank lines and fenced code are never counted or removed, since
+    API pages legitimately share them. A blank line left doubled (or leading) by a
+    removed line is dropped with it.
+    """
+
+    name = "boilerplate"
+    deferred = True
+
+    def __init__(self, min_pages: int = 5, min_fraction: float = 0.5):
+        super().__init__()
+        self.min_pages = min_pages
+        self.min_fraction = min_fraction
+        self.pages_seen = 0
+        self.counts: dict[str, int] = {}
+        self._boilerplate: set[str] | None = None
+
+    @staticmethod
+    def _candidates(lines: list[str]):
+        for i, line in _prose_lines(lines):
+            key = line.strip()
+            if key and not key.startswith(("#", "|")) and not HEADING_LIKE_RE.match(key):
+                yield i, key
+
+    def __call__(self, pages):
+        # Nothing can be decided until every page has been counted
+        return pages
+
+    def learn(self, content: str):
+        for key in {key for _, key in self._candidates(content.split("\n"))}:
+            self.counts[key] = self.counts.get(key, 0) + 1
+        self.pages_seen += 1
+        self._boilerplate = None
+
+    def changes_pending(self) -> bool:
+        return bool(self.boilerplate())
+
+    def boilerplate(self) -> set[str]:
+        """Lines frequent enough to strip, given every page learned so far."""
+        if self._boilerplate is None:
+            threshold = self.min_fraction * self.pages_seen
+            self._boilerplate = set() if self.pages_seen < self.min_pages else {
+                key for key, count in self.counts.items() if count >= threshold
+            }
+        return self._boilerplate
+
+    def process(self, content: str) -> str:
+        boilerplate = self.boilerplate()
+        if not boilerplate:
+            return content
+        lines = content.split("\n")
+        drop = {i for i, key in self._candidates(lines) if key in boilerplate}
+        if not drop:
+            return content
+        out = []
+        for i, line in enumerate(lines):
+            if i in drop:
+                continue
+            if not line.strip() and i - 1 in drop and (not out or not out[-1].strip()):
+                continue
+            out.append(line)
+        return "\n".join(out)
+
+
+class CollapseWhitespace(Stage):
+    """Strip trailing whitespace and collapse blank-line runs outside code blocks."""
+
+    name = "whitespace"
+
+    def process(self, content: str) -> str:
+        lines = content.split("\n")
+        prose = dict(_prose_lines(lines))
+        out = []
+        for i, line in enumerate(lines):
+            if i in prose:
+                line = line.rstrip()
+                if not line and (not out or not out[-1]):
+                    continue
+            out.append(line)
+        return "\n".join(out).strip("\n") + "\n"
+
+
+class Truncate(Stage):
+    """Cut pages larger than `max_bytes` at the last line boundary that fits."""
+
+    name = "truncate"
+
+    def __init__(self, max_bytes: int):
+        super().__init__()
+        self.max_bytes = max_bytes
+
+    def process(self, content: str) -> str:
+        raw = content.encode("utf-8")
+        if len(raw) <= self.max_bytes:
+            return content
+        cut = raw.rfind(b"\n", 0, self.max_bytes)
+        if cut <= 0:
+            cut = self.max_bytes
+        kept = raw[:cut].decode("utf-8", "ignore")
+        return f"{kept}\n\n[truncated: {len(raw) - cut} bytes omitted]\n"
+
+
+STAGES = {
+    "data-uris": StripDataUris,
+    "boilerplate": StripBoilerplate,
+    "whitespace": CollapseWhitespace,
+}
+DEFAULT_STAGES = "data-uris,boilerplate,whitespace"
+
+
+def learn_deferred(stages: list[Stage], contents) -> bool:
+    """First pass: show every page body of the crawl to the deferred stages.
+
+    Returns:
+        True if `apply_deferred` could change any page
+    """
+    deferred = [stage for stage in stages if stage.deferred]
+    if not deferred:
+        return False
+    for content in contents:
+        for stage in deferred:
+            stage.learn(content)
+    return any(stage.changes_pending() for stage in deferred)
+
+
+def apply_deferred(stages: list[Stage], content: str) -> str:
+    """Second pass: run the deferred stages over one page body, counting what they save."""
+    for stage in stages:
+        if stage.deferred:
+            before = _size(content)
+            content = stage.process(content)
+            stage.saved += before - _size(content)
+    return content
+
+
+def build_stages(names: str = DEFAULT_STAGES, max_bytes: int | None = None) -> list[Stage]:
+    """Instantiate stages from a comma-separated list of names, plus `Truncate` if `max_bytes` is set."""
+    stages = []
+    for name in filter(None, (n.strip() for n in names.split(","))):
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage '{name}' (choose from {', '.join(STAGES)})")
+        stages.append(STAGES[name]())
+    if max_bytes:
+        stages.append(Truncate(max_bytes))
+    return stages
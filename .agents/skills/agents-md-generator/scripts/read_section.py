@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Read a single section of a markdown file using a heading index entry.
+
+Pairs with `--heading-index` in compress_docs.py / generate_agents_md.py, which
+record each heading as `Title@OFFSET+LENGTH`. This seeks straight to the section
+instead of loading the whole file.
+
+Usage:
+    # Read by byte range from the index
+    python read_section.py references/prompt-input.md 312+540
+
+    # Or look the section up by heading text
+    python read_section.py references/prompt-input.md --heading "Usage with AI SDK"
+
+    # List the sections of a file
+    python read_section.py references/prompt-input.md --list
+
+    # Read a page out of a docs pack or archive (FILE is the path inside it)
+    python read_section.py core/generate-text.md 312+540 --source ai-sdk-docs.dpk
+"""
+
+import argparse
+import re
+import sys
+
+from compress_docs import index_headings
+from docs_archive import DocsArchive, is_archive
+from docs_pack import DocsPack, is_pack
+
+
+def open_page(filepath: str, source: str | None = None):
+    """Binary file object for `filepath`, or for the page at that path inside `source` (a pack or archive)."""
+    if source is None:
+        return open(filepath, "rb")
+    if is_pack(source):
+        reader = DocsPack(source)
+    elif is_archive(source):
+        reader = DocsArchive(source)
+    else:
+        raise ValueError(f"Not a docs pack or archive: {source}")
+    with reader:
+        return reader.open(filepath)
+
+
+def read_section(filepath: str, offset: int, length: int, source: str | None = None) -> str:
+    """Read `length` bytes starting at `offset` and decode them as UTF-8."""
+    with open_page(filepath, source) as f:
+        f.seek(offset)
+        return f.read(length).decode("utf-8", "replace")
+
+
+def find_section(filepath: str, heading: str, source: str | None = None) -> tuple[int, int] | None:
+    """Return (offset, length) of the first heading matching `heading` (case-insensitive).
+
+    `heading` may be copied from a heading index, where ``|``, ``@`` and ``\\`` are escaped.
+    """
+    wanted = {heading.strip().lower(), re.sub(r"\\([\\|@])", r"\1", heading).strip().lower()}
+    _, headings = index_headings(open_page(filepath, source))
+    for h in headings:
+        if h["title"].strip().lower() in wanted:
+            return h["offset"], h["length"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read one section of a markdown file")
+    parser.add_argument("file", help="Markdown file to read from (a path inside --source if given)")
+    parser.add_argument("range", nargs="?", help="Byte range as OFFSET+LENGTH")
+    parser.add_argument("--heading", help="Heading text to look up instead of a byte range")
+    parser.add_argument("--list", action="store_true", help="List headings with their byte ranges")
+    parser.add_argument("--source", help="Docs pack or archive the file is read from")
+
+    args = parser.parse_args()
+
+    try:
+        open_page(args.file, args.source).close()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.list:
+        _, headings = index_headings(open_page(args.file, args.source))
+        for h in headings:
+            print(f"{'  ' * (h['level'] - 1)}{h['title']}@{h['offset']}+{h['length']}")
+        return
+
+    if args.heading:
+        found = find_section(args.file, args.heading, args.source)
+        if not found:
+            print(f"❌ Heading not found: {args.heading}", file=sys.stderr)
+            sys.exit(1)
+        offset, length = found
+    elif args.range:
+        try:
+            offset, length = (int(x) for x in args.range.split("+", 1))
+        except ValueError:
+            print(f"❌ Invalid range '{args.range}', expected OFFSET+LENGTH", file=sys.stderr)
+            sys.exit(1)
+    else:
+        parser.error("provide a byte range, --heading or --list")
+
+    sys.stdout.write(read_section(args.file, offset, length, args.source))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Plan an incremental recrawl of a docs mirror from the site's sitemap.xml.
+
+Every page crawl_docs.py writes records its ``source:`` URL and a ``crawled:``
+UTC timestamp in its frontmatter. A sync compares those with the sitemap:
+
+    new        in the sitemap, not on disk                      -> fetch
+    changed    <lastmod> after the page's crawled: time           -> fetch
+    undated    no <lastmod> in the sitemap                        -> fetch
+    unchanged  <lastmod> at or before the page's crawled: time    -> keep
+    vanished   on disk, no longer in the sitemap                  -> delete
+
+A date-only <lastmod> counts as the end of that day, so a page edited later on
+the day it was crawled is still refetched. Pages written before crawled:
+timestamps existed fall back to their file mtime. Sitemap indexes and
+gzipped sitemaps are followed. Only URLs under the crawl's base URL count.
+
+Usage:
+    # Show what a sync would fetch and delete, without fetching pages
+    python sitemap_sync.py https://v3.tauri.app/docs --output ./.tauri-docs
+
+    # Run it (crawl_docs.py fetches the new and changed pages, then deletes vanished ones)
+    python crawl_docs.py https://v3.tauri.app/docs --output ./.tauri-docs --sitemap
+"""
+
+import calendar
+import gzip
+import io
+import os
+import re
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+FRONTMATTER_HEAD_BYTES = 1024
+MAX_SITEMAPS = 200
+DATE_RE = re.compile(r"^(\d{4})-(\d{2})(?:-(\d{2}))?$")
+DATETIME_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+def default_sitemap_url(url: str) -> str:
+    """The conventional sitemap location for the site serving `url`."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
+
+
+def parse_lastmod(value: str | None) -> float | None:
+    """A W3C datetime <lastmod> as epoch seconds; dates mean the end of the day."""
+    if not value:
+        return None
+    value = value.strip()
+    match = DATE_RE.match(value)
+    if match:
+        year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3) or 1)
+        if not match.group(3):
+            # Year-month only: the end of the month
+            days = calendar.monthrange(year, month)[1]
+            return calendar.timegm((year, month, days, 23, 59, 59))
+        return calendar.timegm((year, month, day, 23, 59, 59))
+    match = DATETIME_RE.match(value)
+    if not match:
+        return None
+    year, month, day, hour, minute = (int(match.group(i)) for i in range(1, 6))
+    seconds = calendar.timegm((year, month, day, hour, minute, int(match.group(6) or 0)))
+    zone = match.group(7)
+    if zone and zone != "Z":
+        sign = 1 if zone[0] == "+" else -1
+        digits = zone[1:].replace(":", "")
+        seconds -= sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+    return seconds
+
+
+def parse_sitemap(data: bytes) -> tuple[list[tuple[str, str | None]], list[str]]:
+    """(page entries as (loc, lastmod), child sitemap URLs) from one sitemap document."""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    entries: list[tuple[str, str | None]] = []
+    children: list[str] = []
+    loc = lastmod = None
+    # iterparse keeps memory flat for 50k-URL sitemaps; tags are matched without their namespace
+    for event, elem in ElementTree.iterparse(io.BytesIO(data), events=("end",)):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag == "loc":
+            loc = (elem.text or "").strip()
+        elif tag == "lastmod":
+            lastmod = (elem.text or "").strip() or None
+        elif tag in ("url", "sitemap"):
+            if loc:
+                if tag == "url":
+                    entries.append((loc, lastmod))
+                else:
+                    children.append(loc)
+            loc = lastmod = None
+            elem.clear()
+    return entries, children
+
+
+def fetch_sitemap(url: str, timeout: float = 30.0) -> list[tuple[str, str | None]]:
+    """Every (loc, lastmod) in the sitemap at `url`, following sitemap indexes.
+
+    Raises ValueError if the index lists more than `MAX_SITEMAPS` sitemaps:
+    a partial list would make every page in the unread ones look vanished.
+    """
+    from urllib.request import Request, urlopen
+
+    entries: list[tuple[str, str | None]] = []
+    pending, fetched = [url], set()
+    while pending:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in fetched:
+            continue
+        if len(fetched) >= MAX_SITEMAPS:
+            raise ValueError(f"{url} lists more than {MAX_SITEMAPS} sitemaps; not syncing from a partial list")
+        fetched.add(sitemap_url)
+        request = Request(sitemap_url, headers={"User-Agent": "agents-md-generator sitemap sync"})
+        with urlopen(request, timeout=timeout) as resp:
+            data = resp.read()
+        found, children = parse_sitemap(data)
+        entries.extend(found)
+        pending.extend(urljoin(sitemap_url, child) for child in children)
+    return entries
+
+
+def read_page_stamp(md_path: str) -> tuple[str | None, float | None]:
+    """(source URL, crawled time) from a crawled page's frontmatter."""
+    try:
+        with open(md_path, "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(FRONTMATTER_HEAD_BYTES)
+    except OSError:
+        return None, None
+    if not head.startswith("---"):
+        return None, None
+    source = crawled = None
+    for line in head.split("\n")[1:]:
+        if line.strip() == "---":
+            break
+        if line.startswith("source:"):
+            source = line[len("source:"):].strip() or None
+        elif line.startswith("crawled:"):
+            crawled = parse_lastmod(line[len("crawled:"):].strip())
+    return source, crawled
+
+
+def local_pages(output_dir: str) -> dict[str, tuple[str, float]]:
+    """{canonical source URL: (relative path, crawled time)} for every crawled page in `output_dir`."""
+    from url_frontier import canonicalize_url
+
+    pages: dict[str, tuple[str, float]] = {}
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith(".") or not name.endswith((".md", ".mdx")):
+                continue
+            path = os.path.join(root, name)
+            source, crawled = read_page_stamp(path)
+            if not source:
+                continue
+            if crawled is None:
+                try:
+                    crawled = os.path.getmtime(path)
+                except OSError:
+                    continue
+            pages[canonicalize_url(source)] = (os.path.relpath(path, output_dir).replace(os.sep, "/"), crawled)
+    return pages
+
+
+class SyncPlan:
+    """Pages to fetch and delete for one sync."""
+
+    def __init__(self):
+        self.fetch: list[str] = []
+        self.delete: list[str] = []
+        self.new = 0
+        self.changed = 0
+        self.undated = 0
+        self.unchanged = 0
+        self.in_sitemap = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.in_sitemap} pages in sitemap: {self.new} new, {self.changed} changed, "
+            f"{self.undated} undated, {self.unchanged} unchanged; {len(self.delete)} vanished"
+        )
+
+
+def plan_sync(base_url: str, entries: list[tuple[str, str | None]], pages: dict[str, tuple[str, float]]) -> SyncPlan:
+    """Compare sitemap `entries` with local `pages` (see `local_pages`) for the crawl of `base_url`."""
+    from url_frontier import UrlFrontier, canonicalize_url
+
+    frontier = UrlFrontier(base_url)
+    plan = SyncPlan()
+    listed = set()
+    for loc, lastmod in entries:
+        canonical = canonicalize_url(loc)
+        if not frontier.in_scope(canonical) or canonical in listed:
+            continue
+        listed.add(canonical)
+        plan.in_sitemap += 1
+        local = pages.get(canonical)
+        modified = parse_lastmod(lastmod)
+        if local is None:
+            plan.new += 1
+        elif modified is None:
+            plan.undated += 1
+        elif modified > local[1]:
+            plan.changed += 1
+        else:
+            plan.unchanged += 1
+            continue
+        plan.fetch.append(loc)
+
+    plan.delete = sorted(
+        rel_path for canonical, (rel_path, _) in pages.items()
+        if canonical not in listed and frontier.in_scope(canonical)
+    )
+    return plan
+
+
+def delete_pages(output_dir: str, rel_paths: list[str]) -> int:
+    """Remove pages and any directories left empty; returns the number of pages removed."""
+    removed = 0
+    root = os.path.abspath(output_dir)
+    for rel_path in rel_paths:
+        path = os.path.join(root, rel_path)
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        removed += 1
+        directory = os.path.dirname(path)
+        while directory != root and directory.startswith(root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+    return removed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show what a sitemap-driven recrawl would fetch and delete")
+    parser.add_argument("url", help="Documentation URL the mirror was crawled from")
+    parser.add_argument("--output", "-o", required=True, help="Crawled docs directory")
+    parser.add_argument("--sitemap", default=None, help="Sitemap URL (default: <site>/sitemap.xml)")
+    parser.add_argument("--list", action="store_true", help="List every URL to fetch and page to delete")
+    args = parser.parse_args()
+
+    sitemap_url = args.sitemap or default_sitemap_url(args.url)
+    start = time.monotonic()
+    try:
+        entries = fetch_sitemap(sitemap_url)
+    except (OSError, ValueError, ElementTree.ParseError) as e:
+        print(f"❌ Could not read {sitemap_url}: {e}", file=sys.stderr)
+        sys.exit(1)
+    plan = plan_sync(args.url, entries, local_pages(args.output))
+    print(f"🗺  {sitemap_url} ({time.monotonic() - start:.2f}s)")
+    print(f"   {plan.summary()}")
+    if args.list:
+        for url in plan.fetch:
+            print(f"   fetch  {url}")
+        for rel_path in plan.delete:
+            print(f"   delete {rel_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Route a prompt to candidate skills using the trigger phrases in their descriptions.
+
+Skill descriptions list the requests they handle ("Triggers on: "AI SDK",
+"streamText", ..." or "Triggers on tasks involving React Native, Expo, ...").
+Those phrases, plus each skill's name, are compiled into one Aho-Corasick
+automaton, so a prompt is matched against every phrase of every skill in a
+single pass over its characters. The compiled automaton is saved as JSON next
+to the generated index and loaded without rebuilding.
+
+Usage:
+    # Compile triggers from skills directories
+    python trigger_matcher.py build --skills-dir ./skills --output AGENTS.triggers.json
+
+    # Match a prompt (or read it from stdin)
+    python trigger_matcher.py match AGENTS.triggers.json "add streamText to my route handler"
+
+    # Show the phrases extracted for each skill
+    python trigger_matcher.py list AGENTS.triggers.json
+"""
+
+import json
+import re
+import sys
+
+TRIGGER_CLAUSE_RE = re.compile(
+    r"\btriggers?\s+(?:include|on)\b\s*(?:requests\s+to\s+|tasks\s+involving\s+)?:?\s*(.+?)(?:\.(?:\s|$)|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+QUOTED_RE = re.compile(r"[\"“]([^\"”]+)[\"”]")
+CONNECTIVE_RE = re.compile(r"^(?:(?:or|and|the|e\.g\.)\s+)+", re.IGNORECASE)
+MAX_PHRASE_WORDS = 5
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def extract_triggers(description: str) -> list[str]:
+    """Extract trigger phrases from a skill description.
+
+    Every quoted phrase counts, as do the comma-separated items of a
+    "Triggers on ..." / "Triggers include ..." clause. Unquoted items are
+    stripped of leading connectives and skipped when they run past a few
+    words ("any task requiring ..."). Phrases are lowercased and deduplicated.
+    """
+    phrases = [m.group(1) for m in QUOTED_RE.finditer(description)]
+
+    clause = TRIGGER_CLAUSE_RE.search(description)
+    if clause:
+        # Items holding a quote were already taken whole from the quotes
+        for item in QUOTED_RE.sub("\0", clause.group(1)).split(","):
+            item = CONNECTIVE_RE.sub("", item.strip()).strip(" .;:")
+            if item and "\0" not in item and len(item.split()) <= MAX_PHRASE_WORDS and not item.lower().startswith("any "):
+                phrases.append(item)
+
+    seen = []
+    for phrase in phrases:
+        phrase = normalize(phrase).strip(" .")
+        if len(phrase) >= 3 and phrase not in seen:
+            seen.append(phrase)
+    return seen
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class TriggerMatcher:
+    """Aho-Corasick automaton mapping trigger phrases to the skills that declare them."""
+
+    def __init__(self, phrases: list[str], skills: list[list[str]]):
+        self.phrases = phrases
+        self.skills = skills
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[int]] = [[]]
+        self._build()
+
+    @classmethod
+    def from_skills(cls, skills: list[dict]) -> "TriggerMatcher":
+        """Compile from `scan_skills` results (their ``name`` and ``triggers``)."""
+        by_phrase: dict[str, list[str]] = {}
+        for skill in skills:
+            names = {normalize(skill["name"]), normalize(skill["name"].replace("-", " "))}
+            for phrase in sorted(names) + list(skill.get("triggers", [])):
+                owners = by_phrase.setdefault(phrase, [])
+                if skill["name"] not in owners:
+                    owners.append(skill["name"])
+        phrases = sorted(by_phrase)
+        return cls(phrases, [by_phrase[p] for p in phrases])
+
+    def _build(self):
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = nxt
+                state = nxt
+            self.out[state].append(index)
+
+        # Breadth-first, so every fail target is finished before it is used
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> list[tuple[int, int]]:
+        """Return (end offset, phrase index) for every whole-word phrase occurrence in `text`."""
+        text = normalize(text)
+        hits = []
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for index in self.out[state]:
+                phrase = self.phrases[index]
+                start = pos + 1 - len(phrase)
+                end = pos + 1
+                if _is_word_char(phrase[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(phrase[-1]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+                hits.append((end, index))
+        return hits
+
+    def match(self, text: str, limit: int | None = None) -> list[dict]:
+        """Rank skills whose trigger phrases occur in `text`.
+
+        Skills are ordered by the total length of distinct phrases matched, so a
+        specific phrase ("vercel ai sdk") outweighs a generic one ("react").
+
+        Returns:
+            list of {"skill", "score", "phrases"}
+        """
+        found: dict[str, set[str]] = {}
+        for _, index in self.find(text):
+            for skill in self.skills[index]:
+                found.setdefault(skill, set()).add(self.phrases[index])
+        ranked = [
+            {"skill": skill, "score": sum(len(p) for p in phrases), "phrases": sorted(phrases)}
+            for skill, phrases in found.items()
+        ]
+        ranked.sort(key=lambda r: (-r["score"], r["skill"]))
+        return ranked[:limit] if limit else ranked
+
+    # -- persistence ------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "phrases": self.phrases,
+            "skills": self.skills,
+            "goto": self.goto,
+            "fail": self.fail,
+            "out": self.out,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TriggerMatcher":
+        """Restore a compiled automaton without rebuilding it."""
+        if data.get("version") != 1:
+            raise ValueError(f"Unsupported trigger file version: {data.get('version')}")
+        matcher = cls.__new__(cls)
+        matcher.phrases = data["phrases"]
+        matcher.skills = data["skills"]
+        matcher.goto = data["goto"]
+        matcher.fail = data["fail"]
+        matcher.out = data["out"]
+        return matcher
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "TriggerMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile skill trigger phrases and match prompts against them")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="Compile triggers from skills directories")
+    p.add_argument("--skills-dir", "-s", action="append", required=True, help="Skills directory (repeatable)")
+    p.add_argument("--output", "-o", required=True, help="Compiled trigger file (JSON)")
+
+    p = sub.add_parser("match", help="Rank skills for a prompt")
+    p.add_argument("triggers", help="Compiled trigger file")
+    p.add_argument("prompt", nargs="?", help="Prompt text (default: stdin)")
+    p.add_argument("--limit", "-n", type=int, default=5, help="Maximum candidates (default: 5)")
+    p.add_argument("--json", action="store_true", help="Print candidates as JSON")
+
+    p = sub.add_parser("list", help="List trigger phrases per skill")
+    p.add_argument("triggers", help="Compiled trigger file")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from generate_agents_md import scan_skills
+
+        skills = []
+        for sd in args.skills_dir:
+            skills.extend(scan_skills(sd))
+        matcher = TriggerMatcher.from_skills(skills)
+        matcher.save(args.output)
+        print(f"✅ Compiled {len(matcher.phrases)} phrases from {len(skills)} skills into {args.output}")
+        return
+
+    try:
+        matcher = TriggerMatcher.load(args.triggers)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot load {args.triggers}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "list":
+        by_skill: dict[str, list[str]] = {}
+        for phrase, owners in zip(matcher.phrases, matcher.skills):
+            for skill in owners:
+                by_skill.setdefault(skill, []).append(phrase)
+        for skill in sorted(by_skill):
+            print(f"{skill}: {', '.join(by_skill[skill])}")
+        return
+
+    prompt = args.prompt if args.prompt is not None else sys.stdin.read()
+    candidates = matcher.match(prompt, args.limit)
+    if args.json:
+        print(json.dumps(candidates))
+    else:
+        for c in candidates:
+            print(f"{c['skill']}\t{c['score']}\t{', '.join(c['phrases'])}")
+    sys.exit(0 if candidates else 1)
+
+
+if __name__ == "__main__":
+    main()
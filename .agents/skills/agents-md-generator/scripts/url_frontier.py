@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+URL frontier for crawls: canonical URLs, a compact seen-set and local-path claims.
+
+- `canonicalize_url` folds the variants a docs site links to the same page
+  under: scheme/host case, default ports, fragments, trailing slashes,
+  duplicate slashes, query-parameter order and ``utm_*`` tracking parameters.
+- `SeenSet` keeps canonical URLs in an exact set while it is small, then
+  moves to a scalable Bloom filter (a chain of filters, each twice the size of
+  the last) so millions of URLs fit in a few MB at a fixed false-positive rate.
+- `UrlFrontier` scopes URLs to the crawl, tracks the ones seen and maps each one
+  to the local path `organize_crawl_results` would write (via
+  `crawl_docs.sanitize_filename`).
+  `claim` reports a second, distinct URL that would land on an already claimed
+  path before anything is written, instead of one page silently overwriting another.
+
+Usage:
+    # Canonicalize URLs
+    python url_frontier.py canonicalize "HTTPS://Docs.Example.com:443/docs/a/?b=2&a=1#x"
+
+    # Find duplicate URLs and path collisions in a URL list (one per line) or Firecrawl JSON
+    python url_frontier.py check urls.txt --base https://docs.example.com/docs
+"""
+
+import hashlib
+import math
+import re
+import sys
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlparse, urlunparse
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAM_RE = re.compile(r"^(utm_\w+|gclid|fbclid)$")
+# Characters that never need percent-encoding in a path
+UNRESERVED_SAFE = "/-._~!$&'()*+,;=:@"
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of an http(s) URL; other URLs are returned stripped of whitespace."""
+    url = url.strip()
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return url
+
+    host = parsed.hostname.lower().rstrip(".")
+    if parsed.port and parsed.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parsed.port}"
+
+    # Decode what doesn't need encoding and re-encode the rest consistently
+    path = quote(unquote(parsed.path), safe=UNRESERVED_SAFE)
+    path = re.sub(r"/{2,}", "/", path)
+    if path.endswith("/") and path != "/":
+        path = path.rstrip("/")
+    if not path:
+        path = "/"
+
+    params = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not TRACKING_PARAM_RE.match(k)]
+    query = urlencode(sorted(params))
+
+    return urlunparse((scheme, host, path, "", query, ""))
+
+
+def _hash_pair(item: str) -> tuple[int, int]:
+    """Two 64-bit hashes of `item`; every Bloom filter derives its bit positions from these."""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, pair: tuple[int, int]):
+        # Double hashing: k positions from one pair of hashes
+        h1, h2 = pair
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, item: str, pair: tuple[int, int] | None = None) -> bool:
+        """Set the bits for `item`; returns False if they were all set already."""
+        bits = self.bits
+        new = False
+        for pos in self._positions(pair or _hash_pair(item)):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def contains(self, item: str, pair: tuple[int, int] | None = None) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(pair or _hash_pair(item)))
+
+    def __contains__(self, item: str) -> bool:
+        return self.contains(item)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class SeenSet:
+    """Set of strings that is exact up to `exact_limit` items, then a scalable Bloom filter.
+
+    Once the exact set fills, its items move into a Bloom filter. Whenever the
+    current filter reaches its capacity a new one twice the size is chained on,
+    each with a tighter error rate, so the overall false-positive rate stays
+    under `error_rate`. A false positive makes an unseen URL look seen, so it
+    would be skipped, never fetched twice.
+    """
+
+    def __init__(self, exact_limit: int = 100_000, error_rate: float = 1e-6):
+        self.exact_limit = exact_limit
+        self.error_rate = error_rate
+        self._exact: set[str] | None = set()
+        self._filters: list[BloomFilter] = []
+        self._count = 0
+
+    def _grow(self):
+        capacity = self._filters[-1].capacity * 2 if self._filters else max(self.exact_limit * 4, 1024)
+        # Halving each filter's share keeps the sum of error rates below error_rate
+        rate = self.error_rate / 2 ** (len(self._filters) + 1)
+        self._filters.append(BloomFilter(capacity, rate))
+
+    def add(self, item: str) -> bool:
+        """Add `item`; returns False if it was (probably) already present."""
+        if self._exact is not None:
+            if item in self._exact:
+                return False
+            self._exact.add(item)
+            self._count += 1
+            if len(self._exact) > self.exact_limit:
+                exact, self._exact = self._exact, None
+                self._grow()
+                for seen in exact:
+                    self._filters[-1].add(seen)
+            return True
+
+        pair = _hash_pair(item)
+        if any(f.contains(item, pair) for f in self._filters[:-1]):
+            return False
+        if self._filters[-1].count >= self._filters[-1].capacity:
+            if self._filters[-1].contains(item, pair):
+                return False
+            self._grow()
+        # Test-and-set in one pass over the newest filter
+        if not self._filters[-1].add(item, pair):
+            return False
+        self._count += 1
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        if self._exact is not None:
+            return item in self._exact
+        pair = _hash_pair(item)
+        return any(f.contains(item, pair) for f in self._filters)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def exact(self) -> bool:
+        return self._exact is not None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(f.nbytes for f in self._filters)
+
+
+class UrlFrontier:
+    """Scope, seen-set and local path claims for the canonical URLs of a crawl of `base_url`."""
+
+    def __init__(self, base_url: str, exact_limit: int = 100_000, error_rate: float = 1e-6):
+        base = urlparse(canonicalize_url(base_url))
+        self.host = base.netloc
+        self.base_path = base.path.rstrip("/")
+        self.seen = SeenSet(exact_limit, error_rate)
+        # Local path -> first canonical URL written there; bounded by pages written, so exact
+        self.claims: dict[str, str] = {}
+
+    def in_scope(self, canonical: str) -> bool:
+        parsed = urlparse(canonical)
+        if parsed.netloc != self.host:
+            return False
+        return not self.base_path or parsed.path == self.base_path or parsed.path.startswith(self.base_path + "/")
+
+    def local_path(self, url: str) -> str:
+        """Relative file path `organize_crawl_results` writes the page at `url` to."""
+        from crawl_docs import sanitize_filename
+
+        # Canonical first, so the prefix matches base_path however the URL spells it
+        rel_path = urlparse(canonicalize_url(url)).path
+        if rel_path == self.base_path or rel_path.startswith(self.base_path + "/"):
+            rel_path = rel_path[len(self.base_path):]
+        filepath = sanitize_filename(rel_path)
+        return "index.md" if not filepath or filepath == ".md" else filepath
+
+    def claim(self, url: str) -> tuple[str, str | None]:
+        """Claim the local path for `url`.
+
+        Returns:
+            tuple: (local path, canonical URL that already holds it, or None if
+            the path is free or already belongs to this same canonical URL)
+        """
+        canonical = canonicalize_url(url)
+        path = self.local_path(url)
+        owner = self.claims.setdefault(path, canonical)
+        return path, (owner if owner != canonical else None)
+
+
+def _read_urls(path: str) -> list[str]:
+    import json
+
+    with (sys.stdin if path == "-" else open(path, "r", encoding="utf-8")) as f:
+        text = f.read()
+    if text.lstrip().startswith(("[", "{")):
+        from crawl_docs import _page_url
+
+        data = json.loads(text)
+        pages = data if isinstance(data, list) else data.get("data", [])
+        return [u for u in (_page_url(p) for p in pages) if u]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Canonicalize crawl URLs and find local path collisions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    canon = sub.add_parser("canonicalize", help="Print the canonical form of each URL")
+    canon.add_argument("urls", nargs="+")
+    check = sub.add_parser("check", help="Report duplicate URLs and path collisions in a URL list or Firecrawl JSON")
+    check.add_argument("file", help="URL list (one per line), Firecrawl JSON, or - for stdin")
+    check.add_argument("--base", required=True, help="Base URL the crawl was started from")
+    args = parser.parse_args()
+
+    if args.command == "canonicalize":
+        for url in args.urls:
+            print(canonicalize_url(url))
+        return
+
+    frontier = UrlFrontier(args.base)
+    urls = _read_urls(args.file)
+    duplicates = out_of_scope = 0
+    collisions = []
+    for url in urls:
+        canonical = canonicalize_url(url)
+        if not frontier.in_scope(canonical):
+            out_of_scope += 1
+            continue
+        if not frontier.seen.add(canonical):
+            duplicates += 1
+            continue
+        path, owner = frontier.claim(url)
+        if owner:
+            collisions.append((path, owner, canonical))
+
+    print(f"🔗 {len(urls)} URLs: {len(frontier.seen)} unique, {duplicates} duplicates, "
+          f"{out_of_scope} out of scope, {len(collisions)} path collisions")
+    for path, owner, canonical in collisions:
+        print(f"   {path}: {owner} ≠ {canonical}")
+    sys.exit(1 if collisions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import json
+import sys
+import zipfile
+
+from cli import SKILL_CREATOR_DIR
+
+sys.path.insert(0, SKILL_CREATOR_DIR)
+from apply_skill_delta import apply_skill_delta
+from package_skill import DELTA_MANIFEST, package_delta
+
+
+def write_skill(path, files):
+    with zipfile.ZipFile(path, "w") as zipf:
+        for name, data in files.items():
+            zipf.writestr(f"demo/{name}", data)
+
+
+def members(path):
+    with zipfile.ZipFile(path) as zipf:
+        return {info.filename: zipf.read(info) for info in zipf.infolist()}
+
+
+V1 = {"SKILL.md": "v1", "kept.md": "same", "gone.md": "old"}
+V2 = {"SKILL.md": "v2", "kept.md": "same", "new.md": "added"}
+
+
+def test_round_trip_rebuilds_new_release(tmp_path):
+    write_skill(tmp_path / "v1.skill", V1)
+    write_skill(tmp_path / "v2.skill", V2)
+    delta, _, _ = package_delta(tmp_path / "v1.skill", tmp_path / "v2.skill")
+
+    ok, message = apply_skill_delta(tmp_path / "v1.skill", delta, tmp_path / "out.skill")
+
+    assert ok, message
+    assert members(tmp_path / "out.skill") == members(tmp_path / "v2.skill")
+
+
+def test_wrong_base_is_rejected(tmp_path):
+    write_skill(tmp_path / "v1.skill", V1)
+    write_skill(tmp_path / "v2.skill", V2)
+    write_skill(tmp_path / "other.skill", {**V1, "kept.md": "different"})
+    delta, _, _ = package_delta(tmp_path / "v1.skill", tmp_path / "v2.skill")
+
+    ok, message = apply_skill_delta(tmp_path / "other.skill", delta, tmp_path / "out.skill")
+
+    assert not ok and "wrong base" in message
+    assert not (tmp_path / "out.skill").exists()
+
+
+def test_missing_member_in_delta_is_an_error(tmp_path):
+    write_skill(tmp_path / "v1.skill", V1)
+    manifest = {"format": 1, "changed": ["demo/new.md"], "deleted": [], "members": {"demo/new.md": "0" * 64}}
+    with zipfile.ZipFile(tmp_path / "bad.skill-delta", "w") as zipf:
+        zipf.writestr(DELTA_MANIFEST, json.dumps(manifest))
+
+    ok, message = apply_skill_delta(tmp_path / "v1.skill", tmp_path / "bad.skill-delta", tmp_path / "out.skill")
+
+    assert not ok and message.startswith("Could not apply delta")
+    assert not list(tmp_path.glob(".out.skill.*"))
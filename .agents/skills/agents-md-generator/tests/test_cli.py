@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cli import COMMANDS, DEFAULT_BUDGET_MS, import_time_us
+
+CLI = os.path.join(os.path.dirname(__file__), "..", "scripts", "cli.py")
+
+
+@pytest.mark.parametrize("command", list(COMMANDS))
+def test_command_imports_within_budget(command):
+    scripts_dir, module, _ = COMMANDS[command]
+    try:
+        # Best of three, as check-startup does, so a cold disk cache doesn't fail the test
+        best_ms = min(import_time_us(scripts_dir, module) for _ in range(3)) / 1000
+    except RuntimeError as e:
+        pytest.skip(f"{module} does not import here: {e}")
+    assert best_ms <= DEFAULT_BUDGET_MS
+
+
+@pytest.mark.parametrize("budget", ["abc", "0", "-5", "nan"])
+def test_check_startup_rejects_bad_budget(budget):
+    result = subprocess.run([sys.executable, CLI, "check-startup", "--budget-ms", budget],
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "Usage:" in result.stderr
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,108 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from compress_docs import compress_sharded, plan_aliases, render_dir_line, render_listing
+from doc_tree import DocTree
+from docs_pack import PackWriter
+
+COMPRESS_DOCS = os.path.join(os.path.dirname(__file__), "..", "scripts", "compress_docs.py")
+
+
+def test_size_report_keeps_pack_titles_with_heading_index(tmp_path):
+    pack = tmp_path / "docs.dpk"
+    with PackWriter(str(pack)) as writer:
+        writer.add("guide/intro.md", "# Intro\n## Setup\n", "Intro")
+    output = tmp_path / "index.md"
+
+    result = subprocess.run(
+        [sys.executable, COMPRESS_DOCS, str(pack), "Docs", "--extract-titles", "--heading-index",
+         "--size-report", "-o", str(output)],
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "|guide:{intro.md:Intro}" in output.read_text()
+
+
+@pytest.mark.parametrize("probes", ["0", "1", "-5"])
+def test_estimate_rejects_too_few_probes(tmp_path, probes):
+    (tmp_path / "a.md").write_text("# A\n")
+    result = subprocess.run([sys.executable, COMPRESS_DOCS, str(tmp_path), "Docs", "--estimate", probes],
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "at least 2 probes" in result.stderr
+
+
+def make_docs(root):
+    """A small tree, a directory too big for one shard, and long titles with several headings per page."""
+    pages = {"intro.md": "# Intro\n"}
+    for section in range(6):
+        for page in range(4):
+            pages[f"guide/s{section}/page-{page}.md"] = f"# Guide {section}.{page}\n## Setup\n## Usage\n"
+    for page in range(60):
+        pages[f"reference/api/function-with-a-long-name-{page:03d}.md"] = f"# {'Reference ' * 8}{page}\n## Args\n"
+    for rel_path, text in pages.items():
+        (root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel_path).write_text(text)
+    return pages
+
+
+@pytest.mark.parametrize("heading_index", [False, True])
+def test_shards_stay_within_budget_and_list_every_file_once(tmp_path, heading_index):
+    docs, shards = tmp_path / "docs", tmp_path / "shards"
+    pages = make_docs(docs)
+
+    index, stats = compress_sharded(str(docs), "Docs", str(shards), shard_bytes=1024,
+                                    extract_titles=True, heading_index=heading_index)
+
+    files = sorted(os.listdir(shards))
+    assert stats["shard_count"] == len(files) > 2
+    assert any(re.search(r"-\d+\.md$", name) for name in files), "the reference directory should split into parts"
+    listed = []
+    for name in files:
+        content = (shards / name).read_text()
+        assert len(content.encode("utf-8")) <= 1024, name
+        for line in content.splitlines()[1:]:
+            match = re.match(r"\|([^:#]+):\{(.*)\}$", line)
+            if match:
+                root = "" if match[1] == "root" else match[1] + "/"
+                listed.extend(root + entry.split(":", 1)[0] for entry in match[2].split(","))
+        assert content.startswith("[Docs]|root: ")
+    assert sorted(listed) == sorted(pages)
+    assert stats["largest_shard_bytes"] <= 1024
+
+
+def test_dedupe_aliases_topmost_copies_and_expands_back():
+    tree = DocTree()
+    for version in ("v1", "v2"):
+        tree.add_files(tree.add_dir(version), ["index.md"], [1])
+        tree.add_files(tree.add_dir(f"{version}/guide"), ["a.md", "b.md"], [1, 1])
+    # Same guide/ as v1/guide, but under a parent that differs
+    tree.add_files(tree.add_dir("v3/guide"), ["a.md", "b.md"], [1, 1])
+    tree.add_files(tree.add_dir("v3"), ["changelog.md"], [1])
+    # Too small to be worth an alias
+    tree.add_files(tree.add_dir("x/one"), ["only.md"], [1])
+    tree.add_files(tree.add_dir("y/one"), ["only.md"], [1])
+
+    aliases = {tree.dir_path(a): tree.dir_path(c) for a, c in plan_aliases(tree).items()}
+    assert aliases == {"v2": "v1", "v3/guide": "v1/guide"}
+
+    lines = render_listing(tree, plan_aliases(tree))
+    assert "|v2/**=v1/**" in lines and "|v3/guide/**=v1/guide/**" in lines
+
+    # Swapping each alias prefix back in reproduces the full listing
+    expanded = []
+    for line in lines[1:]:
+        if "/**=" in line:
+            alias, canonical = line[1:-3].split("/**=")
+            expanded.extend(
+                other.replace(f"|{canonical}", f"|{alias}", 1) for other in render_listing(tree)
+                if other.startswith((f"|{canonical}:", f"|{canonical}/"))
+            )
+        else:
+            expanded.append(line)
+    assert sorted(expanded) == sorted(render_dir_line(tree, d) for d in tree.dirs())
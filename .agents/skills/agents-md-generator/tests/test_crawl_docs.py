@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from crawl_docs import crawl_with_firecrawl, load_checkpoint
+from docs_pack import DocsPack
+
+BASE = "https://docs.example.com/docs"
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "scripts")
+
+
+def page(path):
+    return {"markdown": f"# {path}\n", "metadata": {"sourceURL": f"{BASE}/{path}"}}
+
+
+class FakeApp:
+    """Firecrawl stand-in: each job replays a list of status responses, one per poll."""
+
+    def __init__(self, jobs, expired=()):
+        self.jobs = {job_id: list(polls) for job_id, polls in jobs.items()}
+        self.expired = set(expired)
+        self.started = []
+
+    def async_crawl_url(self, url, params=None):
+        job_id = f"job-{len(self.started) + 1}"
+        self.started.append(job_id)
+        return {"id": job_id}
+
+    def check_crawl_status(self, job_id):
+        if job_id in self.expired:
+            raise RuntimeError("job not found")
+        polls = self.jobs[job_id]
+        status = polls.pop(0) if len(polls) > 1 else polls[0]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+
+def crawl(app, checkpoint_path):
+    batches = []
+    crawl_with_firecrawl(BASE, on_batch=batches.append, checkpoint_path=str(checkpoint_path),
+                         app=app, min_poll=0, max_poll=0)
+    return [p["metadata"]["sourceURL"].rsplit("/", 1)[1] for batch in batches for p in batch]
+
+
+def write_checkpoint(path, job_id, seen):
+    path.write_text(json.dumps({"url": BASE, "job_id": job_id, "seen": [f"{BASE}/{p}" for p in seen]}))
+
+
+def test_streams_pages_once_and_removes_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    app = FakeApp({"job-1": [
+        {"status": "scraping", "data": [page("a"), page("b")]},
+        {"status": "scraping", "data": [page("b")]},
+        {"status": "completed", "data": [page("a"), page("c")]},
+    ]})
+    assert crawl(app, checkpoint) == ["a", "b", "c"]
+    assert not checkpoint.exists()
+
+
+def test_resume_polls_saved_job_and_skips_seen_pages(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    write_checkpoint(checkpoint, "job-7", ["a"])
+    app = FakeApp({"job-7": [{"status": "completed", "data": [page("a"), page("b")]}]})
+    assert crawl(app, checkpoint) == ["b"]
+    assert app.started == []
+
+
+def test_expired_job_starts_new_crawl_and_skips_seen_pages(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    write_checkpoint(checkpoint, "job-old", ["a"])
+    app = FakeApp({"job-1": [{"status": "completed", "data": [page("a"), page("b")]}]}, expired={"job-old"})
+    assert crawl(app, checkpoint) == ["b"]
+    assert app.started == ["job-1"]
+
+
+def test_resumed_job_retries_transient_errors_after_first_poll(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    write_checkpoint(checkpoint, "job-7", ["a"])
+    app = FakeApp({"job-7": [
+        {"status": "scraping", "data": [page("b")]},
+        ConnectionError("reset"),
+        {"status": "completed", "data": [page("c")]},
+    ]})
+    assert crawl(app, checkpoint) == ["b", "c"]
+    assert app.started == []
+
+
+def test_failed_job_clears_job_id_but_keeps_seen(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    app = FakeApp({"job-1": [
+        {"status": "scraping", "data": [page("a")]},
+        {"status": "failed", "data": []},
+    ]})
+    with pytest.raises(SystemExit):
+        crawl(app, checkpoint)
+    saved = load_checkpoint(str(checkpoint), BASE)
+    assert saved["job_id"] is None
+    assert saved["seen"] == [f"{BASE}/a"]
+
+    # The rerun starts a fresh job instead of polling the failed one
+    app.jobs["job-2"] = [{"status": "completed", "data": [page("a"), page("b")]}]
+    assert crawl(app, checkpoint) == ["b"]
+    assert app.started == ["job-1", "job-2"]
+
+
+@pytest.mark.parametrize("use_pack", [False, True])
+def test_from_json_strips_boilerplate_from_every_page(tmp_path, use_pack):
+    nav = "[Home](/) · [Guides](/guides)"
+    data = [{"markdown": f"# Page {i}\n\n{nav}\n\nBody {i}.\n", "metadata": {"sourceURL": f"{BASE}/p{i}"}}
+            for i in range(8)]
+    (tmp_path / "pages.json").write_text(json.dumps(data))
+    output = tmp_path / "docs"
+    cmd = [sys.executable, os.path.join(SCRIPTS, "crawl_docs.py"), BASE, "--output", str(output),
+           "--from-json", str(tmp_path / "pages.json"), "--normalize", "boilerplate"]
+    if use_pack:
+        cmd += ["--pack", str(tmp_path / "docs.dpk")]
+    subprocess.run(cmd, check=True, capture_output=True)
+
+    if use_pack:
+        with DocsPack(str(tmp_path / "docs.dpk")) as pack:
+            texts = [pack.read(path) for path, *_ in pack.entries()]
+    else:
+        texts = [p.read_text() for p in sorted(output.glob("*.md"))]
+    assert len(texts) == 8
+    for text in texts:
+        assert nav not in text
+        assert text.startswith("---\ntitle:") and "source: " in text and "# Page" in text
+
+
+def test_sitemap_sync_skips_boilerplate_stage(tmp_path):
+    cmd = [sys.executable, os.path.join(SCRIPTS, "crawl_docs.py"), BASE, "--output", str(tmp_path / "docs"),
+           "--sitemap", "http://127.0.0.1:1/sitemap.xml", "--normalize", "boilerplate,whitespace"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    # The sitemap is unreachable, so the sync stops right after stages are set up
+    assert result.returncode == 1
+    assert "--sitemap skips the boilerplate stage" in result.stdout
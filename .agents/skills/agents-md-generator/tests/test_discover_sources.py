@@ -0,0 +1,26 @@
+import os
+
+from discover_sources import discover_sources, docs_root_for
+
+
+def write_page(path, url):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f'---\ntitle: "T"\nsource: {url}\n---\n\n# T\n')
+
+
+def test_root_named_like_the_base_url_segment(tmp_path):
+    # https://x.com/docs crawled into ./docs: the walk must stop at docs/, not its parent
+    docs = tmp_path / "docs"
+    write_page(docs / "index.md", "https://x.com/docs")
+    write_page(docs / "guides" / "a.md", "https://x.com/docs/guides/a")
+    assert docs_root_for(str(docs / "index.md"), "https://x.com/docs") == (str(docs), "x.com/docs")
+    assert docs_root_for(str(docs / "guides" / "a.md"), "https://x.com/docs/guides/a") == (str(docs), "x.com/docs")
+
+
+def test_paths_stay_relative_to_the_scan_root(tmp_path, monkeypatch):
+    write_page(tmp_path / "pkg" / "docs" / "index.md", "https://x.com/docs")
+    (tmp_path / "pkg" / "package.json").write_text('{"name": "pkg"}')
+    monkeypatch.chdir(tmp_path)
+    found = discover_sources("pkg")
+    assert found["docs"] == [(os.path.join("pkg", "docs"), "x.com/docs")]
+    assert list(found["packages"]) == ["pkg"]
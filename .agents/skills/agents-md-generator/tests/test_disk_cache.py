@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from disk_cache import DiskCache
+
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "scripts")
+
+
+def test_stamp_mismatch_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("titles", "a.md", "A", stamp=[1, 2])
+    assert cache.get("titles", "a.md", [1, 2]) == "A"
+    assert cache.get("titles", "a.md", [1, 3]) is None
+    assert cache.get("titles", "b.md", [1, 2]) is None
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for i, key in enumerate("abcd"):
+        cache.put("ns", key, "x" * 100)
+        # Spread the mtimes out so the order is unambiguous
+        os.utime(cache._path("ns", key), (1000 + i, 1000 + i))
+    entry_size = os.path.getsize(cache._path("ns", "a"))
+
+    # A hit refreshes "a", so "b" and "c" are now the oldest
+    assert cache.get("ns", "a") == "x" * 100
+    removed, freed = cache.prune(max_bytes=2 * entry_size)
+
+    assert (removed, freed) == (2, 2 * entry_size)
+    assert [cache.get("ns", k) is not None for k in "abcd"] == [True, False, False, True]
+
+
+def test_put_evicts_once_past_the_cap(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=4096)
+    for i in range(200):
+        cache.put("ns", f"key-{i}", "x" * 100)
+    # Eviction runs every max_bytes/16 written, so the cache overshoots by at most that much
+    entry_size = os.path.getsize(cache._path("ns", "key-199"))
+    assert cache.stats()["total_bytes"] <= 4096 + 4096 // 16 + entry_size
+    assert cache.get("ns", "key-199") is not None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock is POSIX only")
+def test_prune_waits_for_a_writer_holding_the_lock(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("ns", "a", "value")
+    # Another process holds the shared writer lock for a moment
+    holder = subprocess.Popen([sys.executable, "-c", f"""
+import sys, time
+sys.path.insert(0, {SCRIPTS!r})
+from disk_cache import _locked
+with _locked({os.path.join(str(tmp_path), ".lock")!r}, exclusive=False):
+    print("locked", flush=True)
+    time.sleep(0.5)
+"""], stdout=subprocess.PIPE, text=True)
+    assert holder.stdout.readline().strip() == "locked"
+
+    start = time.monotonic()
+    cache.prune(max_bytes=0)
+    waited = time.monotonic() - start
+    holder.wait()
+
+    assert waited >= 0.3
+    assert cache.get("ns", "a") is None
+
+
+def test_stale_temp_files_are_removed(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("ns", "a", "value")
+    tmp = cache._path("ns", "a") + ".123-456.tmp"
+    with open(tmp, "w") as f:
+        f.write("partial")
+    os.utime(tmp, (0, 0))
+
+    assert cache.stats()["namespaces"]["ns"]["entries"] == 1
+    assert not os.path.exists(tmp)
@@ -0,0 +1,77 @@
+from doc_tree import DocTree
+
+
+def test_names_are_interned_once():
+    tree = DocTree()
+    tree.add_files(tree.add_dir("api/v1"), ["index.md", "guide.md"], [1, 2])
+    tree.add_files(tree.add_dir("api/v2"), ["index.md", "guide.md"], [3, 4])
+    for file_id in range(tree.file_count):
+        tree.set_title(file_id, "Guide")
+
+    # Each distinct name, directory component and title is stored once
+    assert len(tree._buf) == len("apiv1index.mdguide.mdv2Guide")
+    assert tree.intern("index.md") == tree._file_name[0] == tree._file_name[2]
+    assert [tree.file_title(f) for f in range(4)] == ["Guide"] * 4
+
+
+def test_hash_collisions_keep_strings_apart(monkeypatch):
+    # Every string lands in the same hash bucket
+    monkeypatch.setattr("builtins.hash", lambda s: 0)
+    tree = DocTree()
+
+    ids = [tree.intern(s) for s in ("a", "b.md", "c.md")]
+    assert len(set(ids)) == 3
+    assert [tree.intern(s) for s in ("a", "b.md", "c.md")] == ids
+    assert [tree.string(sid) for sid in ids] == ["a", "b.md", "c.md"]
+
+    tree.add_files(tree.add_dir("a"), ["b.md", "c.md"], [1, 2])
+    assert tree.find_file("a/c.md") == 1
+    assert tree.find_dir("b.md") is None
+
+
+def test_paths_and_find_file():
+    tree = DocTree()
+    ids = tree.add_files(tree.add_dir("guide/start"), ["a.md", "b.md", "c.md"], [10, 20, 30], [1, 2, 3])
+    tree.add_files(tree.add_dir(""), ["README.md"], [5])
+
+    assert [tree.dir_path(d) for d in tree.dirs()] == ["", "guide/start"]
+    assert tree.dir_path(tree.parent(tree.find_dir("guide/start"))) == "guide"
+    assert tree.find_file("guide/start/b.md") == ids[1]
+    assert tree.file_size(ids[1]) == 20 and tree.file_mtime(ids[2]) == 3
+    assert tree.find_file("README.md") == ids[-1] + 1
+    assert tree.find_file("guide/start/d.md") is None
+    assert tree.find_file("guide/a.md") is None
+    assert tree.find_file("other/a.md") is None
+    assert (tree.file_count, tree.dir_count, tree.total_size) == (4, 2, 65)
+
+
+def versioned_tree(v2_files=("a.md", "b.md")):
+    tree = DocTree()
+    for version, files in (("v1", ("a.md", "b.md")), ("v2", v2_files)):
+        tree.add_files(tree.add_dir(version), ["index.md"], [1])
+        tree.add_files(tree.add_dir(f"{version}/guide"), list(files), [1] * len(files))
+    tree.add_files(tree.add_dir("v3/guide"), ["a.md", "b.md"], [1, 1])
+    return tree
+
+
+def test_identical_subtrees_share_a_class():
+    tree = versioned_tree()
+    classes, counts = tree.subtree_classes()
+    v1, v2, v3 = (tree.find_dir(p) for p in ("v1", "v2", "v3"))
+
+    assert classes[v1] == classes[v2]
+    assert classes[tree.find_dir("v1/guide")] == classes[tree.find_dir("v3/guide")]
+    # v3 has the same guide/ but no index.md of its own
+    assert classes[v3] != classes[v1]
+    assert (counts[v1], counts[v3], counts[DocTree.ROOT]) == (3, 2, 8)
+
+
+def test_subtree_classes_tell_apart_names_and_titles():
+    tree = versioned_tree(v2_files=("a.md", "c.md"))
+    classes, _ = tree.subtree_classes()
+    assert classes[tree.find_dir("v1")] != classes[tree.find_dir("v2")]
+
+    tree = versioned_tree()
+    tree.set_title(tree.find_file("v2/guide/a.md"), "A")
+    assert len({tree.subtree_classes()[0][tree.find_dir(v)] for v in ("v1", "v2")}) == 1
+    assert len({tree.subtree_classes(with_titles=True)[0][tree.find_dir(v)] for v in ("v1", "v2")}) == 2
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+from docs_pack import DocsPack, PackWriter
+
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "scripts")
+
+
+def interrupted_write(pack_path, flush_bytes):
+    """Add a page in a child process and kill it before flush(), after `flush_bytes` reach the file."""
+    code = f"""
+import os, sys
+sys.path.insert(0, {SCRIPTS!r})
+from docs_pack import PackWriter
+pack = PackWriter({str(pack_path)!r})
+pack.add("late.md", os.urandom(4096).hex())
+if {flush_bytes!r}:
+    pack._file.flush()
+os._exit(1)
+"""
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 1
+
+
+def test_reopen_after_write_interrupted_before_flush(tmp_path):
+    path = tmp_path / "docs.dpk"
+    with PackWriter(str(path)) as pack:
+        pack.add("a.md", "# A\n", "A")
+        pack.add("b.md", "# B\n", "B")
+
+    interrupted_write(path, flush_bytes=True)
+    assert os.path.exists(f"{path}.table")
+
+    with PackWriter(str(path)) as pack:
+        pack.add("c.md", "# C\n", "C")
+    assert not os.path.exists(f"{path}.table")
+    with DocsPack(str(path)) as reader:
+        assert [e[0] for e in reader.entries()] == ["a.md", "b.md", "c.md"]
+        assert reader.read("b.md") == "# B\n"
+        assert reader.read("c.md") == "# C\n"
+
+
+def test_new_pack_is_readable_before_first_flush(tmp_path):
+    path = tmp_path / "docs.dpk"
+    interrupted_write(path, flush_bytes=False)
+    with PackWriter(str(path)) as pack:
+        pack.add("a.md", "# A\n")
+    with DocsPack(str(path)) as reader:
+        assert [e[0] for e in reader.entries()] == ["a.md"]
@@ -0,0 +1,62 @@
+import os
+import threading
+
+from index_server import IndexState, source_signature
+
+
+def test_signature_sees_added_removed_and_skill_edits(tmp_path):
+    (tmp_path / "demo").mkdir()
+    skill_md = tmp_path / "demo" / "SKILL.md"
+    skill_md.write_text("---\nname: demo\n---\n")
+    before = source_signature(str(tmp_path))
+
+    (tmp_path / "demo" / "notes.md").write_text("x")
+    added = source_signature(str(tmp_path))
+    assert added != before
+
+    os.remove(tmp_path / "demo" / "notes.md")
+    skill_md.write_text("---\nname: demo\ndescription: longer\n---\n")
+    assert source_signature(str(tmp_path)) not in (before, added)
+
+
+def test_slow_build_does_not_block_other_sources(tmp_path):
+    state = IndexState([], [(str(tmp_path / "a"), "A"), (str(tmp_path / "b"), "B")])
+    started, release = threading.Event(), threading.Event()
+
+    def build_docs(label, path):
+        if label == "A":
+            started.set()
+            release.wait(5)
+        return {"label": label}
+
+    state._build_docs = build_docs
+    slow = threading.Thread(target=state.docs_snapshot, args=("A",))
+    slow.start()
+    assert started.wait(5)
+    try:
+        assert state.docs_snapshot("B") == {"label": "B"}
+    finally:
+        release.set()
+        slow.join()
+    assert state.docs_snapshot("A") == {"label": "A"}
+
+
+def test_snapshot_invalidated_during_build_is_not_kept(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    state = IndexState([], [(str(docs), "Docs")])
+    state.check_for_changes()
+    builds = []
+
+    def build_docs(label, path):
+        builds.append(label)
+        if len(builds) == 1:
+            # The source changes while the first snapshot is being built
+            (docs / "new.md").write_text("# New\n")
+            state.check_for_changes()
+        return {"build": len(builds)}
+
+    state._build_docs = build_docs
+    assert state.docs_snapshot("Docs") == {"build": 1}
+    assert state.docs_snapshot("Docs") == {"build": 2}
+    assert state.docs_snapshot("Docs") == {"build": 2}
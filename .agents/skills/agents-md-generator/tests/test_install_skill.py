@@ -0,0 +1,61 @@
+import os
+import stat
+import sys
+import zipfile
+
+from cli import SKILL_CREATOR_DIR
+
+sys.path.insert(0, SKILL_CREATOR_DIR)
+from install_skill import install_skills
+
+SKILL_MD = "---\nname: demo\ndescription: A demo skill\n---\n# Demo\n"
+
+
+def write_skill(path, files):
+    """A .skill archive holding demo/<name> for each (name, data, mode) in files."""
+    with zipfile.ZipFile(path, "w") as zipf:
+        for name, data, mode in files:
+            info = zipfile.ZipInfo(f"demo/{name}")
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            zipf.writestr(info, data)
+
+
+def snapshot(root):
+    """{relative path: (bytes, mode)} for every file under root."""
+    tree = {}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root)] = (f.read(), stat.S_IMODE(os.stat(path).st_mode))
+    return tree
+
+
+def test_failed_install_leaves_installed_skill_identical(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENTS_MD_NO_CACHE", "1")
+    skills = tmp_path / "skills"
+    skills.mkdir()
+    write_skill(tmp_path / "v1.skill", [("SKILL.md", SKILL_MD, 0o644), ("run.sh", "echo hi\n", 0o755)])
+    assert install_skills([tmp_path / "v1.skill"], skills)[0][1]
+    before = snapshot(skills)
+
+    # Same run.sh bytes with a different mode, and a SKILL.md that fails validation
+    write_skill(tmp_path / "v2.skill", [("SKILL.md", "no frontmatter\n", 0o644), ("run.sh", "echo hi\n", 0o600)])
+    name, ok, message = install_skills([tmp_path / "v2.skill"], skills)[0]
+
+    assert not ok and "validation failed" in message
+    assert snapshot(skills) == before
+
+
+def test_mode_change_is_installed(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENTS_MD_NO_CACHE", "1")
+    skills = tmp_path / "skills"
+    skills.mkdir()
+    write_skill(tmp_path / "v1.skill", [("SKILL.md", SKILL_MD, 0o644), ("run.sh", "echo hi\n", 0o644)])
+    install_skills([tmp_path / "v1.skill"], skills)
+    write_skill(tmp_path / "v2.skill", [("SKILL.md", SKILL_MD, 0o644), ("run.sh", "echo hi\n", 0o755)])
+
+    name, ok, message = install_skills([tmp_path / "v2.skill"], skills)[0]
+
+    assert ok and message.startswith("1 written, 1 unchanged")
+    assert stat.S_IMODE(os.stat(skills / "demo" / "run.sh").st_mode) == 0o755
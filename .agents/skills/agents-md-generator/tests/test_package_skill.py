@@ -0,0 +1,61 @@
+import os
+import shutil
+import subprocess
+import sys
+import zipfile
+
+from cli import SKILL_CREATOR_DIR
+
+sys.path.insert(0, SKILL_CREATOR_DIR)
+from apply_skill_delta import apply_skill_delta
+from package_skill import DELTA_MANIFEST
+
+PACKAGE_SKILL = os.path.join(SKILL_CREATOR_DIR, "package_skill.py")
+SKILL_MD = "---\nname: demo\ndescription: A demo skill\n---\n# Demo\n"
+
+
+def make_skill(root, files):
+    skill = root / "demo"
+    for name, text in {"SKILL.md": SKILL_MD, **files}.items():
+        (skill / name).parent.mkdir(parents=True, exist_ok=True)
+        (skill / name).write_text(text)
+    return skill
+
+
+def test_unchanged_skill_is_not_repackaged_when_run_directly(tmp_path):
+    skill = make_skill(tmp_path, {"notes.md": "notes\n"})
+    env = {**os.environ, "AGENTS_MD_CACHE_DIR": str(tmp_path / "cache")}
+
+    def package():
+        # Launched on its own, not through cli.py, so the cache must be found from the script's location
+        return subprocess.run([sys.executable, PACKAGE_SKILL, str(skill), str(tmp_path / "dist")],
+                              capture_output=True, text=True, env=env)
+
+    assert package().returncode == 0
+    second = package()
+    assert second.returncode == 0
+    assert "is up to date (2 files unchanged)" in second.stdout
+
+
+def test_delta_package_applies_back_to_the_new_release(tmp_path):
+    skill = make_skill(tmp_path, {"keep.md": "same\n", "edit.md": "old\n", "drop.md": "gone\n"})
+    env = {**os.environ, "AGENTS_MD_NO_CACHE": "1"}
+    subprocess.run([sys.executable, PACKAGE_SKILL, str(skill), str(tmp_path / "v1")], check=True, env=env,
+                   capture_output=True)
+    shutil.copy(tmp_path / "v1" / "demo.skill", tmp_path / "release.skill")
+
+    (skill / "edit.md").write_text("new\n")
+    (skill / "drop.md").unlink()
+    (skill / "refs").mkdir()
+    (skill / "refs" / "added.md").write_text("added\n")
+    subprocess.run([sys.executable, PACKAGE_SKILL, str(skill), str(tmp_path / "v2"),
+                    "--delta-from", str(tmp_path / "release.skill")], check=True, env=env, capture_output=True)
+
+    with zipfile.ZipFile(tmp_path / "v2" / "demo.skill-delta") as delta:
+        assert sorted(delta.namelist()) == [DELTA_MANIFEST, "demo/edit.md", "demo/refs/added.md"]
+    ok, message = apply_skill_delta(tmp_path / "release.skill", tmp_path / "v2" / "demo.skill-delta",
+                                    tmp_path / "rebuilt.skill")
+    assert ok, message
+    with zipfile.ZipFile(tmp_path / "rebuilt.skill") as rebuilt, zipfile.ZipFile(tmp_path / "v2" / "demo.skill") as new:
+        assert sorted(rebuilt.namelist()) == sorted(new.namelist())
+        assert all(rebuilt.read(name) == new.read(name) for name in new.namelist())
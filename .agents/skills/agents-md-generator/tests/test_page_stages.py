@@ -0,0 +1,45 @@
+from page_stages import StripBoilerplate, apply_deferred, learn_deferred
+
+NAV = "[Home](/) · [Guides](/guides) · [API](/api)"
+
+
+def pages(n):
+    return [f"# Page {i}\n\n{NAV}\n\n**Parameters**\n\nBody text {i}.\n" for i in range(n)] + [
+        f"# Other {i}\n\nNo nav here {i}.\n" for i in range(n // 2)
+    ]
+
+
+def strip_all(contents):
+    stages = [StripBoilerplate()]
+    learn_deferred(stages, contents)
+    return {c: apply_deferred(stages, c) for c in contents}
+
+
+def test_result_does_not_depend_on_page_order():
+    contents = pages(10)
+    assert strip_all(contents) == strip_all(list(reversed(contents)))
+
+
+def test_every_page_is_stripped_including_the_first_ones():
+    stripped = strip_all(pages(10))
+    for before, after in stripped.items():
+        assert NAV not in after
+        if "Page" in before:
+            assert after.startswith("# Page") and "\n\n**Parameters**\n\nBody text" in after
+
+
+def test_heading_like_lines_are_kept():
+    stripped = strip_all(pages(10))
+    assert all("**Parameters**" in after for before, after in stripped.items() if "Page" in before)
+
+
+def test_small_crawls_are_left_alone():
+    stages = [StripBoilerplate(min_pages=5)]
+    assert not learn_deferred(stages, pages(2))
+    content = pages(2)[0]
+    assert apply_deferred(stages, content) == content
+
+
+def test_streaming_passes_pages_through_untouched():
+    page = {"path": "a.md", "content": pages(1)[0]}
+    assert list(StripBoilerplate()(iter([dict(page)]))) == [page]
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+from cli import SKILL_CREATOR_DIR
+
+QUICK_VALIDATE = os.path.join(SKILL_CREATOR_DIR, "quick_validate.py")
+
+
+def test_broken_link_fails_when_run_directly(tmp_path):
+    skill = tmp_path / "demo"
+    skill.mkdir()
+    (skill / "SKILL.md").write_text("---\nname: demo\ndescription: A demo skill\n---\nSee [usage](usage.md).\n")
+
+    # Launched on its own, not through cli.py, so nothing has set up sys.path for it
+    result = subprocess.run([sys.executable, QUICK_VALIDATE, str(skill)], capture_output=True, text=True,
+                            cwd=tmp_path, env={**os.environ, "AGENTS_MD_NO_CACHE": "1"})
+
+    assert result.returncode == 1
+    assert "SKILL.md:5: usage.md" in result.stdout
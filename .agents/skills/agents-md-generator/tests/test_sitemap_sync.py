@@ -0,0 +1,48 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import sitemap_sync
+from sitemap_sync import fetch_sitemap
+
+INDEX = b"""<?xml version="1.0"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<sitemap><loc>/a.xml</loc></sitemap><sitemap><loc>/b.xml</loc></sitemap><sitemap><loc>/c.xml</loc></sitemap>
+</sitemapindex>"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/sitemap.xml":
+            body = INDEX
+        else:
+            name = self.path.strip("/").split(".")[0]
+            body = (f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f"<url><loc>https://x.com/docs/{name}</loc></url></urlset>").encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sitemap_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/sitemap.xml"
+    server.shutdown()
+    server.server_close()
+
+
+def test_follows_sitemap_index(sitemap_url):
+    assert [loc for loc, _ in fetch_sitemap(sitemap_url)] == [f"https://x.com/docs/{n}" for n in "abc"]
+
+
+def test_too_many_sitemaps_is_an_error_not_a_partial_list(sitemap_url, monkeypatch):
+    monkeypatch.setattr(sitemap_sync, "MAX_SITEMAPS", 3)
+    with pytest.raises(ValueError):
+        fetch_sitemap(sitemap_url)
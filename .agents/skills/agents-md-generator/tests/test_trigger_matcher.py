@@ -0,0 +1,53 @@
+import json
+import random
+
+from trigger_matcher import TriggerMatcher, _is_word_char, normalize
+
+
+def naive_find(phrases, text):
+    """Every whole-word occurrence of every phrase, by checking each phrase at each offset."""
+    text = normalize(text)
+    hits = []
+    for index, phrase in enumerate(phrases):
+        for start in range(len(text) - len(phrase) + 1):
+            end = start + len(phrase)
+            if text[start:end] != phrase:
+                continue
+            if _is_word_char(phrase[0]) and start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if _is_word_char(phrase[-1]) and end < len(text) and _is_word_char(text[end]):
+                continue
+            hits.append((end, index))
+    return sorted(hits)
+
+
+def test_overlapping_phrases_match_like_a_naive_scan():
+    rng = random.Random(7)
+    for _ in range(200):
+        phrases = sorted({"".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))).strip() or "a"
+                          for _ in range(rng.randint(1, 8))})
+        matcher = TriggerMatcher(phrases, [["skill"]] * len(phrases))
+        text = "".join(rng.choice("abAB  ") for _ in range(rng.randint(0, 30)))
+        assert sorted(matcher.find(text)) == naive_find(phrases, text), (phrases, text)
+
+
+def test_case_folded_and_nested_matches():
+    matcher = TriggerMatcher.from_skills([
+        {"name": "ai-sdk", "triggers": ["vercel ai sdk", "ai sdk", "streamtext"]},
+        {"name": "react", "triggers": ["react", "react native"]},
+    ])
+    ranked = matcher.match("Use the  Vercel AI SDK StreamText in React Native, not reactive code")
+
+    assert [r["skill"] for r in ranked] == ["ai-sdk", "react"]
+    assert ranked[0]["phrases"] == ["ai sdk", "streamtext", "vercel ai sdk"]
+    assert ranked[1]["phrases"] == ["react", "react native"]
+
+
+def test_saved_automaton_matches_the_same(tmp_path):
+    matcher = TriggerMatcher(["he", "she", "hers", "his"], [["a"], ["b"], ["c"], ["d"]])
+    matcher.save(str(tmp_path / "triggers.json"))
+    loaded = TriggerMatcher.load(str(tmp_path / "triggers.json"))
+
+    text = "ushers, she said: his, hers"
+    assert loaded.find(text) == matcher.find(text)
+    assert json.loads((tmp_path / "triggers.json").read_text())["version"] == 1
@@ -0,0 +1,23 @@
+import pytest
+
+from url_frontier import UrlFrontier
+
+BASE = "https://docs.example.com/docs"
+
+
+@pytest.mark.parametrize("url, path", [
+    ("https://docs.example.com/docs/a/b/", "a/b.md"),
+    ("HTTPS://Docs.Example.com:443//docs//a", "a.md"),
+    ("https://docs.example.com/docs%2Fguide", "guide.md"),
+    ("https://docs.example.com/docs", "index.md"),
+    ("https://docs.example.com/docsy/z", "docsy/z.md"),
+])
+def test_local_path_strips_base_from_canonical_url(url, path):
+    assert UrlFrontier(BASE + "/").local_path(url) == path
+
+
+def test_variants_of_one_page_share_a_claim():
+    frontier = UrlFrontier(BASE)
+    assert frontier.claim(f"{BASE}/a/") == ("a.md", None)
+    assert frontier.claim("https://docs.example.com//docs/a#top") == ("a.md", None)
+    assert frontier.claim(f"{BASE}/a?x=1")[1] == f"{BASE}/a"
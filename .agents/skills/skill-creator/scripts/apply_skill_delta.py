@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Skill Delta Applier - Rebuilds a full .skill file from a previous release and a .skill-delta
+
+Usage:
+    python utils/apply_skill_delta.py <previous.skill> <skill.skill-delta> [output.skill]
+
+Example:
+    python utils/apply_skill_delta.py my-skill.skill my-skill.skill-delta
+    python utils/apply_skill_delta.py releases/my-skill.skill my-skill.skill-delta ./my-skill-new.skill
+
+Members the delta does not carry are copied from the previous release, deleted
+members are dropped, and every member of the result is checked against the
+SHA-256 recorded in the delta. The output is written to a temporary file and
+only moved into place once every hash matches; by default it replaces the
+previous release.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from package_skill import DELTA_FORMAT, DELTA_MANIFEST
+
+
+def apply_skill_delta(base_path, delta_path, output_path=None):
+    """
+    Rebuild the new release from base_path and delta_path.
+
+    Args:
+        base_path: Path to the previous release's .skill file
+        delta_path: Path to the .skill-delta patch archive
+        output_path: Where to write the rebuilt .skill (defaults to base_path)
+
+    Returns:
+        (True, message) on success, (False, error message) otherwise
+    """
+    import zipfile
+
+    base_path = Path(base_path)
+    output_path = Path(output_path) if output_path else base_path
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+
+    try:
+        with zipfile.ZipFile(base_path) as base, zipfile.ZipFile(delta_path) as delta:
+            try:
+                manifest = json.loads(delta.read(DELTA_MANIFEST))
+            except KeyError:
+                return False, f"{delta_path} is not a skill delta (no {DELTA_MANIFEST})"
+            if manifest.get("format") != DELTA_FORMAT:
+                return False, f"Unsupported delta format: {manifest.get('format')}"
+
+            expected = manifest["members"]
+            changed = set(manifest["changed"])
+            deleted = manifest["deleted"]
+            base_names = {info.filename for info in base.infolist() if not info.is_dir()}
+            missing = sorted(name for name in expected if name not in changed and name not in base_names)
+            if missing:
+                return False, f"Previous release is missing {len(missing)} member(s), e.g. {missing[0]}; wrong base?"
+
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as out:
+                for name, digest in expected.items():
+                    source = delta if name in changed else base
+                    data = source.read(name)
+                    if hashlib.sha256(data).hexdigest() != digest:
+                        where = "delta" if source is delta else "previous release"
+                        return False, f"Hash mismatch for {name} from the {where}; wrong base or corrupt delta?"
+                    out.writestr(source.getinfo(name), data)
+
+        os.replace(tmp_path, output_path)
+    except (OSError, KeyError, zipfile.BadZipFile, ValueError) as e:
+        # KeyError: a manifest field, or a member the manifest names, is missing
+        return False, f"Could not apply delta: {e}"
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return True, (
+        f"Rebuilt {output_path} ({len(expected)} members verified: "
+        f"{len(changed)} from delta, {len(deleted)} deleted)"
+    )
+
+
+def main():
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python utils/apply_skill_delta.py <previous.skill> <skill.skill-delta> [output.skill]")
+        print("\nExample:")
+        print("  python utils/apply_skill_delta.py my-skill.skill my-skill.skill-delta")
+        print("  python utils/apply_skill_delta.py releases/my-skill.skill my-skill.skill-delta ./my-skill-new.skill")
+        sys.exit(1)
+
+    output = sys.argv[3] if len(sys.argv) == 4 else None
+    print(f"🩹 Applying {sys.argv[2]} to {sys.argv[1]}")
+    ok, message = apply_skill_delta(sys.argv[1], sys.argv[2], output)
+    print(f"{'✅' if ok else '❌'} {message}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Skill Installer - Extracts one or more .skill files into a skills directory
+
+Usage:
+    python utils/install_skill.py <skills-directory> <file.skill|folder>... [--workers N]
+
+Example:
+    python utils/install_skill.py ~/.agents/skills dist/my-skill.skill
+    python utils/install_skill.py ./.agents/skills ./dist --workers 16
+
+A folder argument installs every .skill file in it. Members of all archives
+are extracted in parallel into a hidden staging folder next to each skill. A
+file already installed with the member's size and CRC-32 is hard-linked into
+the staging folder instead of being extracted again. The staged skill is
+validated, and only if it passes does it replace the installed one, by
+renaming, so a reader sees either the old skill or the new one, and a
+release that fails validation leaves the installed skill untouched. Files the
+new release no longer contains go away with the old folder. Reinstalling an
+unchanged release leaves the installed skill as it is.
+"""
+
+import os
+import shutil
+import sys
+import zlib
+from pathlib import Path
+from quick_validate import validate_skill
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def skill_name(zipf):
+    """Name of the single top-level folder every member of a .skill archive lives in."""
+    names = set()
+    for info in zipf.infolist():
+        parts = info.filename.replace("\\", "/").split("/")
+        if info.filename.startswith("/") or ".." in parts or ":" in parts[0]:
+            raise ValueError(f"Unsafe member path: {info.filename}")
+        if len(parts) < 2:
+            raise ValueError(f"Member outside a skill folder: {info.filename}")
+        names.add(parts[0])
+    if len(names) != 1:
+        raise ValueError(f"Expected one skill folder, found {len(names)}: {', '.join(sorted(names)) or 'none'}")
+    return names.pop()
+
+
+def file_crc(path):
+    """CRC-32 of a file on disk, as stored in zip headers."""
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def stage_member(zipf, info, installed, staged):
+    """
+    Put one member at staged: hard-linked from installed if that file is identical, else copied or extracted.
+
+    Returns:
+        True if the member was extracted, False if the installed file already matched
+    """
+    mode = (info.external_attr >> 16) & 0o777
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        st = installed.stat()
+        if st.st_size == info.file_size and file_crc(installed) == info.CRC:
+            if mode and (st.st_mode & 0o777) != mode:
+                # A link shares the inode, so chmod would reach the live file
+                shutil.copy2(installed, staged)
+                os.chmod(staged, mode)
+                return True
+            try:
+                os.link(installed, staged)
+            except OSError:
+                shutil.copy2(installed, staged)
+            return False
+    except FileNotFoundError:
+        pass
+
+    with zipf.open(info) as src, open(staged, 'wb') as dst:
+        while chunk := src.read(CHUNK_SIZE):
+            dst.write(chunk)
+    if mode:
+        os.chmod(staged, mode)
+    return True
+
+
+def count_stale(skill_dir, keep):
+    """Number of files under skill_dir that are not in keep (relative POSIX paths)."""
+    return sum(
+        (Path(root) / name).relative_to(skill_dir).as_posix() not in keep
+        for root, _, files in os.walk(skill_dir) for name in files
+    )
+
+
+def swap_in(staged_dir, skill_dir):
+    """Replace skill_dir with staged_dir; the old folder is renamed aside first, then deleted."""
+    if not skill_dir.exists():
+        os.rename(staged_dir, skill_dir)
+        return
+    old_dir = skill_dir.with_name(f".{skill_dir.name}.old-{os.getpid()}")
+    os.rename(skill_dir, old_dir)
+    try:
+        os.rename(staged_dir, skill_dir)
+    except OSError:
+        os.rename(old_dir, skill_dir)
+        raise
+    shutil.rmtree(old_dir)
+
+
+def install_skills(skill_files, skills_dir, workers=None):
+    """
+    Install .skill files into skills_dir.
+
+    Args:
+        skill_files: Paths to .skill files
+        skills_dir: Directory that holds one folder per skill
+        workers: Parallel extraction threads (defaults to Python's choice)
+
+    Returns:
+        List of (skill name or file, ok, message), one per .skill file
+    """
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    skills_dir = Path(skills_dir).resolve()
+    results = []
+    archives = {}
+    for skill_file in skill_files:
+        try:
+            zipf = zipfile.ZipFile(skill_file)
+            name = skill_name(zipf)
+        except (OSError, zipfile.BadZipFile, ValueError) as e:
+            results.append((str(skill_file), False, f"Not a valid .skill file: {e}"))
+            continue
+        if name in archives:
+            zipf.close()
+            results.append((name, False, f"{skill_file} and {archives[name][0]} both contain {name}"))
+            continue
+        archives[name] = (skill_file, zipf)
+
+    staging = {name: skills_dir / f".{name}.staging-{os.getpid()}" for name in archives}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for staged_dir in staging.values():
+                shutil.rmtree(staged_dir, ignore_errors=True)
+            # One task per member across every archive, so a single large skill is parallel too
+            futures = {
+                name: [
+                    pool.submit(
+                        stage_member, zipf, info,
+                        skills_dir / info.filename, staging[name] / info.filename.split("/", 1)[1],
+                    )
+                    for info in zipf.infolist() if not info.is_dir()
+                ]
+                for name, (_, zipf) in archives.items()
+            }
+
+            def finish(name):
+                skill_file, zipf = archives[name]
+                skill_dir, staged_dir = skills_dir / name, staging[name]
+                try:
+                    written = sum(future.result() for future in futures[name])
+                except (OSError, zipfile.BadZipFile, zlib.error) as e:
+                    return name, False, f"Install from {skill_file} failed: {e}"
+                members = {info.filename.split("/", 1)[1] for info in zipf.infolist() if not info.is_dir()}
+                removed = count_stale(skill_dir, members)
+                counts = f"{written} written, {len(members) - written} unchanged, {removed} removed"
+                valid, message = validate_skill(staged_dir)
+                if not valid:
+                    return name, False, f"validation failed, {skill_dir} left as it was: {message}"
+                if not written and not removed and skill_dir.is_dir():
+                    return name, True, counts
+                try:
+                    swap_in(staged_dir, skill_dir)
+                except OSError as e:
+                    return name, False, f"Install from {skill_file} failed: {e}"
+                return name, True, counts
+
+            # Every member task is queued ahead of these, so waiting on them inside the pool cannot deadlock
+            results.extend(pool.map(finish, list(archives)))
+    finally:
+        for _, zipf in archives.values():
+            zipf.close()
+        for staged_dir in staging.values():
+            shutil.rmtree(staged_dir, ignore_errors=True)
+    return results
+
+
+def expand_skill_files(paths):
+    """The .skill files named by paths, with folders expanded to the .skill files they contain."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.skill')))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        try:
+            workers = int(args[i + 1])
+        except (IndexError, ValueError):
+            print("❌ Error: --workers needs a number")
+            sys.exit(1)
+        del args[i:i + 2]
+
+    if len(args) < 2:
+        print("Usage: python utils/install_skill.py <skills-directory> <file.skill|folder>... [--workers N]")
+        print("\nExample:")
+        print("  python utils/install_skill.py ~/.agents/skills dist/my-skill.skill")
+        print("  python utils/install_skill.py ./.agents/skills ./dist --workers 16")
+        sys.exit(1)
+
+    skills_dir = Path(args[0])
+    skill_files = expand_skill_files(args[1:])
+    if not skill_files:
+        print(f"❌ Error: No .skill files found in {', '.join(args[1:])}")
+        sys.exit(1)
+
+    import time
+
+    print(f"📥 Installing {len(skill_files)} skill(s) into {skills_dir}")
+    start = time.monotonic()
+    skills_dir.mkdir(parents=True, exist_ok=True)
+    results = install_skills(skill_files, skills_dir, workers)
+    for name, ok, message in results:
+        print(f"{'✅' if ok else '❌'} {name}: {message}")
+    failed = sum(not ok for _, ok, _ in results)
+    print(f"\n{'❌' if failed else '✅'} {len(results) - failed}/{len(results)} installed in {time.monotonic() - start:.2f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
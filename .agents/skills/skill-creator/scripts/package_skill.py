@@ -3,17 +3,87 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--delta-from <previous.skill>]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --delta-from releases/my-skill.skill
+
+With --delta-from, a <skill-name>.skill-delta patch archive is written next to
+the .skill file. It holds only the members that were added or changed since the
+previous release, plus a DELTA.json manifest with the deleted members and the
+SHA-256 of every member of the new release. apply_skill_delta.py rebuilds the
+full .skill from the previous release and the delta, verifying every hash.
 """
 
+import hashlib
+import json
 import sys
-import zipfile
 from pathlib import Path
-from quick_validate import validate_skill
+from quick_validate import shared_cache, validate_skill
+
+
+def package_manifest(skill_path):
+    """[relative path, size, mtime_ns] for every file in a skill folder, sorted by path."""
+    manifest = []
+    for file_path in sorted(skill_path.rglob('*')):
+        if file_path.is_file():
+            st = file_path.stat()
+            manifest.append([file_path.relative_to(skill_path).as_posix(), st.st_size, st.st_mtime_ns])
+    return manifest
+
+
+DELTA_MANIFEST = "DELTA.json"
+DELTA_FORMAT = 1
+
+
+def member_hashes(zipf):
+    """SHA-256 of every file member of an open zip archive, keyed by member name."""
+    hashes = {}
+    for info in zipf.infolist():
+        if not info.is_dir():
+            hashes[info.filename] = hashlib.sha256(zipf.read(info)).hexdigest()
+    return hashes
+
+
+def package_delta(base_path, new_path, delta_path=None):
+    """
+    Write a patch archive that turns the .skill at base_path into the one at new_path.
+
+    Args:
+        base_path: Path to the previous release's .skill file
+        new_path: Path to the new .skill file
+        delta_path: Where to write the delta (defaults to new_path with a .skill-delta suffix)
+
+    Returns:
+        (Path to the delta file, number of changed/added members, number of deleted members)
+    """
+    import zipfile
+
+    new_path = Path(new_path)
+    delta_path = Path(delta_path) if delta_path else new_path.with_suffix(".skill-delta")
+
+    with zipfile.ZipFile(base_path) as base, zipfile.ZipFile(new_path) as new:
+        base_hashes = member_hashes(base)
+        new_hashes = member_hashes(new)
+        changed = sorted(name for name, digest in new_hashes.items() if base_hashes.get(name) != digest)
+        deleted = sorted(set(base_hashes) - set(new_hashes))
+        manifest = {
+            "format": DELTA_FORMAT,
+            "base": Path(base_path).name,
+            "changed": changed,
+            "deleted": deleted,
+            "members": dict(sorted(new_hashes.items())),
+        }
+
+        with zipfile.ZipFile(delta_path, 'w', zipfile.ZIP_DEFLATED) as delta:
+            delta.writestr(DELTA_MANIFEST, json.dumps(manifest, indent=2))
+            for name in changed:
+                # Keep the original member info so the rebuilt archive matches the new release
+                delta.writestr(new.getinfo(name), new.read(name))
+
+    return delta_path, len(changed), len(deleted)
 
 
 def package_skill(skill_path, output_dir=None):
@@ -63,7 +133,20 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
+    # Skip rebuilding when neither the skill's files nor the last package changed
+    cache = shared_cache()
+    if cache is not None:
+        from disk_cache import file_stamp
+
+        manifest = package_manifest(skill_path)
+        stamp = {"files": manifest, "output": file_stamp(skill_filename)}
+        if cache.get("packages", str(skill_filename), stamp) is not None:
+            print(f"✅ {skill_filename} is up to date ({len(manifest)} files unchanged)")
+            return skill_filename
+
     # Create the .skill file (zip format)
+    import zipfile
+
     try:
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
             # Walk through the skill directory
@@ -75,6 +158,9 @@ def package_skill(skill_path, output_dir=None):
                     print(f"  Added: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        if cache is not None:
+            stamp = {"files": manifest, "output": file_stamp(skill_filename)}
+            cache.put("packages", str(skill_filename), {"files": len(manifest)}, stamp)
         return skill_filename
 
     except Exception as e:
@@ -83,15 +169,38 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+    args = sys.argv[1:]
+    delta_from = None
+    if "--delta-from" in args:
+        i = args.index("--delta-from")
+        if i + 1 >= len(args):
+            print("❌ Error: --delta-from needs the previous .skill file")
+            sys.exit(1)
+        delta_from = args[i + 1]
+        del args[i:i + 2]
+
+    if not args:
+        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--delta-from <previous.skill>]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --delta-from releases/my-skill.skill")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
+
+    if delta_from and not Path(delta_from).is_file():
+        print(f"❌ Error: Previous release not found: {delta_from}")
+        sys.exit(1)
+    # Checked before packaging, which would overwrite the previous release in place
+    output_file = Path(output_dir or Path.cwd()).resolve() / f"{Path(skill_path).resolve().name}.skill"
+    if delta_from and (
+        Path(delta_from).resolve() == output_file
+        or (output_file.exists() and output_file.samefile(delta_from))
+    ):
+        print("❌ Error: --delta-from must point at a copy of the previous release, not the new output")
+        sys.exit(1)
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
@@ -99,12 +208,22 @@ def main():
     print()
 
     result = package_skill(skill_path, output_dir)
-
-    if result:
-        sys.exit(0)
-    else:
+    if not result:
         sys.exit(1)
 
+    if delta_from:
+        try:
+            delta_path, changed, deleted = package_delta(delta_from, result)
+        except Exception as e:
+            print(f"❌ Error creating delta: {e}")
+            sys.exit(1)
+        full_kb = Path(result).stat().st_size / 1024
+        delta_kb = delta_path.stat().st_size / 1024
+        print(f"📦 Delta against {delta_from}: {changed} changed/added, {deleted} deleted")
+        print(f"✅ Wrote {delta_path} ({delta_kb:.1f}KB vs {full_kb:.1f}KB full)")
+
+    sys.exit(0)
+
 
 if __name__ == "__main__":
     main()
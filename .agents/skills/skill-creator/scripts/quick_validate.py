@@ -1,16 +1,87 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Uses the agents-md-generator skill installed next to this one. Results are
+kept in its shared disk cache (disk_cache.py), keyed by SKILL.md and by this
+script, so unchanged skills are not parsed again. Links in the skill's markdown
+files are then checked with its check_links.py, and broken ones fail
+validation.
 """
 
 import sys
-import os
 import re
-import yaml
 from pathlib import Path
 
+# Resolved from this file, so the helpers are found however the script is launched
+AGENTS_MD_SCRIPTS = Path(__file__).resolve().parents[2] / "agents-md-generator" / "scripts"
+
+
+def use_agents_md_scripts(module):
+    """Put the sibling agents-md-generator scripts on sys.path, or raise ImportError if `module` is missing there."""
+    if not (AGENTS_MD_SCRIPTS / f"{module}.py").is_file():
+        raise ImportError(f"{module}.py not found in {AGENTS_MD_SCRIPTS}; install the agents-md-generator skill next to this one")
+    if str(AGENTS_MD_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(AGENTS_MD_SCRIPTS))
+
+
+def shared_cache():
+    """The agents-md shared disk cache, or None when disabled with AGENTS_MD_NO_CACHE."""
+    use_agents_md_scripts("disk_cache")
+    from disk_cache import get_cache
+
+    return get_cache()
+
+
+def broken_links(skill_path):
+    """'file:line: target' for each broken link in the skill."""
+    use_agents_md_scripts("check_links")
+    from check_links import check_links, format_broken
+
+    broken, _ = check_links(str(skill_path))
+    return format_broken(broken)
+
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
+    valid, message = _validate_frontmatter(skill_path)
+    if not valid:
+        return valid, message
+
+    # Links depend on every file in the skill, so they are checked fresh each time
+    broken = broken_links(skill_path)
+    if broken:
+        shown = "\n  ".join(broken[:10])
+        more = f"\n  ... and {len(broken) - 10} more" if len(broken) > 10 else ""
+        return False, f"{len(broken)} broken link(s):\n  {shown}{more}"
+    return valid, message
+
+
+def _validate_frontmatter(skill_path):
+    cache = shared_cache()
+    if cache is None:
+        return _validate_skill(skill_path)
+
+    from disk_cache import file_stamp
+
+    skill_md = Path(skill_path).resolve() / 'SKILL.md'
+    stamp = file_stamp(skill_md)
+    if stamp is None:
+        return _validate_skill(skill_path)
+    # Changing the rules in this file invalidates earlier results too
+    stamp += file_stamp(__file__) or []
+    cached = cache.get("validate", str(skill_md), stamp)
+    if cached is not None:
+        return tuple(cached)
+    result = _validate_skill(skill_path)
+    cache.put("validate", str(skill_md), list(result), stamp)
+    return result
+
+
+def _validate_skill(skill_path):
+    # Imported here so callers that never validate don't pay for it at startup
+    import yaml
+
     skill_path = Path(skill_path)
 
     # Check SKILL.md exists
@@ -85,11 +156,14 @@ def validate_skill(skill_path):
 
     return True, "Skill is valid!"
 
-if __name__ == "__main__":
+def main():
     if len(sys.argv) != 2:
         print("Usage: python quick_validate.py <skill_directory>")
         sys.exit(1)
-    
+
     valid, message = validate_skill(sys.argv[1])
     print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+    sys.exit(0 if valid else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file